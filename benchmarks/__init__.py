@@ -0,0 +1 @@
+# Benchmarks and synthetic workloads for the optimal time slot Lambda
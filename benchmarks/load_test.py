@@ -0,0 +1,385 @@
+"""Load-test the optimizer over HTTP with many concurrent clients.
+
+Without --url a local stand-in is started on a free port: the standalone server
+(optimal_time_slot_lambda.src.server), which answers every request with
+lambda_handler and API Gateway-shaped events, so the test runs offline. Run
+from the project root:
+    python -m benchmarks.load_test --concurrency 32 --requests 2000 --mix small=8,medium=2
+    python -m benchmarks.load_test --duration 30 --output load.json
+    python -m benchmarks.load_test --compare load.json
+    python -m benchmarks.load_test --url https://<api_url>/api/v1/meetings/optimize
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import ssl
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from .run_benchmarks import SCENARIOS
+from .workload import generate_meeting
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPTIMIZE_PATH = "/api/v1/meetings/optimize"
+
+DEFAULT_MIX = "small=8,medium=2"
+# Distinct bodies per scenario, so requests are not all the same
+DEFAULT_VARIANTS = 8
+
+# Upper bounds in milliseconds of the latency histogram buckets, the last one is open
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# A latency is reported as a regression when it gets this much slower, throughput when it drops as much
+REGRESSION_THRESHOLD = 1.2
+
+
+def parse_mix(mix):
+    """Return [(scenario, weight)] for "small=8,medium=2".
+
+    Raises ValueError for unknown scenarios and invalid weights.
+    """
+    weighted = []
+    for item in mix.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name!r}")
+        weight = float(weight or 1)
+        if weight <= 0:
+            raise ValueError(f"Invalid weight for {name}: {weight}")
+        weighted.append((name, weight))
+    return weighted
+
+
+def build_requests(mix, variants=DEFAULT_VARIANTS, seed=0, scale=1.0):
+    """Return {scenario: [encoded request bodies]}, scale multiplies the participants."""
+    bodies = {}
+    for name, _ in mix:
+        options = dict(SCENARIOS[name])
+        options["participants"] = max(1, round(options["participants"] * scale))
+        bodies[name] = [
+            json.dumps(generate_meeting(seed=seed + variant, **options)).encode("utf-8")
+            for variant in range(variants)
+        ]
+    return bodies
+
+
+def percentile(sorted_values, share):
+    # Nearest-rank percentile of an ascending list
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * share // 1))
+    return sorted_values[int(rank) - 1]
+
+
+def histogram(latencies_ms, buckets=HISTOGRAM_BUCKETS_MS):
+    """Return [(upper bound in ms or None for the open bucket, count)]."""
+    counts = [0] * (len(buckets) + 1)
+    for latency in latencies_ms:
+        index = next((index for index, bound in enumerate(buckets) if latency <= bound), len(buckets))
+        counts[index] += 1
+    return list(zip(list(buckets) + [None], counts))
+
+
+def summarize(latencies_ms, elapsed_seconds, statuses):
+    latencies_ms = sorted(latencies_ms)
+    return {
+        "requests": len(latencies_ms),
+        "requestsPerSecond": len(latencies_ms) / elapsed_seconds if elapsed_seconds > 0 else 0,
+        "latencyMs": {
+            "p50": percentile(latencies_ms, 0.50),
+            "p95": percentile(latencies_ms, 0.95),
+            "p99": percentile(latencies_ms, 0.99),
+            "max": latencies_ms[-1] if latencies_ms else None,
+            "mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else None
+        },
+        "histogram": [{"leMs": bound, "count": count} for bound, count in histogram(latencies_ms)],
+        # Status codes are ints and failed connections "connectionError", sorted as text
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))}
+    }
+
+
+class HttpConnection:
+    # One keep-alive HTTP/1.1 connection, the asyncio client of a single worker
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.secure = parts.scheme == "https"
+        self.port = parts.port or (443 if self.secure else 80)
+        self.path = parts.path or "/"
+        self.reader = self.writer = None
+
+    async def _connect(self):
+        ssl_context = ssl.create_default_context() if self.secure else None
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=ssl_context)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+            self.writer = None
+
+    async def post(self, body):
+        """Send one request and return (status code, body bytes), reconnecting when needed."""
+        if self.writer is None:
+            await self._connect()
+        head = (
+            f"POST {self.path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+        return await self._read_response()
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        status = int(status_line.split(b" ", 2)[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self.reader.readline()).strip():
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b"".join(chunks)
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", "0")))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, body
+
+
+class Recorder:
+    # Latencies and status counts in total and per scenario
+
+    def __init__(self, names):
+        self.latencies = []
+        self.statuses = {}
+        self.scenarios = {name: ([], {}) for name in names}
+
+    def add(self, name, latency_ms, status):
+        for latencies, statuses in ((self.latencies, self.statuses), self.scenarios[name]):
+            latencies.append(latency_ms)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def results(self, elapsed_seconds):
+        results = summarize(self.latencies, elapsed_seconds, self.statuses)
+        results["scenarios"] = {
+            name: summarize(latencies, elapsed_seconds, statuses)
+            for name, (latencies, statuses) in self.scenarios.items()
+        }
+        return results
+
+
+async def _worker(url, schedule, deadline, recorder):
+    connection = HttpConnection(url)
+    try:
+        while time.perf_counter() < deadline:
+            request = schedule()
+            if request is None:
+                break
+            name, body = request
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.post(body)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                # Counted as a failed request, the next one opens a new connection
+                status = "connectionError"
+                await connection.close()
+            recorder.add(name, (time.perf_counter() - start) * 1000, status)
+    finally:
+        await connection.close()
+
+
+async def run_load(url, bodies, mix, concurrency=16, requests=None, duration=None, seed=0):
+    """Send requests from concurrency workers until requests are sent or duration seconds pass.
+
+    Scenarios are picked at random with the weights of mix. Returns the summary
+    of all requests and of each scenario.
+    """
+    rng = random.Random(seed)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    remaining = requests if requests is not None else float("inf")
+
+    def schedule():
+        # Workers share one random sequence, so a run sends the same requests for a given seed
+        nonlocal remaining
+        if remaining <= 0:
+            return None
+        remaining -= 1
+        name = rng.choices(names, weights)[0]
+        return name, rng.choice(bodies[name])
+
+    recorder = Recorder(names)
+    deadline = time.perf_counter() + duration if duration is not None else float("inf")
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(url, schedule, deadline, recorder) for _ in range(concurrency)))
+    return recorder.results(time.perf_counter() - start)
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class LocalServer:
+    """The standalone server in a subprocess, the offline stand-in for API Gateway and Lambda.
+
+    The result cache is off, so every request is optimized.
+    """
+
+    def __init__(self, workers=0, max_concurrency=64):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}{OPTIMIZE_PATH}"
+        self.command = [
+            sys.executable, "-m", "optimal_time_slot_lambda.src.server", "--port", str(self.port),
+            "--workers", str(workers), "--max-concurrency", str(max_concurrency)
+        ]
+        self.process = None
+
+    def __enter__(self):
+        environ = dict(os.environ, RESULT_CACHE_SIZE="0", METRICS_ENABLED="false")
+        self.process = subprocess.Popen(
+            self.command, cwd=PROJECT_DIR, env=environ, stdout=subprocess.PIPE, text=True
+        )
+        # The server prints one line once it accepts connections, nothing when it fails to start
+        if not self.process.stdout.readline().startswith("Serving on"):
+            self.__exit__(None, None, None)
+            raise RuntimeError("The local server did not start")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.process.stdout.close()
+
+
+def run(url=None, mix=DEFAULT_MIX, concurrency=16, requests=None, duration=None, variants=DEFAULT_VARIANTS,
+        scale=1.0, seed=0, workers=0):
+    """Run a load test against url, or against a local server when url is None."""
+    if requests is None and duration is None:
+        requests = 1000
+    weighted_mix = parse_mix(mix)
+    bodies = build_requests(weighted_mix, variants, seed, scale)
+
+    def load(target):
+        return asyncio.run(run_load(target, bodies, weighted_mix, concurrency, requests, duration, seed))
+
+    if url is None:
+        with LocalServer(workers, max_concurrency=max(64, concurrency)) as server:
+            results = load(server.url)
+    else:
+        results = load(url)
+
+    results.update({
+        "python": platform.python_version(),
+        "target": url or "local",
+        "mix": mix,
+        "concurrency": concurrency,
+        "bodyBytes": {name: max(len(body) for body in scenario_bodies) for name, scenario_bodies in bodies.items()}
+    })
+    return results
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Return [(metric, baseline value, current value)] for latencies and throughput that got worse."""
+    regressions = []
+    for name in ("p50", "p95", "p99"):
+        before, after = baseline["latencyMs"].get(name), current["latencyMs"].get(name)
+        if before and after and after > before * threshold:
+            regressions.append((name, before, after))
+    before, after = baseline["requestsPerSecond"], current["requestsPerSecond"]
+    if before and after * threshold < before:
+        regressions.append(("requestsPerSecond", before, after))
+    return regressions
+
+
+def _print_results(results):
+    print(f"{'scenario':<10} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(results["scenarios"].items()) + [("total", results)]
+    for name, summary in rows:
+        latency = summary["latencyMs"]
+        if not summary["requests"]:
+            continue
+        print(f"{name:<10} {summary['requests']:>9} {summary['requestsPerSecond']:>9.1f} "
+              f"{latency['p50']:>9.2f} {latency['p95']:>9.2f} {latency['p99']:>9.2f}")
+
+    print("\nlatency histogram")
+    widest = max((bucket["count"] for bucket in results["histogram"]), default=0) or 1
+    for bucket in results["histogram"]:
+        label = f"<= {bucket['leMs']} ms" if bucket["leMs"] is not None else f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"
+        print(f"{label:>12} {bucket['count']:>8} {'#' * round(40 * bucket['count'] / widest)}")
+    print(f"\nstatuses: {', '.join(f'{status}: {count}' for status, count in results['statuses'].items())}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="optimize endpoint to test (default: a local server)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"weighted scenarios, any of {', '.join(sorted(SCENARIOS))} (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, help="requests to send (default: 1000 unless --duration is set)")
+    parser.add_argument("--duration", type=float, help="seconds to send requests for")
+    parser.add_argument("--variants", type=int, default=DEFAULT_VARIANTS, help="distinct bodies per scenario")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the participants of every scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes of the local server")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file, exit with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    results = run(
+        args.url, args.mix, args.concurrency, args.requests, args.duration, args.variants, args.scale,
+        args.seed, args.workers
+    )
+    _print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    failed = "connectionError" in results["statuses"]
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(json.load(baseline_file), results, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.2f} -> {after:.2f}")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
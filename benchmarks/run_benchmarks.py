@@ -0,0 +1,153 @@
+"""Time the optimizer phases on synthetic workloads.
+
+Run from the project root:
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import RESULT_CACHE, lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer.engine import SlotAggregator
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import build_response_body
+from optimal_time_slot_lambda.src.slot_optimizer.validation import ParticipantValidator, ValidationError
+
+from .workload import generate_meeting
+
+# name -> generate_meeting() arguments
+SCENARIOS = {
+    "small": dict(participants=10, slots_per_participant=5, slot_universe=20),
+    "medium": dict(participants=500, slots_per_participant=20, slot_universe=1000),
+    "large": dict(participants=5000, slots_per_participant=50, slot_universe=10000),
+    "wide": dict(participants=1000, slots_per_participant=200, slot_universe=50000, overlap_density=0.05),
+    "dense": dict(participants=2000, slots_per_participant=20, slot_universe=100, overlap_density=0.9),
+    "invalid": dict(participants=2000, slots_per_participant=20, slot_universe=1000, invalid_share=0.5),
+}
+
+# A phase is reported as a regression when it gets this much slower
+REGRESSION_THRESHOLD = 1.2
+
+
+def _validate(participants):
+    validator = ParticipantValidator()
+    encoded_participants = []
+    for participant in participants:
+        try:
+            encoded_participants.append(validator.validate(participant))
+        except ValidationError:
+            # Invalid participants are skipped so the later phases still have work
+            continue
+    return encoded_participants
+
+
+def _phases(raw_body):
+    # Each phase takes the output of the previous one
+    state = {}
+
+    def parse():
+        state["body"] = json.loads(raw_body)
+
+    def validation():
+        state["encoded"] = _validate(state["body"]["participants"])
+
+    def aggregation():
+        # The handler counts while it validates, the same SlotAggregator is timed here on its own
+        aggregator = SlotAggregator()
+        for name, encoded_slots in state["encoded"]:
+            aggregator.add(name, encoded_slots)
+        state["result"] = aggregator.result()
+
+    def serialization():
+        state["response"] = json.dumps(build_response_body(state["body"]["meetingName"], *state["result"]))
+
+    def end_to_end():
+        RESULT_CACHE.clear()
+        lambda_handler({"body": raw_body}, None)
+
+    return [("parse", parse), ("validation", validation), ("aggregation", aggregation),
+            ("serialization", serialization), ("end_to_end", end_to_end)]
+
+
+def _measure(function, repeat):
+    # Best wall time of several runs, then one traced run for the peak memory
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peakBytes": peak}
+
+
+def run_scenario(name, seed=0, repeat=3):
+    raw_body = json.dumps(generate_meeting(seed=seed, **SCENARIOS[name]))
+    result = {"bodyBytes": len(raw_body), "phases": {}}
+    for phase, function in _phases(raw_body):
+        result["phases"][phase] = _measure(function, repeat)
+    return result
+
+
+def run(scenarios, seed=0, repeat=3):
+    return {
+        "python": platform.python_version(),
+        "seed": seed,
+        "scenarios": {name: run_scenario(name, seed, repeat) for name in scenarios},
+    }
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Return [(scenario, phase, baseline seconds, current seconds)] for phases that got slower."""
+    regressions = []
+    for name, scenario in current["scenarios"].items():
+        baseline_phases = baseline["scenarios"].get(name, {}).get("phases", {})
+        for phase, timing in scenario["phases"].items():
+            before = baseline_phases.get(phase)
+            if before and timing["seconds"] > before["seconds"] * threshold:
+                regressions.append((name, phase, before["seconds"], timing["seconds"]))
+    return regressions
+
+
+def _print_results(results):
+    print(f"{'scenario':<10} {'phase':<14} {'ms':>10} {'peak MiB':>10}")
+    for name, scenario in results["scenarios"].items():
+        for phase, timing in scenario["phases"].items():
+            print(f"{name:<10} {phase:<14} {timing['seconds'] * 1000:>10.2f} {timing['peakBytes'] / 2**20:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run, can be repeated (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file, exit with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run(args.scenario or list(SCENARIOS), args.seed, args.repeat)
+    _print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(json.load(baseline_file), results, args.threshold)
+        for name, phase, before, after in regressions:
+            print(f"REGRESSION {name}/{phase}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
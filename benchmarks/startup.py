@@ -0,0 +1,113 @@
+"""Measure cold-start cost: handler import time and the first invocation.
+
+Every run starts a fresh interpreter that imports the handler the way Lambda
+does, from the top of optimal_time_slot_lambda/src. Run from the project root:
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --compare startup.json --budget-ms 150
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+from .workload import generate_meeting
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "optimal_time_slot_lambda", "src")
+
+# Optional or rarely needed modules that a small request must not import
+DEFERRED_MODULES = ("numpy", "multiprocessing", "sqlite3")
+
+# A timing is reported as a regression when it gets this much slower
+REGRESSION_THRESHOLD = 1.2
+
+# Runs in the fresh interpreter, prints one JSON line
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import optimal_time_slot_lambda
+imported = time.perf_counter()
+optimal_time_slot_lambda.lambda_handler({"body": sys.argv[1]}, None)
+first = time.perf_counter()
+optimal_time_slot_lambda.RESULT_CACHE.clear()
+optimal_time_slot_lambda.lambda_handler({"body": sys.argv[1]}, None)
+second = time.perf_counter()
+print(json.dumps({
+    "importMs": (imported - start) * 1000,
+    "firstInvocationMs": (first - imported) * 1000,
+    "warmInvocationMs": (second - first) * 1000,
+    "loadedModules": sorted(name for name in json.loads(sys.argv[2]) if name in sys.modules)
+}))
+"""
+
+
+def _probe(raw_body, environ):
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, raw_body, json.dumps(DEFERRED_MODULES)],
+        cwd=SRC_DIR, env=environ, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def run(runs=10, seed=0):
+    # Medians over several fresh interpreters, the first run also warms the bytecode cache
+    raw_body = json.dumps(generate_meeting(seed=seed, participants=10, slots_per_participant=5, slot_universe=20))
+    environ = dict(os.environ, METRICS_ENABLED="false", PYTHONPATH="")
+    _probe(raw_body, environ)
+    probes = [_probe(raw_body, environ) for _ in range(runs)]
+    return {
+        "python": platform.python_version(),
+        "runs": runs,
+        "timings": {
+            name: statistics.median(probe[name] for probe in probes)
+            for name in ("importMs", "firstInvocationMs", "warmInvocationMs")
+        },
+        "loadedDeferredModules": sorted({name for probe in probes for name in probe["loadedModules"]})
+    }
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Return [(timing, baseline ms, current ms)] for timings that got slower."""
+    return [
+        (name, baseline["timings"][name], value)
+        for name, value in current["timings"].items()
+        if name in baseline["timings"] and value > baseline["timings"][name] * threshold
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file, exit with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--budget-ms", type=float, help="exit with 1 when the median import takes longer")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, args.seed)
+    for name, value in results["timings"].items():
+        print(f"{name:<18} {value:>8.2f} ms")
+    print(f"deferred modules loaded: {', '.join(results['loadedDeferredModules']) or 'none'}")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    failed = bool(results["loadedDeferredModules"])
+    if args.budget_ms is not None and results["timings"]["importMs"] > args.budget_ms:
+        print(f"OVER BUDGET importMs: {results['timings']['importMs']:.2f} ms > {args.budget_ms:.2f} ms")
+        failed = True
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(json.load(baseline_file), results, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.2f} ms -> {after:.2f} ms")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import random
+
+from optimal_time_slot_lambda.src.slot_optimizer.slots import decode_slot, encode_slot
+
+DEFAULT_START = "2024-06-10T00:00"
+INVALID_SLOTS = ["06-10-2024 09:00", "2024-06-10T25:00", 202406100900, "2024-02-30T09:00"]
+
+
+def generate_meeting(
+    seed=0,
+    participants=100,
+    slots_per_participant=10,
+    slot_universe=500,
+    overlap_density=0.5,
+    invalid_share=0.0,
+    slot_minutes=30,
+    start=DEFAULT_START,
+):
+    """Build a seeded synthetic optimize request body.
+
+    overlap_density is the share of each participant's slots drawn from a small
+    "popular" part of the slot universe, which controls how much slots tie.
+    invalid_share is the share of participants with one invalid slot.
+    """
+    rng = random.Random(seed)
+    first_slot = encode_slot(start)
+    universe = [decode_slot(first_slot + index * slot_minutes) for index in range(slot_universe)]
+    popular = universe[:max(1, slot_universe // 20)]
+
+    body_participants = []
+    for index in range(participants):
+        slots = [
+            rng.choice(popular) if rng.random() < overlap_density else rng.choice(universe)
+            for _ in range(slots_per_participant)
+        ]
+        if rng.random() < invalid_share:
+            slots[rng.randrange(len(slots))] = rng.choice(INVALID_SLOTS)
+        body_participants.append({"name": f"Participant {index}", "preferredSlots": slots})
+
+    return {"meetingName": f"Synthetic meeting {seed}", "participants": body_participants}
@@ -3,6 +3,25 @@
 # Exit if any of the following commands exit with non-0, and echo our commands back
 set -ex
 
-# Zip all files from src into dist/lambda.zip
-# Exclude __pycache__ folders and .pyc files
-(cd optimal_time_slot_lambda/src && zip -r ../dist/lambda.zip . -x "*.pyc" -x "*/__pycache__/*")
\ No newline at end of file
+# Python of the Lambda runtime (see terraform/main.tf). Bytecode is only used by
+# the interpreter version that compiled it.
+LAMBDA_PYTHON="${LAMBDA_PYTHON:-python3.12}"
+
+# Copy src into a staging folder without __pycache__ folders, .pyc files and the
+# standalone HTTP server, which Lambda does not use
+BUILD_DIR="$(mktemp -d)"
+trap 'rm -rf "$BUILD_DIR"' EXIT
+(cd optimal_time_slot_lambda/src && tar -cf - --exclude="__pycache__" --exclude="*.pyc" --exclude="./server.py" .) | (cd "$BUILD_DIR" && tar -xf -)
+
+# The deployment package is read-only, so without bundled bytecode every cold
+# start compiles the modules again. unchecked-hash .pyc files are used without
+# comparing timestamps, which zip files do not preserve exactly.
+if command -v "$LAMBDA_PYTHON" > /dev/null; then
+    "$LAMBDA_PYTHON" -m compileall -q --invalidation-mode unchecked-hash "$BUILD_DIR"
+else
+    echo "$LAMBDA_PYTHON not found, packaging without precompiled bytecode"
+fi
+
+mkdir -p optimal_time_slot_lambda/dist
+rm -f optimal_time_slot_lambda/dist/lambda.zip
+(cd "$BUILD_DIR" && zip -r "$OLDPWD/optimal_time_slot_lambda/dist/lambda.zip" .)
@@ -1,109 +1,259 @@
-from datetime import datetime
 import json
+import os
+
+try:
+    from .slot_optimizer.batch import INVALID_MEETINGS_ERROR, optimize_meetings
+    from .slot_optimizer.cache import ResultCache, binary_fingerprint, fingerprint, raw_fingerprint
+    from .slot_optimizer.columnar import is_columnar_request
+    from .slot_optimizer.compression import (
+        COMPRESSION_MIN_BYTES, BodyEncodingError, accepts_gzip, compress_response, decode_request_body,
+        decode_request_bytes, header
+    )
+    from .slot_optimizer.json_codec import dumps, loads
+    from .slot_optimizer.meeting import (
+        INVALID_JSON_ERROR, INVALID_MEETING_NAME_ERROR, INVALID_PARTICIPANTS_ERROR, optimize_columnar_meeting,
+        optimize_meeting, optimize_streamed_meeting
+    )
+    from .slot_optimizer.metrics import NULL_METRICS, Metrics
+    from .slot_optimizer.pagination import INVALID_CURSOR_ERROR, CompactBody, page_body, parse_page
+    from .slot_optimizer.schedule import INVALID_CONFLICT_FREE_ERROR, schedule_meetings
+    from .slot_optimizer.session_api import handle_session_request, is_session_request
+    from .slot_optimizer.sessions import create_session_store
+    from .slot_optimizer.stream import is_streamable
+except ImportError:
+    # Deployed as a top-level module from the Lambda zip
+    from slot_optimizer.batch import INVALID_MEETINGS_ERROR, optimize_meetings
+    from slot_optimizer.cache import ResultCache, binary_fingerprint, fingerprint, raw_fingerprint
+    from slot_optimizer.columnar import is_columnar_request
+    from slot_optimizer.compression import (
+        COMPRESSION_MIN_BYTES, BodyEncodingError, accepts_gzip, compress_response, decode_request_body,
+        decode_request_bytes, header
+    )
+    from slot_optimizer.json_codec import dumps, loads
+    from slot_optimizer.meeting import (
+        INVALID_JSON_ERROR, INVALID_MEETING_NAME_ERROR, INVALID_PARTICIPANTS_ERROR, optimize_columnar_meeting,
+        optimize_meeting, optimize_streamed_meeting
+    )
+    from slot_optimizer.metrics import NULL_METRICS, Metrics
+    from slot_optimizer.pagination import INVALID_CURSOR_ERROR, CompactBody, page_body, parse_page
+    from slot_optimizer.schedule import INVALID_CONFLICT_FREE_ERROR, schedule_meetings
+    from slot_optimizer.session_api import handle_session_request, is_session_request
+    from slot_optimizer.sessions import create_session_store
+    from slot_optimizer.stream import is_streamable
+
+BATCH_PATH_SUFFIX = "/meetings/optimize/batch"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# The most common error bodies are encoded once at import time
+ENCODED_ERROR_BODIES = {
+    message: dumps({"error": message})
+    for message in (INVALID_JSON_ERROR, INVALID_MEETING_NAME_ERROR, INVALID_PARTICIPANTS_ERROR, INVALID_MEETINGS_ERROR)
+}
+
+# Results of successful requests, kept across warm invocations
+RESULT_CACHE = ResultCache.from_environment()
+# Full results of paged and streamed requests
+PAGE_CACHE = ResultCache.for_pages()
+
+# Per-phase timings and sizes, off unless METRICS_ENABLED=true
+METRICS = Metrics.from_environment()
+
+# Storage for incremental meeting sessions
+SESSION_STORE = create_session_store()
+
+# Responses smaller than this are sent uncompressed even when the client accepts gzip
+COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", COMPRESSION_MIN_BYTES))
+
+
+def _response(status_code, body, metrics=NULL_METRICS):
+    with metrics.timer("SerializationMs"):
+        # Bodies with more than the error (e.g. every error of an errorMode "all" request) are encoded as usual
+        encoded_body = ENCODED_ERROR_BODIES.get(body.get("error")) if status_code == 400 and len(body) == 1 else None
+        response = {
+            "statusCode": status_code,
+            "headers": dict(JSON_HEADERS),
+            "body": encoded_body or dumps(body)
+        }
+    if metrics.enabled:
+        metrics.set("StatusCode", status_code)
+        metrics.set("ResponseBytes", len(response["body"]))
+    return response
+
+
+def _error_response(message, metrics=NULL_METRICS):
+    return _response(400, {"error": message}, metrics)
+
+
+def _is_batch_request(event):
+    path = event.get("resource") or event.get("path") or ""
+    return path.rstrip("/").endswith(BATCH_PATH_SUFFIX)
+
+
+def _route(event):
+    if is_session_request(event.get("path")):
+        return "sessions"
+    return "batch" if _is_batch_request(event) else "optimize"
+
+
+def _handle_batch(raw_body, metrics):
+    # POST /api/v1/meetings/optimize/batch with {"meetings": [<single meeting request>, ...]}
+    try:
+        with metrics.timer("ParseMs"):
+            body = loads(raw_body)
+    except json.JSONDecodeError:
+        return _error_response(INVALID_JSON_ERROR, metrics)
+
+    # With conflictFree the meetings are scheduled together so nobody is double-booked
+    conflict_free = body.get("conflictFree", False) if isinstance(body, dict) else False
+    if not isinstance(conflict_free, bool):
+        return _error_response(INVALID_CONFLICT_FREE_ERROR, metrics)
+    if conflict_free:
+        with metrics.timer("OptimizeMs"):
+            result = schedule_meetings(body)
+        return _response(*result, metrics)
+
+    meetings = body.get("meetings") if isinstance(body, dict) else None
+    if not meetings or not isinstance(meetings, list):
+        return _error_response(INVALID_MEETINGS_ERROR, metrics)
+
+    # Every meeting gets the same statusCode and body it would get from the single endpoint
+    with metrics.timer("OptimizeMs"):
+        results = [
+            {"statusCode": status_code, "body": response_body}
+            for status_code, response_body in optimize_meetings(meetings)
+        ]
+    return _response(200, {"results": results}, metrics)
+
+
+def _optimized_response(metrics, optimize, *args):
+    with metrics.timer("OptimizeMs"):
+        result = optimize(*args, metrics=metrics)
+    return _response(*result, metrics)
+
+
+def _cached_response(key, metrics, optimize, *args):
+    # Identical requests (e.g. page refreshes) are answered from the cache
+    if not RESULT_CACHE.enabled:
+        return _optimized_response(metrics, optimize, *args)
+
+    response = RESULT_CACHE.get(key)
+    metrics.set("CacheHit", int(response is not None))
+    if response is None:
+        response = _optimized_response(metrics, optimize, *args)
+        if response["statusCode"] == 200:
+            RESULT_CACHE.set(key, response, len(response["body"]))
+    return dict(response, headers=dict(response["headers"]))
+
+
+def _full_body(key, metrics, optimize, *args):
+    # Returns (200, CompactBody) or (status code, error body). Full results are
+    # cached compactly in PAGE_CACHE, so later pages are cut without optimizing again.
+    body = PAGE_CACHE.get(key) if PAGE_CACHE.enabled else None
+    metrics.set("CacheHit", int(body is not None))
+    if body is not None:
+        return 200, body
+    with metrics.timer("OptimizeMs"):
+        status_code, body = optimize(*args, metrics=metrics)
+    if status_code != 200:
+        return status_code, body
+    body = CompactBody(body)
+    if PAGE_CACHE.enabled:
+        PAGE_CACHE.set(key, body, body.size)
+    return 200, body
+
+
+def _paged_response(key, page, metrics, optimize, *args):
+    # ?limit=N and ?cursor=<nextCursor> return one page of optimalSlots
+    limit, offset, cursor_key = page
+    if cursor_key is not None and not key.startswith(cursor_key):
+        return _error_response(INVALID_CURSOR_ERROR, metrics)
+    status_code, body = _full_body(key, metrics, optimize, *args)
+    if status_code != 200:
+        return _response(status_code, body, metrics)
+    return _response(200, page_body(body, limit, offset, key), metrics)
+
+
+def _optimize_call(event, metrics):
+    """Return (error response, None) or (None, (cache key, optimize function, args)) for an optimize request."""
+    if is_columnar_request(header(event, "Content-Type")):
+        # Columnar bodies are binary, they are kept as bytes and never decoded as text
+        try:
+            with metrics.timer("ParseMs"):
+                data = decode_request_bytes(event)
+        except BodyEncodingError as e:
+            return _error_response(str(e), metrics), None
+        return None, (binary_fingerprint(data), optimize_columnar_meeting, (data,))
+
+    try:
+        # Bodies may arrive base64 encoded and gzip compressed
+        with metrics.timer("ParseMs"):
+            raw_body = decode_request_body(event)
+    except BodyEncodingError as e:
+        return _error_response(str(e), metrics), None
+    if is_streamable(raw_body):
+        return None, (raw_fingerprint(raw_body), optimize_streamed_meeting, (raw_body,))
 
-def lambda_handler(event, context):
     try:
         # Parse body and handle invalid JSON error
-        body = json.loads(event.get("body", "{}"))
+        with metrics.timer("ParseMs"):
+            body = loads(raw_body)
     except json.JSONDecodeError:
-        return {
-            "statusCode": 400,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"error": "Invalid JSON in request body"})
-        }
+        return _error_response(INVALID_JSON_ERROR, metrics), None
+    return None, (fingerprint(body), optimize_meeting, (body,))
 
-    # Validate meetingName exists, is string and is not just whitespace
-    meeting_name = body.get("meetingName")
-    if not meeting_name or not isinstance(meeting_name, str) or meeting_name.strip() == "":
-        return {
-            "statusCode": 400,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"error": "Missing or invalid required field: meetingName (must be a non-empty string)"})
-        }
 
-    # Validate participants exists and is a list
-    participants = body.get("participants")
-    if not participants or not isinstance(participants, list):
-        return {
-            "statusCode": 400,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"error": "Missing or invalid required field: participants (must be a non-empty list)"})
-        }
+def _handle_optimize(event, metrics):
+    try:
+        page = parse_page(event.get("queryStringParameters"))
+    except ValueError as e:
+        return _error_response(str(e), metrics)
+    error, call = _optimize_call(event, metrics)
+    if error is not None:
+        return error
+    key, optimize, args = call
+    if page is None:
+        return _cached_response(key, metrics, optimize, *args)
+    return _paged_response(key, page, metrics, optimize, *args)
+
 
-    # Validate participants fields
-    for participant in participants:
-        # Validate that name exists, is string and is not just whitespace
-        name = participant.get("name")
-        if not name or not isinstance(name, str) or name.strip() == "":
-            return {
-                "statusCode": 400,
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"error": "Missing or invalid required field: name (must be a non-empty string)"})
-            }
-        # Validate preferredSlots
-        # Validate that preferredSlots exists and is a list
-        preferred_slots = participant.get("preferredSlots")
-        if not preferred_slots or not isinstance(preferred_slots, list):
-            return {
-                "statusCode": 400,
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"error": f"Participant '{name}' has a missing or invalid required field: preferredSlots (must be a non-empty list)"})
-            }
-        # Validate that each slot in preferredSlots is string and in correct format "YYYY-MM-DDTHH:MM"
-        for slot in preferred_slots:
-            try:
-                datetime.strptime(slot, "%Y-%m-%dT%H:%M")
-            except (ValueError, TypeError):
-                return {
-                    "statusCode": 400,
-                    "headers": {"Content-Type": "application/json"},
-                    "body": json.dumps({"error": f"Preferred slot '{slot}' for participant '{name}' must be a string in format YYYY-MM-DDTHH:MM"})
-                }
+def _handle(event, metrics):
+    route = _route(event)
+    if route == "optimize":
+        return _handle_optimize(event, metrics)
 
     try:
-        # Map each slot to the participants who are available
-        # {slot: [list of participant names]}
-        # e.g. {"2024-06-10T09:00": ["Alice", "Bob"], "2024-06-10T10:00": ["Bob", "Charlie"]}
-        slots_and_participants = {}
-
-        for participant in participants:
-            name = participant.get("name")
-            preferred_slots = participant.get("preferredSlots", [])
-            for slot in preferred_slots:
-                if slot not in slots_and_participants:
-                    slots_and_participants[slot] = []
-                slots_and_participants[slot].append(name)
-
-        # Determine the maximum number of participants that can attend
-        max_participants = max((len(names) for names in slots_and_participants.values()), default=0)
-
-        # Find all slots with the maximum participants
-        optimal_slots = [
-            {"slot": slot, "participants": names}
-            for slot, names in slots_and_participants.items()
-            if len(names) == max_participants and max_participants > 1
-        ]
+        # Bodies may arrive base64 encoded and gzip compressed
+        with metrics.timer("ParseMs"):
+            raw_body = decode_request_body(event)
+    except BodyEncodingError as e:
+        return _error_response(str(e), metrics)
 
-        response_body = {
-            "meetingName": meeting_name,
-            "optimalSlots": optimal_slots,
-            "maxParticipants": max_participants
-        }
+    if route == "sessions":
+        return _response(*handle_session_request(SESSION_STORE, event.get("httpMethod", "GET"), event["path"], raw_body), metrics)
+    return _handle_batch(raw_body, metrics)
 
-        # If no slots have more than 1 participant
-        if not optimal_slots:
-            response_body["message"] = "No overlapping time slots found between participants"
 
-        return {
-            "statusCode": 200,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(response_body)
-        }
+def optimize_event(event):
+    """Return (status_code, response body) of an optimize request without encoding the body.
 
-    except Exception as e:
-        # For unexpected errors
-        return {
-            "statusCode": 500,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"error": f"Internal server error: {str(e)}"})
-        }
+    Used by the local server to stream large responses. The full body is
+    returned as a CompactBody, limit and cursor are not applied.
+    """
+    error, call = _optimize_call(event, NULL_METRICS)
+    if error is not None:
+        return error["statusCode"], loads(error["body"])
+    key, optimize, args = call
+    return _full_body(key, NULL_METRICS, optimize, *args)
+
+
+def lambda_handler(event, context):
+    metrics = METRICS.start(_route(event))
+    response = _handle(event, metrics)
+    if accepts_gzip(event):
+        with metrics.timer("CompressionMs"):
+            response = compress_response(response, COMPRESSION_MIN_BYTES)
+        if metrics.enabled and response.get("isBase64Encoded"):
+            metrics.set("CompressedBytes", len(response["body"]))
+    metrics.emit()
+    return response
@@ -0,0 +1,312 @@
+"""Serve the optimizer over HTTP as a long-running service, outside Lambda.
+
+Requests are turned into the API Gateway proxy events the Lambda receives and
+answered by the same lambda_handler, so responses are identical. Run from the
+project root:
+    python -m optimal_time_slot_lambda.src.server --port 8080
+"""
+import argparse
+import asyncio
+import base64
+import multiprocessing
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs
+
+try:
+    from .optimal_time_slot_lambda import lambda_handler, optimize_event
+    from .slot_optimizer.pagination import iter_json_chunks
+    from .slot_optimizer.session_api import is_session_request
+except ImportError:
+    # Run as a script from optimal_time_slot_lambda/src
+    from optimal_time_slot_lambda import lambda_handler, optimize_event
+    from slot_optimizer.pagination import iter_json_chunks
+    from slot_optimizer.session_api import is_session_request
+
+API_PREFIX = "/api/v1/meetings"
+
+# POST-only routes, every method of the sessions routes is handled by the session API
+OPTIMIZE_ROUTE = API_PREFIX + "/optimize"
+POST_ROUTES = (OPTIMIZE_ROUTE, API_PREFIX + "/optimize/batch")
+
+DEFAULT_MAX_CONCURRENCY = 64
+# Same limit as API Gateway
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_HEADERS = 100
+KEEP_ALIVE_TIMEOUT_SECONDS = 5
+
+
+class BadRequest(Exception):
+    def __init__(self, status):
+        super().__init__(status.phrase)
+        self.status = status
+
+
+def _status_response(status, message=None):
+    # Errors of the server itself, in the shape of API Gateway's own error responses
+    body = '{"message":"%s"}' % (message or status.phrase)
+    return {"statusCode": status.value, "headers": {"Content-Type": "application/json"}, "body": body}
+
+
+async def _read_chunked(reader):
+    chunks = []
+    size = 0
+    while True:
+        chunk_size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+        if chunk_size == 0:
+            # Skip trailers up to the empty line
+            while (await reader.readline()).strip():
+                pass
+            return b"".join(chunks)
+        size += chunk_size
+        if size > MAX_BODY_BYTES:
+            raise BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        chunks.append(await reader.readexactly(chunk_size))
+        await reader.readexactly(2)
+
+
+async def _read_request(reader):
+    """Return (method, target, version, headers, body) or None at the end of the connection.
+
+    Raises BadRequest for requests that cannot be handled.
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").rstrip("\r\n").split(" ")
+    except ValueError:
+        raise BadRequest(HTTPStatus.BAD_REQUEST) from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise BadRequest(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip()] = value.strip()
+
+    lower_headers = {name.lower(): value for name, value in headers.items()}
+    if lower_headers.get("transfer-encoding", "").lower() == "chunked":
+        body = await _read_chunked(reader)
+    else:
+        try:
+            length = int(lower_headers.get("content-length", "0"))
+        except ValueError:
+            raise BadRequest(HTTPStatus.BAD_REQUEST) from None
+        if length > MAX_BODY_BYTES:
+            raise BadRequest(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length > 0 else b""
+    return method, target, version, headers, body
+
+
+def build_event(method, target, headers, body):
+    """Return the API Gateway proxy event for an HTTP request."""
+    path, _, query = target.partition("?")
+    query_parameters = parse_qs(query, keep_blank_values=True)
+    event = {
+        "httpMethod": method,
+        "path": path,
+        "headers": headers,
+        "queryStringParameters": {name: values[-1] for name, values in query_parameters.items()} or None,
+        "multiValueQueryStringParameters": query_parameters or None,
+        "body": None,
+        "isBase64Encoded": False
+    }
+    if not body:
+        return event
+
+    # Like API Gateway with binary media types, compressed bodies and bodies that
+    # are not UTF-8 text arrive base64 encoded
+    text = None
+    if not any(name.lower() == "content-encoding" for name in headers):
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+    if text is not None:
+        event["body"] = text
+    else:
+        event["body"] = base64.b64encode(body).decode("ascii")
+        event["isBase64Encoded"] = True
+    return event
+
+
+def _route_error(method, path):
+    # Returns the error response for requests outside the API, None for routed requests
+    path = path.rstrip("/")
+    if is_session_request(path):
+        return None
+    if path in POST_ROUTES:
+        return None if method == "POST" else _status_response(HTTPStatus.METHOD_NOT_ALLOWED)
+    return _status_response(HTTPStatus.NOT_FOUND)
+
+
+def encode_response(response, keep_alive):
+    """Return the HTTP/1.1 bytes of a Lambda proxy response."""
+    body = response.get("body") or ""
+    data = base64.b64decode(body) if response.get("isBase64Encoded") else body.encode("utf-8")
+    status = response["statusCode"]
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    lines += [f"{name}: {value}" for name, value in (response.get("headers") or {}).items()]
+    lines.append(f"Content-Length: {len(data)}")
+    lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data
+
+
+def encode_streamed_head(status, headers, keep_alive):
+    """Return the HTTP/1.1 head of a chunked response, the body follows as encode_chunk() pieces."""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append("Transfer-Encoding: chunked")
+    lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def encode_chunk(data):
+    # An empty chunk ends the body
+    return b"%x\r\n%s\r\n" % (len(data), data)
+
+
+def _is_streamed(event):
+    # POST /api/v1/meetings/optimize?stream=true answers with a chunked body, written while the finished result is encoded
+    parameters = event.get("queryStringParameters") or {}
+    return parameters.get("stream") == "true" and event["path"].rstrip("/") == OPTIMIZE_ROUTE
+
+
+def _keep_alive(version, headers):
+    connection = next((value.lower() for name, value in headers.items() if name.lower() == "connection"), "")
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+class OptimizerServer:
+    """asyncio HTTP/1.1 server around lambda_handler.
+
+    At most max_concurrency requests are handled at once. With workers, every
+    request is optimized in a pool of worker processes, except for session
+    requests, whose state lives in this process. The size of a body says little
+    about its cost (recurring slots, columnar bodies), so none runs on the event
+    loop. Streamed requests get
+    their body from body_handler and are encoded here, chunk by chunk.
+    """
+
+    def __init__(self, handler=lambda_handler, max_concurrency=DEFAULT_MAX_CONCURRENCY, workers=None,
+                 body_handler=optimize_event):
+        self.handler = handler
+        self.body_handler = body_handler
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.pool = None
+        if workers != 0:
+            # Workers are spawned, forking a process that runs an event loop and threads is unsafe
+            self.pool = ProcessPoolExecutor(workers or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _call(self, function, event, *args):
+        if self.pool is not None and not is_session_request(event["path"]):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, function, event, *args)
+        return function(event, *args)
+
+    async def handle(self, event):
+        error = _route_error(event["httpMethod"], event["path"])
+        if error is not None:
+            return error
+        async with self.semaphore:
+            try:
+                return await self._call(self.handler, event, None)
+            except Exception:
+                # API Gateway answers 502 when the Lambda raises
+                return _status_response(HTTPStatus.BAD_GATEWAY, "Internal server error")
+
+    async def handle_streamed(self, event, writer, keep_alive):
+        # The complete body is computed first, in a worker, then its JSON text is written as it is encoded
+        async with self.semaphore:
+            try:
+                status_code, body = await self._call(self.body_handler, event)
+            except Exception:
+                writer.write(encode_response(_status_response(HTTPStatus.BAD_GATEWAY, "Internal server error"), keep_alive))
+                return
+        writer.write(encode_streamed_head(status_code, {"Content-Type": "application/json"}, keep_alive))
+        for text in iter_json_chunks(body):
+            writer.write(encode_chunk(text.encode("utf-8")))
+            await writer.drain()
+        writer.write(encode_chunk(b""))
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT_SECONDS)
+                except BadRequest as e:
+                    writer.write(encode_response(_status_response(e.status), keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                keep_alive = _keep_alive(version, headers)
+                event = build_event(method, target, headers, body)
+                if method == "POST" and _is_streamed(event):
+                    await self.handle_streamed(event, writer, keep_alive)
+                else:
+                    writer.write(encode_response(await self.handle(event), keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            # Idle, closed or malformed connections are dropped
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, **options):
+    server = OptimizerServer(**options)
+    await server.start(host, port)
+    print(f"Serving on http://{host}:{port}{API_PREFIX}/optimize", flush=True)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stopped.set)
+    await stopped.wait()
+    await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--workers", type=int, help="worker processes for optimize requests, 0 disables them (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    asyncio.run(serve(
+        args.host, args.port, max_concurrency=args.max_concurrency, workers=args.workers
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Meeting slot optimization logic used by the optimal_time_slot_lambda handler
@@ -0,0 +1,83 @@
+import os
+
+from .meeting import optimize_meeting
+
+INVALID_MEETINGS_ERROR = "Missing or invalid required field: meetings (must be a non-empty list)"
+INVALID_MEETING_ERROR = "Invalid meeting (must be an object)"
+
+# Batches with fewer slot entries than this are not worth forking worker processes for
+BATCH_PARALLEL_MIN_ENTRIES = 50_000
+
+
+def _optimize_batch_item(meeting):
+    if not isinstance(meeting, dict):
+        return 400, {"error": INVALID_MEETING_ERROR}
+    return optimize_meeting(meeting)
+
+
+def _entry_count(meetings):
+    # Rough size of the batch: the number of preferred slots across all meetings
+    count = 0
+    for meeting in meetings:
+        participants = meeting.get("participants") if isinstance(meeting, dict) else None
+        if isinstance(participants, list):
+            for participant in participants:
+                slots = participant.get("preferredSlots") if isinstance(participant, dict) else None
+                if isinstance(slots, list):
+                    count += len(slots)
+    return count
+
+
+def _run_chunk(connection, meetings):
+    try:
+        connection.send([_optimize_batch_item(meeting) for meeting in meetings])
+    finally:
+        connection.close()
+
+
+def _optimize_in_processes(meetings, workers):
+    # Lambda has no /dev/shm, so multiprocessing.Pool and ProcessPoolExecutor are not
+    # available there. Plain forked processes reporting back over pipes work everywhere.
+    import multiprocessing
+
+    context = multiprocessing.get_context("fork")
+    jobs = []
+    for index in range(workers):
+        # Round-robin chunks keep large and small meetings spread across workers
+        chunk = meetings[index::workers]
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_chunk, args=(sender, chunk))
+        process.start()
+        sender.close()
+        jobs.append((index, chunk, receiver, process))
+
+    results = [None] * len(meetings)
+    for index, chunk, receiver, process in jobs:
+        try:
+            chunk_results = receiver.recv()
+        except EOFError:
+            # The worker died, compute its chunk here instead
+            chunk_results = [_optimize_batch_item(meeting) for meeting in chunk]
+        finally:
+            receiver.close()
+        process.join()
+        results[index::workers] = chunk_results
+    return results
+
+
+def optimize_meetings(meetings, workers=None):
+    """Optimize every meeting of a batch, in worker processes when it pays off.
+
+    Returns a list of (status_code, response_body) in input order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(meetings))
+
+    if workers > 1 and _entry_count(meetings) >= BATCH_PARALLEL_MIN_ENTRIES:
+        # Imported here so that cold starts of small requests skip it
+        import multiprocessing
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            return _optimize_in_processes(meetings, workers)
+    return [_optimize_batch_item(meeting) for meeting in meetings]
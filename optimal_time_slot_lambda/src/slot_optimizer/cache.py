@@ -0,0 +1,198 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from .json_codec import dumps, dumps_canonical, loads
+
+# Bump when the response format changes so persisted results are not reused
+CACHE_KEY_VERSION = "2"
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_TTL_SECONDS = 300
+# Entries are weighed by their JSON size. The defaults keep the cache well inside
+# a 128 MB Lambda, larger responses are not cached at all.
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_CACHE_MAX_ENTRY_BYTES = 2 * 1024 * 1024
+# Full results of paged requests are cached apart from responses, in their
+# compact form and with a limit of their own, so a large result fits whole
+DEFAULT_PAGE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+
+def fingerprint(body):
+    """Canonical hash of a parsed request body.
+
+    Key order and whitespace do not matter. Participant and slot order are kept
+    because they decide the order of optimalSlots and of their participants.
+    """
+    canonical = dumps_canonical(body)
+    return hashlib.sha256(f"{CACHE_KEY_VERSION}:{canonical}".encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def raw_fingerprint(raw_body):
+    # Streamed bodies are never fully parsed, so they are keyed by their exact text
+    return hashlib.sha256(f"{CACHE_KEY_VERSION}:raw:{raw_body}".encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def binary_fingerprint(data):
+    # Columnar bodies are keyed by their bytes, hashed without a copy
+    digest = hashlib.sha256(f"{CACHE_KEY_VERSION}:columns:".encode("ascii"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class SQLiteCacheBackend:
+    # Persistent tier that survives container recycling, e.g. on a mounted file system
+
+    def __init__(self, path):
+        # sqlite3 is only imported when a SQLite path is configured
+        import sqlite3
+
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key, now):
+        row = self.connection.execute(
+            "SELECT value FROM results WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    def set(self, key, value, expires_at):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, dumps(value), expires_at)
+        )
+
+    def clear(self):
+        self.connection.execute("DELETE FROM results")
+
+
+class ResultCache:
+    """LRU cache with a TTL that lives across warm invocations.
+
+    Entries are evicted once there are more than max_size of them or their sizes
+    add up to more than max_bytes. Entries larger than max_entry_bytes are not
+    stored. An optional backend with get(key, now), set(key, value, expires_at) and
+    clear() is used as a second tier behind the in-memory entries.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, ttl_seconds=DEFAULT_CACHE_TTL_SECONDS, backend=None, clock=time.time,
+                 max_bytes=DEFAULT_CACHE_MAX_BYTES, max_entry_bytes=DEFAULT_CACHE_MAX_ENTRY_BYTES):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.bytes = 0
+        self.backend = backend
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.reset_stats()
+
+    @classmethod
+    def from_environment(cls, environ=os.environ):
+        # RESULT_CACHE_SIZE=0 disables the cache
+        backend_path = environ.get("RESULT_CACHE_SQLITE_PATH")
+        return cls(
+            max_size=int(environ.get("RESULT_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            ttl_seconds=float(environ.get("RESULT_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)),
+            max_bytes=int(environ.get("RESULT_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)),
+            max_entry_bytes=int(environ.get("RESULT_CACHE_MAX_ENTRY_BYTES", DEFAULT_CACHE_MAX_ENTRY_BYTES)),
+            backend=SQLiteCacheBackend(backend_path) if backend_path else None
+        )
+
+    @classmethod
+    def for_pages(cls, environ=os.environ):
+        # Entries are CompactBody objects sized by the caller, there is no SQLite tier for them
+        max_bytes = int(environ.get("PAGE_CACHE_MAX_BYTES", DEFAULT_PAGE_CACHE_MAX_BYTES))
+        return cls(
+            max_size=int(environ.get("RESULT_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            ttl_seconds=float(environ.get("RESULT_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)),
+            max_bytes=max_bytes,
+            max_entry_bytes=max_bytes
+        )
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, key):
+        now = self.clock()
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires_at, value, _ = entry
+            if expires_at > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._discard(key)
+            self.expirations += 1
+
+        if self.backend is not None:
+            value = self.backend.get(key, now)
+            if value is not None:
+                self.backend_hits += 1
+                self._store(key, value, now + self.ttl_seconds, len(dumps(value)))
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key, value, size=None):
+        # size is the value's JSON length, computed here when the caller does not know it
+        if size is None:
+            size = len(dumps(value))
+        if size > self.max_entry_bytes:
+            self._discard(key)
+            self.skipped += 1
+            return
+        expires_at = self.clock() + self.ttl_seconds
+        self._store(key, value, expires_at, size)
+        if self.backend is not None:
+            self.backend.set(key, value, expires_at)
+
+    def _store(self, key, value, expires_at, size):
+        if size > self.max_entry_bytes:
+            return
+        self._discard(key)
+        self.entries[key] = (expires_at, value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_size or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        if self.backend is not None:
+            self.backend.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.skipped = 0
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "maxSize": self.max_size,
+            "bytes": self.bytes,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "backendHits": self.backend_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "skipped": self.skipped
+        }
@@ -0,0 +1,148 @@
+import struct
+import sys
+from array import array
+from itertools import chain
+from operator import ge
+
+from .engine import load_numpy
+from .json_codec import dumps, loads
+from .slots import MAX_SLOT, MIN_SLOT
+
+# Columnar bulk upload. Instead of JSON preferredSlots strings, a request can
+# carry its availability as two little-endian int64 columns that are read
+# without copying and handed to the engine as they are:
+#
+#   b"OTS1"                  magic
+#   uint32                   header length H
+#   H bytes                  UTF-8 JSON header: meetingName, "names" (one per
+#                            participant) and the usual options
+#   zero padding             up to a multiple of 8 bytes
+#   int64[len(names)]        row ends: participant i owns slots[row_ends[i-1]:row_ends[i]]
+#   int64[row_ends[-1]]      slots in UTC minutes since the epoch, strictly
+#                            increasing within each participant
+#
+# find_optimal_slots_columns() counts these columns as they are, so nothing is
+# parsed or re-validated per slot.
+
+COLUMNAR_CONTENT_TYPE = "application/vnd.optimal-time-slot.columns"
+MAGIC = b"OTS1"
+
+_PREFIX = struct.Struct("<4sI")
+_ITEM_SIZE = 8
+
+
+def is_columnar_request(content_type):
+    return (content_type or "").split(";")[0].strip().lower() == COLUMNAR_CONTENT_TYPE
+
+
+def _padded(length):
+    return -(-length // _ITEM_SIZE) * _ITEM_SIZE
+
+
+def _int64_column(data, start, count):
+    # A read-only view of the body, byte-swapped into a copy only on big-endian machines
+    view = data[start:start + count * _ITEM_SIZE].cast("q")
+    if sys.byteorder == "little":
+        return view
+    column = array("q", view)
+    column.byteswap()
+    return memoryview(column)
+
+
+def decode_columns(data):
+    """Return (header, row ends, slots) of a columnar body.
+
+    The columns are memoryviews of int64 into data. Raises ValueError for bodies
+    that do not follow the layout, without checking the slot order.
+    """
+    data = memoryview(data)
+    if len(data) < _PREFIX.size:
+        raise ValueError("Body too short")
+    magic, header_length = _PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Unknown format")
+    header_end = _PREFIX.size + header_length
+    header = loads(bytes(data[_PREFIX.size:header_end]).decode("utf-8"))
+    if not isinstance(header, dict) or not isinstance(header.get("names"), list):
+        raise ValueError("Invalid header")
+
+    participant_count = len(header["names"])
+    columns_start = _padded(header_end)
+    if len(data) < columns_start + participant_count * _ITEM_SIZE:
+        raise ValueError("Body too short")
+    row_ends = _int64_column(data, columns_start, participant_count)
+    slot_count = row_ends[-1] if participant_count else 0
+    slots_start = columns_start + participant_count * _ITEM_SIZE
+    if slot_count < 0 or len(data) != slots_start + slot_count * _ITEM_SIZE:
+        raise ValueError("Column lengths do not match the body")
+    return header, row_ends, _int64_column(data, slots_start, slot_count)
+
+
+def row_bounds(row_ends):
+    # (start, end) of every participant's slots
+    return zip(chain((0,), row_ends), row_ends)
+
+
+def invalid_rows(row_ends, slots):
+    """Return the indices of the participants whose slots are out of order, repeated or out of range.
+
+    Runs over the columns without converting them, in NumPy when it is installed.
+    """
+    np = load_numpy()
+    if np is not None:
+        return _invalid_rows_numpy(np, row_ends, slots)
+    return _invalid_rows_python(row_ends, slots)
+
+
+def _invalid_rows_numpy(np, row_ends, slots):
+    ends = np.frombuffer(row_ends, dtype=np.int64)
+    values = np.frombuffer(slots, dtype=np.int64)
+    starts = np.concatenate((np.zeros(1, dtype=np.int64), ends[:-1]))
+    bad_bounds = np.flatnonzero((starts < 0) | (starts > ends) | (ends > len(values)))
+    if len(bad_bounds):
+        return bad_bounds.tolist()
+
+    # Neighbours that do not increase, unless the second one starts a new row
+    row_starts = np.zeros(len(values) + 1, dtype=bool)
+    row_starts[starts] = True
+    steps = np.flatnonzero(values[1:] <= values[:-1]) + 1
+    bad_positions = np.concatenate((
+        steps[~row_starts[steps]],
+        np.flatnonzero((values < MIN_SLOT) | (values > MAX_SLOT))
+    ))
+    return np.unique(np.searchsorted(ends, bad_positions, side="right")).tolist()
+
+
+def _invalid_rows_python(row_ends, slots):
+    # Comparisons run in C through map(), rows are sorted so only their ends need a range check
+    bounds = list(row_bounds(row_ends))
+    rows = [index for index, (start, end) in enumerate(bounds) if not 0 <= start <= end <= len(slots)]
+    if rows:
+        return rows
+
+    check_range = len(slots) > 0 and (min(slots) < MIN_SLOT or max(slots) > MAX_SLOT)
+    for index, (start, end) in enumerate(bounds):
+        row = slots[start:end]
+        if any(map(ge, row, row[1:])) or (check_range and end > start and (row[0] < MIN_SLOT or row[-1] > MAX_SLOT)):
+            rows.append(index)
+    return rows
+
+
+def encode_columns(header, participants):
+    """Return the columnar body for a header and [(name, [slot offsets])].
+
+    The slots of each participant are sorted and deduplicated.
+    """
+    row_ends = array("q")
+    slots = array("q")
+    names = []
+    for name, encoded_slots in participants:
+        names.append(name)
+        slots.extend(sorted(set(encoded_slots)))
+        row_ends.append(len(slots))
+    encoded_header = dumps(dict(header, names=names)).encode("utf-8")
+    if sys.byteorder != "little":
+        row_ends.byteswap()
+        slots.byteswap()
+    prefix = _PREFIX.pack(MAGIC, len(encoded_header)) + encoded_header
+    return prefix + bytes(_padded(len(prefix)) - len(prefix)) + row_ends.tobytes() + slots.tobytes()
@@ -0,0 +1,109 @@
+import base64
+import binascii
+import gzip
+import zlib
+
+# gzip support for request and response bodies. API Gateway passes binary
+# bodies base64 encoded with isBase64Encoded set, and decodes base64 response
+# bodies the same way when the API accepts binary media types.
+
+INVALID_BODY_ENCODING_ERROR = "Invalid request body encoding (expected UTF-8 JSON, optionally gzip compressed)"
+
+# Small responses gain little from compression and cost CPU time
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_LEVEL = 5
+
+# Limits how far a compressed request may expand
+MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class BodyEncodingError(ValueError):
+    pass
+
+
+def header(event, name):
+    # API Gateway keeps the client's header case, so look headers up case-insensitively
+    name = name.lower()
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _gunzip(data):
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        text = decompressor.decompress(data, MAX_DECOMPRESSED_BYTES)
+    except zlib.error as e:
+        raise BodyEncodingError(INVALID_BODY_ENCODING_ERROR) from e
+    if decompressor.unconsumed_tail or not decompressor.eof:
+        raise BodyEncodingError(INVALID_BODY_ENCODING_ERROR)
+    return text
+
+
+def decode_request_body(event):
+    """Return the request body as text, decoding base64 and gzip when needed.
+
+    Raises BodyEncodingError for bodies that cannot be decoded.
+    """
+    raw_body = event.get("body", "{}")
+    if not event.get("isBase64Encoded") or raw_body is None:
+        return raw_body
+    try:
+        return decode_request_bytes(event).decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise BodyEncodingError(INVALID_BODY_ENCODING_ERROR) from e
+
+
+def decode_request_bytes(event):
+    """Return the request body as bytes, decoding base64 and gzip when needed.
+
+    Raises BodyEncodingError for bodies that cannot be decoded.
+    """
+    raw_body = event.get("body") or ""
+    if not event.get("isBase64Encoded"):
+        return raw_body.encode("utf-8", "surrogatepass")
+
+    try:
+        data = base64.b64decode(raw_body, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise BodyEncodingError(INVALID_BODY_ENCODING_ERROR) from e
+
+    # Binary bodies are gzip when announced or when they start with the gzip magic number
+    if (header(event, "Content-Encoding") or "").lower() == "gzip" or data.startswith(GZIP_MAGIC):
+        data = _gunzip(data)
+    return data
+
+
+def accepts_gzip(event):
+    # Accept-Encoding: gzip, deflate, br;q=0.5 -> gzip unless it has q=0
+    for coding in (header(event, "Accept-Encoding") or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            quality = params.strip().lower()
+            return not quality.startswith("q=") or _quality(quality[2:]) > 0
+    return False
+
+
+def _quality(value):
+    try:
+        return float(value)
+    except ValueError:
+        return 0
+
+
+def compress_response(response, min_bytes=COMPRESSION_MIN_BYTES):
+    # Returns a gzip compressed copy of the response, or the response itself when it is small
+    body = response["body"].encode("utf-8")
+    if len(body) < min_bytes:
+        return response
+    headers = dict(response["headers"], **{"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    compressed = gzip.compress(body, compresslevel=COMPRESSION_LEVEL, mtime=0)
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compressed).decode("ascii"),
+        isBase64Encoded=True
+    )
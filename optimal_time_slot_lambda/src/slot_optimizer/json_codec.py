@@ -0,0 +1,51 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, the standard library is used without it
+    orjson = None
+
+# Both codecs produce compact, UTF-8 (not ASCII-escaped) JSON text so responses
+# look the same whichever one is installed. orjson.JSONDecodeError is a
+# subclass of json.JSONDecodeError, so callers only catch the latter.
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_canonical_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+
+if orjson is not None:
+    # orjson is stricter (64-bit integers, no lone surrogates, no NaN), so
+    # anything it refuses goes through the standard library instead
+    def dumps(obj):
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_canonical(obj):
+        # Sorted keys, used for fingerprints
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+
+    def loads(text):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)
+
+else:
+    def dumps(obj):
+        return _encoder.encode(obj)
+
+    def dumps_canonical(obj):
+        # Sorted keys, used for fingerprints
+        return _canonical_encoder.encode(obj)
+
+    def loads(text):
+        return json.loads(text)
+
+
+def codec_name():
+    return "orjson" if orjson is not None else "json"
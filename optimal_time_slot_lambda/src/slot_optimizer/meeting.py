@@ -0,0 +1,643 @@
+import json
+import time
+
+from .columnar import decode_columns, invalid_rows, row_bounds
+from .engine import SlotAggregator, find_optimal_slots_columns
+from .json_codec import loads
+from .metrics import NULL_METRICS
+from .quorum import find_quorum_slots, parse_quorum
+from .ranking import collect_names, count_slots, is_valid_top_k, select_top_slots
+from .ranges import (
+    DEFAULT_GRANULARITY_MINUTES, find_optimal_starts, find_optimal_windows, is_valid_duration, is_valid_granularity
+)
+from .recurrence import parse_horizon
+from .sketch import APPROXIMATE_MAX_CACHED_SLOTS, SlotSketch
+from .slots import decode_slot
+from .stream import STREAMED, SlotCounter, collect_candidate_names, collect_optimal_slots, stream_body
+from .timezones import is_valid_zone, zoned_slot_formatter
+from .validation import (
+    DEFAULT_ERROR_MODE, DEFAULT_MAX_ERRORS, ERROR_MODES, ErrorCollector, ParticipantValidator, ValidationError,
+    is_valid_max_errors
+)
+from .weights import is_weighted_request, score_slots, validate_weighted_participant
+
+INVALID_JSON_ERROR = "Invalid JSON in request body"
+INVALID_MEETING_NAME_ERROR = "Missing or invalid required field: meetingName (must be a non-empty string)"
+INVALID_PARTICIPANTS_ERROR = "Missing or invalid required field: participants (must be a non-empty list)"
+INVALID_GRANULARITY_ERROR = "Invalid field: granularityMinutes (must be an integer between 1 and 1440)"
+INVALID_DURATION_ERROR = "Invalid field: durationMinutes (must be a multiple of granularityMinutes between granularityMinutes and 1440)"
+INVALID_TOP_K_ERROR = "Invalid field: topK (must be an integer between 1 and 1000)"
+TOP_K_WITH_RANGES_ERROR = "Invalid field: topK (not supported with preferredRanges, granularityMinutes or durationMinutes)"
+WEIGHTS_WITH_RANGES_ERROR = "Invalid field: weight and required are not supported with preferredRanges, granularityMinutes or durationMinutes"
+INVALID_RESPONSE_FORMAT_ERROR = "Invalid field: responseFormat (must be one of full, indices, counts)"
+INVALID_ERROR_MODE_ERROR = "Invalid field: errorMode (must be one of first, all)"
+INVALID_MAX_ERRORS_ERROR = "Invalid field: maxErrors (must be an integer between 1 and 1000)"
+INVALID_TIME_ZONE_ERROR = "Invalid field: timeZone (must be an IANA time zone name such as Europe/Berlin)"
+INVALID_HORIZON_ERROR = 'Invalid field: horizon (must be {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"} covering at most 366 days between the years 0002 and 9998)'
+INVALID_QUORUM_ERROR = 'Invalid field: quorum (must be {"required": [participant names], "minOthers": non-negative integer})'
+QUORUM_NOT_SUPPORTED_ERROR = "Invalid field: quorum (not supported with preferredRanges, granularityMinutes, durationMinutes, weight or required)"
+UNKNOWN_QUORUM_PARTICIPANT_ERROR = "Invalid field: quorum (no participant named '{}')"
+INVALID_APPROXIMATE_ERROR = "Invalid field: approximate (must be a boolean)"
+APPROXIMATE_NOT_SUPPORTED_ERROR = "Invalid field: approximate (not supported with preferredRanges, granularityMinutes, durationMinutes, weight, required or quorum)"
+INVALID_COLUMNS_ERROR = "Invalid columnar request body (see the columnar format in the README)"
+INVALID_NAME_ERROR = "Missing or invalid required field: name (must be a non-empty string)"
+INVALID_ROW_ERROR = "Participant '{}' has invalid slots (must be strictly increasing minutes since the epoch within the supported years)"
+NO_OVERLAP_MESSAGE = "No overlapping time slots found between participants"
+
+
+def is_valid_meeting_name(meeting_name):
+    # meetingName must exist, be a string and not be just whitespace
+    return bool(meeting_name) and isinstance(meeting_name, str) and meeting_name.strip() != ""
+
+
+# "full" lists participant names for every slot, "indices" lists positions in the
+# request's participants array and "counts" only gives the number of participants
+RESPONSE_FORMATS = ("full", "indices", "counts")
+DEFAULT_RESPONSE_FORMAT = "full"
+
+
+def uses_indices(response_format):
+    # Engines work with any participant label, so "indices" labels participants by position
+    return response_format == "indices"
+
+
+def participants_field(names, response_format):
+    if response_format == "counts":
+        return {"count": len(names)}
+    return {"participants": names}
+
+
+def slot_formatter(validator, time_zone):
+    # Requests that use time zones get slots with their UTC offset, in the meeting's zone or UTC
+    return zoned_slot_formatter(time_zone) if validator.zoned else decode_slot
+
+
+def build_response_body(meeting_name, max_participants, optimal_slots, response_format=DEFAULT_RESPONSE_FORMAT,
+                        format_slot=decode_slot):
+    # Rebuild slot strings only for the optimal slots
+    optimal_slots = [
+        {"slot": format_slot(slot), **participants_field(names, response_format)}
+        for slot, names in optimal_slots
+        if max_participants > 1
+    ]
+
+    response_body = {
+        "meetingName": meeting_name,
+        "optimalSlots": optimal_slots,
+        "maxParticipants": max_participants
+    }
+
+    # If no slots have more than 1 participant
+    if not optimal_slots:
+        response_body["message"] = NO_OVERLAP_MESSAGE
+
+    return response_body
+
+
+def add_quorum_slots(response_body, quorum_slots, names_by_slot, response_format=DEFAULT_RESPONSE_FORMAT,
+                     format_slot=decode_slot):
+    # quorum requests also get every slot the required participants can all attend with enough others
+    response_body["quorumSlots"] = [
+        {"slot": format_slot(slot), **participants_field(names_by_slot[slot], response_format), "others": others}
+        for slot, others in quorum_slots
+    ]
+    return response_body
+
+
+def build_approximate_response_body(meeting_name, sketch, names_by_slot, top_k=None,
+                                    response_format=DEFAULT_RESPONSE_FORMAT, format_slot=decode_slot):
+    # names_by_slot holds the exact names of the sketch's candidates, earliest slot first
+    counts = {slot: len(names) for slot, names in names_by_slot.items()}
+    max_participants = max(counts.values(), default=0)
+    optimal_slots = [(slot, names) for slot, names in names_by_slot.items() if len(names) == max_participants]
+    response_body = build_response_body(meeting_name, max_participants, optimal_slots, response_format, format_slot)
+    if top_k is not None:
+        ranked_slots = [(slot, names_by_slot[slot]) for slot in select_top_slots(counts, top_k)]
+        add_ranked_slots(response_body, ranked_slots, response_format, format_slot)
+    response_body["approximation"] = sketch.summary(max_participants)
+    return response_body
+
+
+def internal_error_body(e):
+    # For unexpected errors
+    return {"error": f"Internal server error: {str(e)}"}
+
+
+def add_ranked_slots(response_body, ranked_slots, response_format=DEFAULT_RESPONSE_FORMAT, format_slot=decode_slot):
+    # topK requests also get the best slots in order, even those with a single attendee
+    response_body["rankedSlots"] = [
+        {"slot": format_slot(slot), **participants_field(names, response_format)}
+        for slot, names in ranked_slots
+    ]
+    return response_body
+
+
+def build_windows_response_body(meeting_name, max_participants, windows, response_format=DEFAULT_RESPONSE_FORMAT,
+                                format_slot=decode_slot):
+    # Range requests return windows with an end next to the usual slot start
+    optimal_slots = [
+        {"slot": format_slot(start), "end": format_slot(end), **participants_field(names, response_format)}
+        for start, end, names in windows
+        if max_participants > 1
+    ]
+
+    response_body = {
+        "meetingName": meeting_name,
+        "optimalSlots": optimal_slots,
+        "maxParticipants": max_participants
+    }
+
+    if not optimal_slots:
+        response_body["message"] = NO_OVERLAP_MESSAGE
+
+    return response_body
+
+
+def build_weighted_response_body(meeting_name, max_score, optimal_slots, scores, response_format=DEFAULT_RESPONSE_FORMAT,
+                                 format_slot=decode_slot):
+    # Weighted requests report each slot's score next to its participants
+    max_participants = max((len(names) for _, names in optimal_slots), default=0)
+    response_body = {
+        "meetingName": meeting_name,
+        "optimalSlots": [
+            {"slot": format_slot(slot), **participants_field(names, response_format), "score": scores[slot]}
+            for slot, names in optimal_slots
+            if max_participants > 1
+        ],
+        "maxParticipants": max_participants,
+        "maxScore": max_score
+    }
+
+    if not response_body["optimalSlots"]:
+        response_body["message"] = NO_OVERLAP_MESSAGE
+
+    return response_body
+
+
+def create_error_collector(body):
+    """Return an ErrorCollector for the request's errorMode and maxErrors.
+
+    Returns (None, error message) when those options are invalid themselves.
+    """
+    error_mode = body.get("errorMode", DEFAULT_ERROR_MODE)
+    if error_mode not in ERROR_MODES:
+        return None, INVALID_ERROR_MODE_ERROR
+    max_errors = body.get("maxErrors", DEFAULT_MAX_ERRORS)
+    if not is_valid_max_errors(max_errors):
+        return None, INVALID_MAX_ERRORS_ERROR
+    return ErrorCollector(error_mode, max_errors), None
+
+
+def optimize_weighted_meeting(meeting_name, participants, top_k, response_format, errors=None, time_zone=None,
+                              horizon=None, metrics=NULL_METRICS):
+    if errors is None:
+        errors = ErrorCollector()
+    validator = ParticipantValidator(time_zone, horizon)
+    weighted_participants = []
+    with metrics.timer("ValidationMs"):
+        for index, participant in enumerate(participants):
+            try:
+                weighted_participants.append(validate_weighted_participant(participant, validator))
+            except ValidationError as e:
+                if errors.add(str(e), index):
+                    break
+    if errors:
+        return 400, errors.response_body()
+
+    if metrics.enabled:
+        metrics.set("Participants", len(weighted_participants))
+        metrics.set("Slots", sum(len(encoded_slots) for _, encoded_slots, _, _ in weighted_participants))
+
+    try:
+        with metrics.timer("AggregationMs"):
+            # Only slots every required participant can attend are scored
+            scores = score_slots(weighted_participants)
+            max_score = max(scores.values(), default=0)
+            winning_slots = [slot for slot, score in scores.items() if score == max_score]
+            top_slots = select_top_slots(scores, top_k) if top_k is not None else []
+
+            encoded_participants = [
+                (index if uses_indices(response_format) else name, encoded_slots)
+                for index, (name, encoded_slots, _, _) in enumerate(weighted_participants)
+            ]
+            names_by_slot = collect_names(encoded_participants, winning_slots + top_slots)
+        metrics.set("DistinctSlots", len(scores))
+
+        optimal_slots = [(slot, names_by_slot[slot]) for slot in winning_slots]
+        format_slot = slot_formatter(validator, time_zone)
+        response_body = build_weighted_response_body(
+            meeting_name, max_score, optimal_slots, scores, response_format, format_slot
+        )
+        if top_k is not None:
+            response_body["rankedSlots"] = [
+                {"slot": format_slot(slot), **participants_field(names_by_slot[slot], response_format), "score": scores[slot]}
+                for slot in top_slots
+            ]
+        return 200, response_body
+    except Exception as e:
+        return 500, internal_error_body(e)
+
+
+def is_range_request(body, participants):
+    # Range mode is used as soon as any participant sends preferredRanges or a granularity or duration is given
+    return "granularityMinutes" in body or "durationMinutes" in body or any(
+        isinstance(participant, dict) and "preferredRanges" in participant
+        for participant in participants
+    )
+
+
+def optimize_range_meeting(meeting_name, body, participants, response_format, errors=None, time_zone=None,
+                           horizon=None, metrics=NULL_METRICS):
+    if errors is None:
+        errors = ErrorCollector()
+    granularity = body.get("granularityMinutes", DEFAULT_GRANULARITY_MINUTES)
+    if not is_valid_granularity(granularity) and errors.add(INVALID_GRANULARITY_ERROR):
+        return 400, errors.response_body()
+    # Without a duration the windows of any length are returned instead of start times
+    duration = body.get("durationMinutes")
+    if (
+        duration is not None and is_valid_granularity(granularity) and not is_valid_duration(duration, granularity)
+        and errors.add(INVALID_DURATION_ERROR)
+    ):
+        return 400, errors.response_body()
+
+    validator = ParticipantValidator(time_zone, horizon)
+    range_participants = []
+    with metrics.timer("ValidationMs"):
+        for index, participant in enumerate(participants):
+            try:
+                name, encoded_slots, encoded_ranges = validator.validate_ranges(participant)
+            except ValidationError as e:
+                if errors.add(str(e), index):
+                    break
+                continue
+            label = index if uses_indices(response_format) else name
+            range_participants.append((label, encoded_slots, encoded_ranges))
+    if errors:
+        return 400, errors.response_body()
+
+    if metrics.enabled:
+        # Slots counts the slots and ranges as sent, a range is one entry
+        metrics.set("Participants", len(range_participants))
+        metrics.set("Slots", sum(len(encoded_slots) + len(encoded_ranges) for _, encoded_slots, encoded_ranges in range_participants))
+
+    try:
+        with metrics.timer("AggregationMs"):
+            if duration is None:
+                max_participants, windows = find_optimal_windows(range_participants, granularity)
+            else:
+                max_participants, windows = find_optimal_starts(range_participants, granularity, duration)
+        return 200, build_windows_response_body(
+            meeting_name, max_participants, windows, response_format, slot_formatter(validator, time_zone)
+        )
+    except Exception as e:
+        return 500, internal_error_body(e)
+
+
+def optimize_approximate_meeting(meeting_name, participants, top_k, response_format, errors=None, time_zone=None,
+                                 horizon=None, metrics=NULL_METRICS):
+    if errors is None:
+        errors = ErrorCollector()
+    # Slots are counted in a fixed-size sketch instead of per slot, nothing is kept per participant
+    validator = ParticipantValidator(time_zone, horizon, APPROXIMATE_MAX_CACHED_SLOTS)
+    sketch = SlotSketch()
+    with metrics.timer("ValidationMs"):
+        for index, participant in enumerate(participants):
+            try:
+                _, encoded_slots = validator.validate(participant)
+            except ValidationError as e:
+                if errors.add(str(e), index):
+                    break
+                continue
+            if not errors:
+                sketch.update(encoded_slots)
+    if errors:
+        return 400, errors.response_body()
+
+    if metrics.enabled:
+        metrics.set("Participants", len(participants))
+        metrics.set("Slots", sketch.entries)
+
+    try:
+        # The participants are validated a second time to recount the candidates exactly
+        label_by_index = uses_indices(response_format)
+        encoded_participants = (
+            (index if label_by_index else name, encoded_slots)
+            for index, (name, encoded_slots) in enumerate(map(validator.validate, participants))
+        )
+        with metrics.timer("AggregationMs"):
+            names_by_slot = collect_names(encoded_participants, sketch.candidate_slots())
+        format_slot = slot_formatter(validator, time_zone)
+        return 200, build_approximate_response_body(
+            meeting_name, sketch, names_by_slot, top_k, response_format, format_slot
+        )
+    except Exception as e:
+        return 500, internal_error_body(e)
+
+
+def optimize_meeting(body, metrics=NULL_METRICS):
+    """Validate one parsed meeting request and find its optimal slots.
+
+    Returns (status_code, response_body). With "errorMode": "all" the 400 body
+    lists up to maxErrors errors instead of only the first one.
+    """
+    errors, error = create_error_collector(body)
+    if error is not None:
+        return 400, {"error": error}
+
+    # Validate meetingName exists, is string and is not just whitespace
+    meeting_name = body.get("meetingName")
+    if not is_valid_meeting_name(meeting_name) and errors.add(INVALID_MEETING_NAME_ERROR):
+        return 400, errors.response_body()
+
+    # Validate participants exists and is a list, nothing else can be checked without it
+    participants = body.get("participants")
+    if not participants or not isinstance(participants, list):
+        errors.add(INVALID_PARTICIPANTS_ERROR)
+        return 400, errors.response_body()
+
+    # Validate the optional topK
+    top_k = body.get("topK")
+    if top_k is not None and not is_valid_top_k(top_k) and errors.add(INVALID_TOP_K_ERROR):
+        return 400, errors.response_body()
+
+    # Validate the optional responseFormat
+    response_format = body.get("responseFormat", DEFAULT_RESPONSE_FORMAT)
+    if response_format not in RESPONSE_FORMATS and errors.add(INVALID_RESPONSE_FORMAT_ERROR):
+        return 400, errors.response_body()
+
+    # Validate the optional timeZone, used for participants without one and for the response
+    time_zone = body.get("timeZone")
+    if time_zone is not None and not is_valid_zone(time_zone):
+        time_zone = None
+        if errors.add(INVALID_TIME_ZONE_ERROR):
+            return 400, errors.response_body()
+
+    # Validate the optional horizon, the days recurringSlots are expanded over
+    horizon = body.get("horizon")
+    if horizon is not None:
+        try:
+            horizon = parse_horizon(horizon)
+        except ValueError:
+            horizon = None
+            if errors.add(INVALID_HORIZON_ERROR):
+                return 400, errors.response_body()
+
+    # Validate the optional quorum, the required participants and how many others must attend
+    quorum = body.get("quorum")
+    if quorum is not None:
+        try:
+            quorum = parse_quorum(quorum)
+        except ValueError:
+            quorum = None
+            if errors.add(INVALID_QUORUM_ERROR):
+                return 400, errors.response_body()
+
+    weighted = is_weighted_request(participants)
+    range_request = is_range_request(body, participants)
+    if quorum is not None and (range_request or weighted) and errors.add(QUORUM_NOT_SUPPORTED_ERROR):
+        return 400, errors.response_body()
+
+    # Validate the optional approximate flag, bounded-memory counting of the plain slot request
+    approximate = body.get("approximate", False)
+    if not isinstance(approximate, bool):
+        approximate = False
+        if errors.add(INVALID_APPROXIMATE_ERROR):
+            return 400, errors.response_body()
+    if approximate and (range_request or weighted or quorum is not None):
+        approximate = False
+        if errors.add(APPROXIMATE_NOT_SUPPORTED_ERROR):
+            return 400, errors.response_body()
+
+    if range_request:
+        if top_k is not None and errors.add(TOP_K_WITH_RANGES_ERROR):
+            return 400, errors.response_body()
+        if weighted and errors.add(WEIGHTS_WITH_RANGES_ERROR):
+            return 400, errors.response_body()
+        return optimize_range_meeting(
+            meeting_name, body, participants, response_format, errors, time_zone, horizon, metrics
+        )
+
+    if weighted:
+        return optimize_weighted_meeting(
+            meeting_name, participants, top_k, response_format, errors, time_zone, horizon, metrics
+        )
+
+    if approximate:
+        return optimize_approximate_meeting(
+            meeting_name, participants, top_k, response_format, errors, time_zone, horizon, metrics
+        )
+
+    # Validate participants and count their slots in the same pass. Slots are
+    # converted to integer minute offsets and deduplicated per participant,
+    # e.g. [("Alice", [28633500, 28633560]), ("Bob", [28633560])]. Recurring
+    # slots stay lazy and are expanded by the aggregator as they are counted.
+    validator = ParticipantValidator(time_zone, horizon)
+    aggregator = SlotAggregator()
+    label_by_index = uses_indices(response_format)
+    with metrics.timer("ValidationMs"):
+        for index, participant in enumerate(participants):
+            try:
+                name, encoded_slots = validator.validate(participant)
+            except ValidationError as e:
+                if errors.add(str(e), index):
+                    break
+                continue
+            # After an error the remaining participants are only validated
+            if not errors:
+                aggregator.add(index if label_by_index else name, encoded_slots)
+
+    # Every required name must belong to at least one participant, all of whom must attend
+    if quorum is not None:
+        required_names, min_others = quorum
+        names = [participant.get("name") if isinstance(participant, dict) else None for participant in participants]
+        required_rows = [row for row, name in enumerate(names) if name in required_names]
+        for name in required_names:
+            if name not in names and errors.add(UNKNOWN_QUORUM_PARTICIPANT_ERROR.format(name)):
+                break
+    if errors:
+        return 400, errors.response_body()
+
+    if metrics.enabled:
+        metrics.set("Participants", len(aggregator.participants))
+        metrics.set("Slots", aggregator.entries)
+        metrics.set("DistinctSlots", len(aggregator.counts))
+
+    try:
+        # Find all slots with the maximum participants from the counts gathered above
+        with metrics.timer("AggregationMs"):
+            max_participants, optimal_slots = aggregator.result()
+        format_slot = slot_formatter(validator, time_zone)
+        response_body = build_response_body(meeting_name, max_participants, optimal_slots, response_format, format_slot)
+        if top_k is not None:
+            top_slots = select_top_slots(aggregator.counts, top_k)
+            names_by_slot = collect_names(aggregator.participants, top_slots)
+            ranked_slots = [(slot, names_by_slot[slot]) for slot in top_slots]
+            add_ranked_slots(response_body, ranked_slots, response_format, format_slot)
+        if quorum is not None:
+            with metrics.timer("QuorumMs"):
+                quorum_slots = find_quorum_slots(aggregator.participants, required_rows, min_others)
+                names_by_slot = collect_names(aggregator.participants, [slot for slot, _ in quorum_slots]) if quorum_slots else {}
+            add_quorum_slots(response_body, quorum_slots, names_by_slot, response_format, format_slot)
+        return 200, response_body
+    except Exception as e:
+        return 500, internal_error_body(e)
+
+
+def optimize_streamed_meeting(raw_body, metrics=NULL_METRICS):
+    """Same as json.loads followed by optimize_meeting, for large raw JSON bodies.
+
+    Participants are parsed one at a time, so memory depends on the number of
+    distinct slots instead of the size of the body.
+    """
+    counter = SlotCounter(timed=metrics.enabled)
+    started = time.perf_counter()
+    try:
+        body = stream_body(raw_body, counter)
+    except json.JSONDecodeError:
+        return 400, {"error": INVALID_JSON_ERROR}
+    finally:
+        # Participants are validated while the body is parsed, the two are reported apart
+        if metrics.enabled:
+            metrics.add("ParseMs", (time.perf_counter() - started - counter.validation_seconds) * 1000)
+            metrics.add("ValidationMs", counter.validation_seconds * 1000)
+
+    # Range, weighted, recurring and quorum requests need every participant at once,
+    # a meeting timeZone or horizon applies to participants streamed before it, and
+    # an approximate flag after the participants came too late for the sketch
+    if (
+        counter.needs_full_body
+        or any(field in body for field in ("granularityMinutes", "durationMinutes", "timeZone", "horizon", "quorum"))
+        or (body.get("approximate") is True and counter.sketch is None)
+    ):
+        with metrics.timer("ParseMs"):
+            body = loads(raw_body)
+        return optimize_meeting(body, metrics)
+
+    errors, error = create_error_collector(body)
+    if error is not None:
+        return 400, {"error": error}
+
+    meeting_name = body.get("meetingName")
+    if not is_valid_meeting_name(meeting_name) and errors.add(INVALID_MEETING_NAME_ERROR):
+        return 400, errors.response_body()
+
+    if body.get("participants") is not STREAMED or counter.participant_count == 0:
+        errors.add(INVALID_PARTICIPANTS_ERROR)
+        return 400, errors.response_body()
+
+    top_k = body.get("topK")
+    if top_k is not None and not is_valid_top_k(top_k) and errors.add(INVALID_TOP_K_ERROR):
+        return 400, errors.response_body()
+
+    response_format = body.get("responseFormat", DEFAULT_RESPONSE_FORMAT)
+    if response_format not in RESPONSE_FORMATS and errors.add(INVALID_RESPONSE_FORMAT_ERROR):
+        return 400, errors.response_body()
+
+    if not isinstance(body.get("approximate", False), bool) and errors.add(INVALID_APPROXIMATE_ERROR):
+        return 400, errors.response_body()
+
+    # Participant errors were gathered while streaming, before errorMode was known
+    for message, index in counter.errors:
+        if errors.add(message, index):
+            break
+    if errors:
+        return 400, errors.response_body()
+
+    if metrics.enabled:
+        metrics.set("Participants", counter.participant_count)
+        metrics.set("Slots", counter.entries)
+        if counter.sketch is None:
+            metrics.set("DistinctSlots", len(counter.counts))
+
+    try:
+        # The second pass over the body collects names for the winning slots only
+        if counter.sketch is not None:
+            with metrics.timer("AggregationMs"):
+                names_by_slot = collect_candidate_names(raw_body, counter, uses_indices(response_format))
+            return 200, build_approximate_response_body(
+                meeting_name, counter.sketch, names_by_slot, top_k, response_format, slot_formatter(counter.validator, None)
+            )
+        with metrics.timer("AggregationMs"):
+            max_participants, optimal_slots, ranked_slots = collect_optimal_slots(
+                raw_body, counter, top_k, uses_indices(response_format)
+            )
+        format_slot = slot_formatter(counter.validator, None)
+        response_body = build_response_body(meeting_name, max_participants, optimal_slots, response_format, format_slot)
+        if top_k is not None:
+            add_ranked_slots(response_body, ranked_slots, response_format, format_slot)
+        return 200, response_body
+    except Exception as e:
+        return 500, internal_error_body(e)
+
+
+def optimize_columnar_meeting(data, metrics=NULL_METRICS):
+    """Find the optimal slots of a columnar body, see columnar.py for the layout.
+
+    The header takes meetingName, names, topK, responseFormat, timeZone, errorMode
+    and maxErrors. Slots are UTC and counted straight from the body's buffer.
+    """
+    try:
+        with metrics.timer("ParseMs"):
+            header, row_ends, slots = decode_columns(data)
+    except ValueError:
+        return 400, {"error": INVALID_COLUMNS_ERROR}
+
+    errors, error = create_error_collector(header)
+    if error is not None:
+        return 400, {"error": error}
+
+    meeting_name = header.get("meetingName")
+    if not is_valid_meeting_name(meeting_name) and errors.add(INVALID_MEETING_NAME_ERROR):
+        return 400, errors.response_body()
+
+    names = header["names"]
+    if not names:
+        errors.add(INVALID_PARTICIPANTS_ERROR)
+        return 400, errors.response_body()
+
+    top_k = header.get("topK")
+    if top_k is not None and not is_valid_top_k(top_k) and errors.add(INVALID_TOP_K_ERROR):
+        return 400, errors.response_body()
+
+    response_format = header.get("responseFormat", DEFAULT_RESPONSE_FORMAT)
+    if response_format not in RESPONSE_FORMATS and errors.add(INVALID_RESPONSE_FORMAT_ERROR):
+        return 400, errors.response_body()
+
+    time_zone = header.get("timeZone")
+    if time_zone is not None and not is_valid_zone(time_zone) and errors.add(INVALID_TIME_ZONE_ERROR):
+        return 400, errors.response_body()
+
+    with metrics.timer("ValidationMs"):
+        for index, name in enumerate(names):
+            # Names follow the same rule as meetingName
+            if not is_valid_meeting_name(name) and errors.add(INVALID_NAME_ERROR, index):
+                break
+        else:
+            for index in invalid_rows(row_ends, slots):
+                if errors.add(INVALID_ROW_ERROR.format(names[index]), index):
+                    break
+    if errors:
+        return 400, errors.response_body()
+
+    if metrics.enabled:
+        metrics.set("Participants", len(names))
+        metrics.set("Slots", len(slots))
+
+    try:
+        # Every participant's slots are a view into the body, nothing is copied per slot
+        labels = range(len(names)) if uses_indices(response_format) else names
+        encoded_participants = [
+            (label, slots[start:end]) for label, (start, end) in zip(labels, row_bounds(row_ends))
+        ]
+        with metrics.timer("AggregationMs"):
+            max_participants, optimal_slots = find_optimal_slots_columns(encoded_participants, row_ends, slots, metrics)
+        format_slot = zoned_slot_formatter(time_zone) if time_zone is not None else decode_slot
+        response_body = build_response_body(meeting_name, max_participants, optimal_slots, response_format, format_slot)
+        if top_k is not None:
+            top_slots = select_top_slots(count_slots([(None, slots)]), top_k)
+            names_by_slot = collect_names(encoded_participants, top_slots)
+            add_ranked_slots(response_body, [(slot, names_by_slot[slot]) for slot in top_slots], response_format, format_slot)
+        return 200, response_body
+    except Exception as e:
+        return 500, internal_error_body(e)
@@ -0,0 +1,136 @@
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+# Per-request phase timings and sizes, emitted as CloudWatch Embedded Metric
+# Format (EMF) log lines. When metrics are disabled or a request is not sampled
+# the handler gets NULL_METRICS, whose methods do nothing.
+
+DEFAULT_NAMESPACE = "FindOptimalTimeSlot"
+
+# Metric name -> CloudWatch unit
+UNITS = {
+    "ParseMs": "Milliseconds",
+    "ValidationMs": "Milliseconds",
+    "AggregationMs": "Milliseconds",
+    "OptimizeMs": "Milliseconds",
+    "QuorumMs": "Milliseconds",
+    "SerializationMs": "Milliseconds",
+    "CompressionMs": "Milliseconds",
+    "TotalMs": "Milliseconds",
+    "Participants": "Count",
+    "Slots": "Count",
+    "DistinctSlots": "Count",
+    "ResponseBytes": "Bytes",
+    "CompressedBytes": "Bytes",
+    "CacheHit": "Count",
+    "StatusCode": "None",
+}
+
+
+class _NullMetrics:
+    enabled = False
+
+    @contextmanager
+    def timer(self, name):
+        yield
+
+    def set(self, name, value):
+        pass
+
+    def add(self, name, value):
+        pass
+
+    def emit(self):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+
+
+class RequestMetrics:
+    enabled = True
+
+    def __init__(self, route, sink, namespace):
+        self.route = route
+        self.sink = sink
+        self.namespace = namespace
+        self.values = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def timer(self, name):
+        # Adds to the metric, so a phase that runs more than once is summed
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    def add(self, name, value):
+        self.values[name] = self.values.get(name, 0) + value
+
+    def emit(self):
+        self.values["TotalMs"] = (time.perf_counter() - self.started) * 1000
+        self.sink.write(self.to_emf())
+
+    def to_emf(self):
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": self.namespace,
+                    "Dimensions": [["Route"]],
+                    "Metrics": [{"Name": name, "Unit": UNITS.get(name, "None")} for name in self.values]
+                }]
+            },
+            "Route": self.route,
+            **self.values
+        }
+
+
+class StdoutSink:
+    # Lambda sends stdout to CloudWatch Logs, which extracts EMF lines as metrics
+
+    def write(self, record):
+        sys.stdout.write(json.dumps(record) + "\n")
+
+
+class InMemorySink:
+    # Keeps records for tests
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+class Metrics:
+    """Creates the recorder for each request, honouring the enabled flag and sampling."""
+
+    def __init__(self, enabled=False, sample_rate=1.0, sink=None, namespace=DEFAULT_NAMESPACE, random_source=random.random):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.sink = sink or StdoutSink()
+        self.namespace = namespace
+        self.random_source = random_source
+
+    @classmethod
+    def from_environment(cls, environ=os.environ):
+        return cls(
+            enabled=environ.get("METRICS_ENABLED", "false").lower() == "true",
+            sample_rate=float(environ.get("METRICS_SAMPLE_RATE", "1.0")),
+            namespace=environ.get("METRICS_NAMESPACE", DEFAULT_NAMESPACE)
+        )
+
+    def start(self, route):
+        if not self.enabled or (self.sample_rate < 1.0 and self.random_source() >= self.sample_rate):
+            return NULL_METRICS
+        return RequestMetrics(route, self.sink, self.namespace)
@@ -0,0 +1,144 @@
+import base64
+import binascii
+import json
+
+from .json_codec import dumps, loads
+
+# Paged and streamed optimalSlots. Wide availability can tie thousands of slots
+# at the maximum, too many for one response. With ?limit=N a response holds N
+# optimal slots and a nextCursor, an opaque token for the following page. Pages
+# are cut from the full result, which is computed once and cached apart from the
+# responses as a CompactBody, so later pages do not repeat the optimization.
+# Streaming chunks the encoding of a finished result, the slot objects of each
+# chunk are only built when it is written. The token carries the offset, the
+# limit and a prefix of the request's cache key, so it only fits the request it
+# came from. Slots keep the order of the full response, earliest first.
+
+INVALID_LIMIT_ERROR = "Invalid query parameter: limit (must be an integer between 1 and 1000)"
+INVALID_CURSOR_ERROR = "Invalid query parameter: cursor (must be the nextCursor of a previous page of the same request)"
+
+MAX_PAGE_LIMIT = 1000
+# Characters of the cache key kept in a cursor, enough to tell requests apart
+CURSOR_KEY_LENGTH = 16
+
+# Optimal slots encoded per chunk of a streamed response
+STREAM_CHUNK_SLOTS = 500
+
+
+def encode_cursor(offset, limit, key):
+    token = dumps([offset, limit, key[:CURSOR_KEY_LENGTH]]).encode("utf-8")
+    return base64.urlsafe_b64encode(token).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    # Returns (offset, limit, key prefix), raises ValueError for tokens not made by encode_cursor
+    try:
+        offset, limit, key = loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError):
+        raise ValueError(INVALID_CURSOR_ERROR) from None
+    if (
+        not isinstance(offset, int) or offset < 0 or not isinstance(limit, int) or not 1 <= limit <= MAX_PAGE_LIMIT
+        or not isinstance(key, str) or len(key) != CURSOR_KEY_LENGTH
+    ):
+        raise ValueError(INVALID_CURSOR_ERROR)
+    return offset, limit, key
+
+
+def parse_page(parameters):
+    """Return (limit, offset, key prefix or None) for the query parameters, None when they ask for no page.
+
+    Raises ValueError with the client-facing error message.
+    """
+    parameters = parameters or {}
+    limit = parameters.get("limit")
+    cursor = parameters.get("cursor")
+    if limit is None and cursor is None:
+        return None
+
+    offset, key = 0, None
+    if cursor is not None:
+        offset, cursor_limit, key = decode_cursor(cursor)
+        if limit is None:
+            return cursor_limit, offset, key
+    if not (isinstance(limit, str) and limit.isascii() and limit.isdigit()) or not 1 <= int(limit) <= MAX_PAGE_LIMIT:
+        raise ValueError(INVALID_LIMIT_ERROR)
+    return int(limit), offset, key
+
+
+class CompactBody:
+    """A full response body kept for pages and streaming, with optimalSlots stored column by column.
+
+    Every optimal slot object has the same fields, so each field is kept as one
+    list and the objects are only rebuilt for the slots a page or chunk needs.
+    Tied slots mostly share their participants, equal lists are kept once.
+    size estimates the JSON length from the columns instead of encoding them.
+    """
+
+    def __init__(self, body):
+        optimal_slots = body.get("optimalSlots") or []
+        self.members = {name: value for name, value in body.items() if name != "optimalSlots"}
+        # Member names in body order, optimalSlots included
+        self.names = list(body)
+        self.total = len(optimal_slots)
+        self.fields = list(optimal_slots[0]) if optimal_slots else []
+        self.columns = []
+        shared = {}
+        # The other members are small (topK ranked slots at most), only they are encoded
+        self.size = len(dumps(self.members))
+        for field in self.fields:
+            column = []
+            for entry in optimal_slots:
+                value = entry[field]
+                if isinstance(value, list):
+                    shared_value = shared.setdefault((field, tuple(value)), value)
+                    if shared_value is value:
+                        self.size += sum(len(str(item)) + 3 for item in value)
+                    value = shared_value
+                    self.size += 8
+                else:
+                    self.size += len(value) + 3 if isinstance(value, str) else 8
+                column.append(value)
+            self.columns.append(column)
+
+    def slots(self, start, end):
+        # The optimal slot objects from position start up to end
+        return [dict(zip(self.fields, values)) for values in zip(*(column[start:end] for column in self.columns))]
+
+    def body(self, start=0, end=None):
+        # The response body with the optimal slots from start up to end
+        end = self.total if end is None else end
+        return {
+            name: self.slots(start, end) if name == "optimalSlots" else self.members[name]
+            for name in self.names
+        }
+
+
+def page_body(body, limit, offset, key):
+    # The full response body, a CompactBody, with only one page of optimalSlots
+    page = dict(body.body(offset, offset + limit), totalSlots=body.total)
+    if offset + limit < body.total:
+        page["nextCursor"] = encode_cursor(offset + limit, limit, key)
+    return page
+
+
+def iter_json_chunks(body, chunk_slots=STREAM_CHUNK_SLOTS):
+    """Yield the JSON text of a response body, a dict or a CompactBody, in pieces.
+
+    optimalSlots is encoded chunk_slots entries at a time, and the slot objects
+    of a CompactBody are only built for the chunk being encoded, so neither
+    the whole text nor every slot object exists at once. The pieces join to
+    dumps() of the body.
+    """
+    if not isinstance(body, CompactBody):
+        body = CompactBody(body)
+    pending = "{"
+    for position, name in enumerate(body.names):
+        pending += ("," if position else "") + dumps(name) + ":"
+        if name != "optimalSlots" or not body.total:
+            pending += dumps(body.members.get(name, []))
+            continue
+        for start in range(0, body.total, chunk_slots):
+            yield pending + ("[" if start == 0 else ",") + dumps(body.slots(start, start + chunk_slots))[1:-1]
+            pending = ""
+        pending = "]"
+    yield pending + "}"
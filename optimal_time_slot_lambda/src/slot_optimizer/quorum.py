@@ -0,0 +1,54 @@
+from collections import Counter
+
+# Quorum queries: slots that every required participant can attend, plus at
+# least minOthers of the other participants. The slot sets of the required
+# participants are intersected first, smallest first, and the others are only
+# counted on the slots that survive, so a small required group prunes most
+# slots before any counting happens.
+
+# Upper bound for the number of names in quorum.required
+MAX_QUORUM_REQUIRED = 100
+
+
+def parse_quorum(quorum):
+    """Return (required names, minimum number of others) for {"required": [...], "minOthers": N}.
+
+    Raises ValueError for invalid quorums.
+    """
+    if not isinstance(quorum, dict):
+        raise ValueError("Invalid quorum")
+    required = quorum.get("required")
+    min_others = quorum.get("minOthers", 0)
+    if (
+        not isinstance(required, list) or not 1 <= len(required) <= MAX_QUORUM_REQUIRED
+        or any(not isinstance(name, str) or not name.strip() for name in required)
+        or not isinstance(min_others, int) or isinstance(min_others, bool) or min_others < 0
+    ):
+        raise ValueError("Invalid quorum")
+    return tuple(dict.fromkeys(required)), min_others
+
+
+def find_quorum_slots(encoded_participants, required_rows, min_others=0):
+    """Return [(slot offset, number of others)] for the slots that meet the quorum.
+
+    required_rows are positions in encoded_participants. Slots with the most
+    other participants come first, earlier slots first on ties.
+    """
+    required_rows = set(required_rows)
+    # Inverted index participant -> slot set, only for the required participants
+    slot_sets = sorted((set(encoded_participants[row][1]) for row in required_rows), key=len)
+    candidates = slot_sets[0] if slot_sets else set()
+    for slot_set in slot_sets[1:]:
+        if not candidates:
+            break
+        candidates &= slot_set
+
+    others = Counter(dict.fromkeys(candidates, 0))
+    if candidates:
+        for row, (_, encoded_slots) in enumerate(encoded_participants):
+            if row not in required_rows:
+                others.update(candidates.intersection(encoded_slots))
+
+    quorum_slots = [(slot, count) for slot, count in others.items() if count >= min_others]
+    quorum_slots.sort(key=lambda item: (-item[1], item[0]))
+    return quorum_slots
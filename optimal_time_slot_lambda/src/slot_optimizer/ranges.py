@@ -0,0 +1,121 @@
+# Interval-based availability. Instead of enumerating every slot, participants
+# send start/end ranges and a sweep over the sorted range endpoints finds the
+# windows with the most overlap in O(n log n) of the number of ranges.
+#
+# Meetings longer than one grid cell (durationMinutes) reuse the same sweep: a
+# participant can start at s when one of their merged runs of consecutive cells
+# covers [s, s + duration), so each run shrinks by the duration to the range of
+# start times it allows and the sweep finds the starts with the most overlap.
+
+DEFAULT_GRANULARITY_MINUTES = 30
+MAX_GRANULARITY_MINUTES = 24 * 60
+MAX_DURATION_MINUTES = 24 * 60
+
+
+def is_valid_granularity(granularity):
+    return (
+        isinstance(granularity, int)
+        and not isinstance(granularity, bool)
+        and 1 <= granularity <= MAX_GRANULARITY_MINUTES
+    )
+
+
+def is_valid_duration(duration, granularity):
+    # A whole number of grid cells, at most a day
+    return (
+        isinstance(duration, int)
+        and not isinstance(duration, bool)
+        and granularity <= duration <= MAX_DURATION_MINUTES
+        and duration % granularity == 0
+    )
+
+
+def _snap_ranges(encoded_slots, encoded_ranges, granularity):
+    # Ranges shrink to the granularity grid, a slot covers the grid cell it falls in
+    snapped = []
+    for start, end in encoded_ranges:
+        start = -(-start // granularity) * granularity
+        end = end // granularity * granularity
+        if start < end:
+            snapped.append((start, end))
+    for slot in encoded_slots:
+        start = slot // granularity * granularity
+        snapped.append((start, start + granularity))
+
+    # Merge overlapping and touching ranges so a participant is counted once per instant
+    snapped.sort()
+    merged = []
+    for start, end in snapped:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_optimal_windows(range_participants, granularity=DEFAULT_GRANULARITY_MINUTES):
+    """Find the windows attended by the most participants.
+
+    Takes [(name, [slot offsets], [(start offset, end offset)])] and returns
+    (max_participants, [(start offset, end offset, [participant names])]) with
+    windows in chronological order and aligned to the granularity.
+    """
+    # +1 when a participant's range starts, -1 when it ends
+    events = []
+    for index, (_, encoded_slots, encoded_ranges) in enumerate(range_participants):
+        for start, end in _snap_ranges(encoded_slots, encoded_ranges, granularity):
+            events.append((start, 1, index))
+            events.append((end, -1, index))
+    if not events:
+        return 0, []
+    events.sort()
+
+    # First sweep: the maximum overlap, counting all events at the same time together
+    max_participants = 0
+    count = 0
+    for position, (time, delta, _) in enumerate(events):
+        count += delta
+        if (position + 1 == len(events) or events[position + 1][0] != time) and count > max_participants:
+            max_participants = count
+
+    # Second sweep: track who is present and emit every window at the maximum
+    windows = []
+    present = set()
+    for position, (time, delta, index) in enumerate(events):
+        if delta > 0:
+            present.add(index)
+        else:
+            present.discard(index)
+        if position + 1 < len(events):
+            next_time = events[position + 1][0]
+            if next_time != time and len(present) == max_participants:
+                names = [range_participants[i][0] for i in sorted(present)]
+                windows.append((time, next_time, names))
+    return max_participants, windows
+
+
+def find_optimal_starts(range_participants, granularity, duration):
+    """Find the meeting start times at which the most participants are free for the whole duration.
+
+    Takes the same participants as find_optimal_windows and returns
+    (max_participants, [(start offset, end offset, [participant names])]) with
+    one entry per optimal start, in chronological order.
+    """
+    # Runs of consecutive cells shorter than the duration allow no start at all,
+    # longer ones allow every start up to duration before their end
+    start_participants = [
+        (name, (), [
+            (start, end - duration + granularity)
+            for start, end in _snap_ranges(encoded_slots, encoded_ranges, granularity)
+            if end - start >= duration
+        ])
+        for name, encoded_slots, encoded_ranges in range_participants
+    ]
+    max_participants, windows = find_optimal_windows(start_participants, granularity)
+    starts = [
+        (start, start + duration, names)
+        for window_start, window_end, names in windows
+        for start in range(window_start, window_end, granularity)
+    ]
+    return max_participants, starts
@@ -0,0 +1,48 @@
+import heapq
+from collections import Counter
+from itertools import chain
+
+# Upper bound for the topK request option
+MAX_TOP_K = 1000
+
+
+def is_valid_top_k(top_k):
+    return isinstance(top_k, int) and not isinstance(top_k, bool) and 1 <= top_k <= MAX_TOP_K
+
+
+def count_slots(encoded_participants):
+    # {slot offset: attendee count}, counted in C
+    return Counter(chain.from_iterable(encoded_slots for _, encoded_slots in encoded_participants))
+
+
+def _rank_key(item):
+    # Most attendees first, earlier slots first on ties
+    slot, count = item
+    return -count, slot
+
+
+def select_top_slots(counts, top_k):
+    """Return the top_k slot offsets of {slot offset: count}, best first.
+
+    heapq.nsmallest keeps a heap of top_k items, so this is O(n log k)
+    instead of sorting every slot.
+    """
+    return [slot for slot, _ in heapq.nsmallest(top_k, counts.items(), key=_rank_key)]
+
+
+def collect_names(encoded_participants, slots):
+    # {slot offset: [participant names]} for the given slots only, in participant order
+    names_by_slot = {slot: [] for slot in slots}
+    for name, encoded_slots in encoded_participants:
+        for slot in encoded_slots:
+            names = names_by_slot.get(slot)
+            if names is not None:
+                names.append(name)
+    return names_by_slot
+
+
+def find_top_slots(encoded_participants, top_k):
+    """Return [(slot offset, [participant names])] for the top_k slots, best first."""
+    top_slots = select_top_slots(count_slots(encoded_participants), top_k)
+    names_by_slot = collect_names(encoded_participants, top_slots)
+    return [(slot, names_by_slot[slot]) for slot in top_slots]
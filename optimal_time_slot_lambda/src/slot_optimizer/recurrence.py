@@ -0,0 +1,143 @@
+from .slots import MAX_SLOT, MIN_SLOT, MINUTES_PER_DAY, encode_day, encode_slot
+from .timezones import local_day_utc_offset, local_utc_offset
+
+# Recurring availability. Weekly patterns such as "weekdays 09:00 to 12:00" are
+# compiled into the minutes of each weekday once, and expanded over the meeting's
+# horizon only while the slots are being counted, so a quarter of availability
+# costs about the same to send and hold as a week.
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+DEFAULT_STEP_MINUTES = 30
+MAX_HORIZON_DAYS = 366
+
+# 1970-01-01 was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def parse_horizon(horizon):
+    """Return (first day, last day) in days since the epoch for {"start", "end"} dates.
+
+    Both days are included. Raises ValueError for invalid horizons.
+    """
+    if not isinstance(horizon, dict):
+        raise ValueError("Invalid horizon")
+    first_day = encode_day(horizon.get("start"))
+    last_day = encode_day(horizon.get("end"))
+    if not 0 <= last_day - first_day < MAX_HORIZON_DAYS:
+        raise ValueError("Invalid horizon")
+    # Recurring slots are converted from local time, so the horizon stays within MIN_SLOT to MAX_SLOT
+    if first_day * MINUTES_PER_DAY < MIN_SLOT or (last_day + 1) * MINUTES_PER_DAY - 1 > MAX_SLOT:
+        raise ValueError("Invalid horizon")
+    return first_day, last_day
+
+
+def _parse_time(value, allow_end_of_day=False):
+    # "HH:MM" -> minute of the day, "24:00" is allowed as an end
+    if type(value) is not str or len(value) != 5 or value[2] != ":" or not value.isascii():
+        raise ValueError(f"Invalid time: {value!r}")
+    hours, minutes = value[:2], value[3:]
+    if not (hours.isdigit() and minutes.isdigit()) or int(minutes) > 59:
+        raise ValueError(f"Invalid time: {value!r}")
+    minute = int(hours) * 60 + int(minutes)
+    if minute > MINUTES_PER_DAY or (minute == MINUTES_PER_DAY and not allow_end_of_day):
+        raise ValueError(f"Invalid time: {value!r}")
+    return minute
+
+
+def compile_weekly_patterns(patterns):
+    """Return the slot start minutes of each weekday, Monday first, for weekly patterns.
+
+    Each pattern is {"days": ["MO", ...], "start": "HH:MM", "end": "HH:MM",
+    "stepMinutes": 30}, with slots every stepMinutes from start until before end.
+    Overlapping patterns are merged. Raises ValueError for invalid patterns.
+    """
+    if not isinstance(patterns, list) or not patterns:
+        raise ValueError("Invalid recurring slots")
+    minutes_by_weekday = [set() for _ in WEEKDAYS]
+    for pattern in patterns:
+        if not isinstance(pattern, dict):
+            raise ValueError(f"Invalid recurring slot: {pattern!r}")
+        days = pattern.get("days")
+        step = pattern.get("stepMinutes", DEFAULT_STEP_MINUTES)
+        if (
+            not isinstance(days, list) or not days or any(day not in WEEKDAYS for day in days)
+            or not isinstance(step, int) or isinstance(step, bool) or not 1 <= step <= MINUTES_PER_DAY
+        ):
+            raise ValueError(f"Invalid recurring slot: {pattern!r}")
+        start = _parse_time(pattern.get("start"))
+        end = _parse_time(pattern.get("end"), allow_end_of_day=True)
+        if end <= start:
+            raise ValueError(f"Invalid recurring slot: {pattern!r}")
+        for day in days:
+            minutes_by_weekday[WEEKDAYS.index(day)].update(range(start, end, step))
+    return tuple(tuple(sorted(minutes)) for minutes in minutes_by_weekday)
+
+
+def compile_exceptions(exceptions):
+    """Return (excluded days, excluded local slots) for "YYYY-MM-DD" and "YYYY-MM-DDTHH:MM" strings.
+
+    Raises ValueError for invalid exceptions.
+    """
+    if exceptions is None:
+        return frozenset(), frozenset()
+    if not isinstance(exceptions, list):
+        raise ValueError("Invalid exceptions")
+    excluded_days = set()
+    excluded_slots = set()
+    for exception in exceptions:
+        if type(exception) is str and len(exception) == 10:
+            excluded_days.add(encode_day(exception))
+        else:
+            excluded_slots.add(encode_slot(exception))
+    return frozenset(excluded_days), frozenset(excluded_slots)
+
+
+class RecurringSlots:
+    """A participant's distinct slot offsets: explicit slots, then the weekly pattern.
+
+    The pattern is expanded over the horizon every time the object is iterated,
+    so the expanded slots are never stored. Local pattern times are converted
+    from zone_name to UTC, or taken as UTC when it is None.
+    """
+
+    def __init__(self, explicit_slots, minutes_by_weekday, excluded_days, excluded_slots, horizon, zone_name=None):
+        self.explicit_slots = explicit_slots
+        self.minutes_by_weekday = minutes_by_weekday
+        self.excluded_days = excluded_days
+        self.excluded_slots = excluded_slots
+        self.first_day, self.last_day = horizon
+        self.zone_name = zone_name
+        self._length = None
+
+    def __iter__(self):
+        yield from self.explicit_slots
+        explicit = set(self.explicit_slots)
+        excluded_slots = self.excluded_slots
+        zone_name = self.zone_name
+        count = len(self.explicit_slots)
+
+        for day in range(self.first_day, self.last_day + 1):
+            minutes = self.minutes_by_weekday[(day + _EPOCH_WEEKDAY) % 7]
+            if not minutes or day in self.excluded_days:
+                continue
+            day_start = day * MINUTES_PER_DAY
+            utc_offset = local_day_utc_offset(zone_name, day) if zone_name is not None else 0
+            # Around a transition two local times can be the same instant
+            seen = set() if utc_offset is None else None
+            for minute in minutes:
+                local = day_start + minute
+                if local in excluded_slots:
+                    continue
+                slot = local - (utc_offset if utc_offset is not None else local_utc_offset(zone_name, local))
+                if slot in explicit or (seen is not None and (slot in seen or seen.add(slot))):
+                    continue
+                count += 1
+                yield slot
+        self._length = count
+
+    def __len__(self):
+        # Known after the first full iteration, counting does not store the slots either
+        if self._length is None:
+            for _ in self:
+                pass
+        return self._length
@@ -0,0 +1,332 @@
+import time
+from collections import defaultdict
+
+from .batch import INVALID_MEETING_ERROR, INVALID_MEETINGS_ERROR
+from .meeting import (
+    INVALID_HORIZON_ERROR, INVALID_MEETING_NAME_ERROR, INVALID_PARTICIPANTS_ERROR, INVALID_TIME_ZONE_ERROR,
+    create_error_collector, internal_error_body, is_valid_meeting_name, slot_formatter
+)
+from .recurrence import parse_horizon
+from .timezones import is_valid_zone
+from .validation import ParticipantValidator, ValidationError
+
+# Conflict-free scheduling of many meetings at once. Meetings that share a
+# participant (by name) never get the same slot, and the total attendance, the
+# number of participants available at their meeting's slot summed over all
+# meetings, is maximized:
+# - greedy: the most constrained meetings first, each at its best free slot
+# - local search: a meeting moves to a better slot when the meetings in its way
+#   can move elsewhere for less than it gains, tried until nothing improves or
+#   the time budget runs out. A move is abandoned as soon as the lost
+#   attendance reaches the gain.
+# - branch and bound: the rest of the budget goes to an exhaustive search for a
+#   schedule better than the local optimum. A partial schedule is dropped once
+#   its attendance plus the best slots of the meetings left cannot beat the best
+#   schedule so far. When the search finishes in time the schedule is optimal.
+# Each meeting's best slot on its own gives an upper bound, a schedule reaching
+# it is optimal and ends the search early.
+
+INVALID_CONFLICT_FREE_ERROR = "Invalid field: conflictFree (must be a boolean)"
+INVALID_TIME_BUDGET_ERROR = "Invalid field: timeBudgetMs (must be an integer between 1 and 8000)"
+SCHEDULE_MEETING_ERROR = "Meeting {}: {}"
+NO_FREE_SLOT_MESSAGE = "No slot without a conflict found for this meeting"
+
+# The Lambda timeout is 10 seconds, the budget leaves room for parsing and the response
+DEFAULT_TIME_BUDGET_MS = 3000
+MAX_TIME_BUDGET_MS = 8000
+# Branch and bound steps between clock reads
+DEADLINE_CHECK_STEPS = 256
+
+
+def is_valid_time_budget(time_budget_ms):
+    return (
+        isinstance(time_budget_ms, int)
+        and not isinstance(time_budget_ms, bool)
+        and 1 <= time_budget_ms <= MAX_TIME_BUDGET_MS
+    )
+
+
+def find_conflicts(meeting_names):
+    # [set of meeting indices sharing a participant] for [set of participant names]
+    meetings_by_name = defaultdict(list)
+    for index, names in enumerate(meeting_names):
+        for name in names:
+            meetings_by_name[name].append(index)
+    conflicts = [set() for _ in meeting_names]
+    for indices in meetings_by_name.values():
+        for index in indices:
+            conflicts[index].update(indices)
+    for index, indices in enumerate(conflicts):
+        indices.discard(index)
+    return conflicts
+
+
+class ScheduleSolver:
+    """Assigns meetings to slots so that meetings in conflict never share one.
+
+    candidates[m] is [(slot offset, attendance)] for meeting m, best first and
+    earlier slots first on ties, conflicts[m] the meetings that share a
+    participant with m. A meeting without a free slot stays unassigned.
+    """
+
+    def __init__(self, candidates, conflicts):
+        self.candidates = candidates
+        self.conflicts = conflicts
+        self.attendance = [dict(meeting_candidates) for meeting_candidates in candidates]
+        self.assigned = [None] * len(candidates)
+        self.occupants = defaultdict(set)
+        self.total = 0
+        self.upper_bound = sum(meeting_candidates[0][1] for meeting_candidates in candidates if meeting_candidates)
+
+    def value(self, meeting):
+        slot = self.assigned[meeting]
+        return 0 if slot is None else self.attendance[meeting][slot]
+
+    def place(self, meeting, slot):
+        self.assigned[meeting] = slot
+        self.occupants[slot].add(meeting)
+        self.total += self.attendance[meeting][slot]
+
+    def remove(self, meeting):
+        slot = self.assigned[meeting]
+        if slot is not None:
+            self.total -= self.attendance[meeting][slot]
+            self.occupants[slot].discard(meeting)
+            self.assigned[meeting] = None
+
+    def best_free_slot(self, meeting):
+        conflicts = self.conflicts[meeting]
+        for slot, _ in self.candidates[meeting]:
+            if conflicts.isdisjoint(self.occupants[slot]):
+                return slot
+        return None
+
+    def greedy(self):
+        # Meetings with many conflicts and few candidate slots pick first
+        order = sorted(
+            range(len(self.candidates)),
+            key=lambda meeting: (-len(self.conflicts[meeting]), len(self.candidates[meeting]), meeting)
+        )
+        for meeting in order:
+            slot = self.best_free_slot(meeting)
+            if slot is not None:
+                self.place(meeting, slot)
+        return order
+
+    def try_move(self, meeting, slot):
+        # Move meeting to slot, the conflicting meetings there go to their best free slot.
+        # Kept only if the total attendance grows.
+        gain = self.attendance[meeting][slot] - self.value(meeting)
+        old_slot = self.assigned[meeting]
+        blockers = sorted(self.occupants[slot] & self.conflicts[meeting])
+        self.remove(meeting)
+        for blocker in blockers:
+            self.remove(blocker)
+        self.place(meeting, slot)
+
+        loss = 0
+        moved = []
+        for blocker in blockers:
+            new_slot = self.best_free_slot(blocker)
+            loss += self.attendance[blocker][slot] - (0 if new_slot is None else self.attendance[blocker][new_slot])
+            if loss >= gain:
+                break
+            if new_slot is not None:
+                self.place(blocker, new_slot)
+                moved.append(blocker)
+        if loss < gain:
+            return True
+
+        for blocker in moved:
+            self.remove(blocker)
+        self.remove(meeting)
+        for blocker in blockers:
+            self.place(blocker, slot)
+        if old_slot is not None:
+            self.place(meeting, old_slot)
+        return False
+
+    def free_slots(self, meeting):
+        # The meeting's free slots best first, then None for leaving it unassigned
+        conflicts = self.conflicts[meeting]
+        for slot, _ in self.candidates[meeting]:
+            if conflicts.isdisjoint(self.occupants[slot]):
+                yield slot
+        yield None
+
+    def local_search(self, order, deadline, clock):
+        # Returns False when the deadline passed before a local optimum was reached
+        improved = True
+        while improved and self.total < self.upper_bound:
+            improved = False
+            for meeting in order:
+                if deadline is not None and clock() >= deadline:
+                    return False
+                current = self.value(meeting)
+                for slot, attendance in self.candidates[meeting]:
+                    if attendance <= current:
+                        break
+                    if self.try_move(meeting, slot):
+                        improved = True
+                        break
+        return True
+
+    def branch_and_bound(self, order, deadline, clock):
+        """Search every schedule that can beat the current one, meetings assigned in order.
+
+        Returns False when the deadline passed first. The best schedule found is
+        left assigned either way.
+        """
+        best_total, best_assigned = self.total, list(self.assigned)
+        # remaining[p] is the attendance the meetings from position p on can reach at most
+        remaining = [0] * (len(order) + 1)
+        for position in range(len(order) - 1, -1, -1):
+            meeting_candidates = self.candidates[order[position]]
+            remaining[position] = remaining[position + 1] + (meeting_candidates[0][1] if meeting_candidates else 0)
+
+        for meeting in order:
+            self.remove(meeting)
+        finished = True
+        steps = 0
+        options = [self.free_slots(order[0])] if order else []
+        while options:
+            steps += 1
+            if deadline is not None and steps % DEADLINE_CHECK_STEPS == 0 and clock() >= deadline:
+                finished = False
+                break
+            position = len(options) - 1
+            meeting = order[position]
+            self.remove(meeting)
+            slot = next(options[-1], False)
+            if slot is False:
+                options.pop()
+                continue
+            if slot is not None:
+                self.place(meeting, slot)
+            if self.total + remaining[position + 1] <= best_total:
+                # Later options of this meeting are no better
+                self.remove(meeting)
+                options.pop()
+                continue
+            if position + 1 < len(order):
+                options.append(self.free_slots(order[position + 1]))
+                continue
+            best_total, best_assigned = self.total, list(self.assigned)
+            if best_total == self.upper_bound:
+                break
+
+        for meeting in order:
+            self.remove(meeting)
+        for meeting, slot in enumerate(best_assigned):
+            if slot is not None:
+                self.place(meeting, slot)
+        return finished
+
+    def solve(self, deadline=None, clock=time.perf_counter):
+        """Return True when the schedule is optimal, False when the deadline, a clock() value, came first.
+
+        assigned holds the best schedule found either way.
+        """
+        order = self.greedy()
+        if not self.local_search(order, deadline, clock):
+            return False
+        if self.total == self.upper_bound:
+            return True
+        return self.branch_and_bound(order, deadline, clock)
+
+
+def _parse_options(body, errors):
+    # Returns (time zone, horizon, time budget in ms), with errors added for invalid ones
+    time_zone = body.get("timeZone")
+    if time_zone is not None and not is_valid_zone(time_zone):
+        time_zone = None
+        errors.add(INVALID_TIME_ZONE_ERROR)
+    horizon = body.get("horizon")
+    if horizon is not None:
+        try:
+            horizon = parse_horizon(horizon)
+        except ValueError:
+            horizon = None
+            errors.add(INVALID_HORIZON_ERROR)
+    time_budget_ms = body.get("timeBudgetMs", DEFAULT_TIME_BUDGET_MS)
+    if not is_valid_time_budget(time_budget_ms):
+        errors.add(INVALID_TIME_BUDGET_ERROR)
+    return time_zone, horizon, time_budget_ms
+
+
+def _meeting_attendance(meeting, validator):
+    # Returns (meeting name, participant names, {slot offset: [available names]}), raises ValidationError
+    if not isinstance(meeting, dict):
+        raise ValidationError(INVALID_MEETING_ERROR)
+    meeting_name = meeting.get("meetingName")
+    if not is_valid_meeting_name(meeting_name):
+        raise ValidationError(INVALID_MEETING_NAME_ERROR)
+    participants = meeting.get("participants")
+    if not participants or not isinstance(participants, list):
+        raise ValidationError(INVALID_PARTICIPANTS_ERROR)
+
+    names = []
+    names_by_slot = defaultdict(list)
+    for participant in participants:
+        name, encoded_slots = validator.validate(participant)
+        names.append(name)
+        for slot in encoded_slots:
+            names_by_slot[slot].append(name)
+    return meeting_name, names, names_by_slot
+
+
+def schedule_meetings(body):
+    """Assign every meeting of a conflictFree batch a slot without double-booking anyone.
+
+    Returns (status_code, response_body). The schedule lists the meetings in
+    input order, optimal is False when the time budget ran out before the
+    schedule was known to be the best one.
+    """
+    started = time.perf_counter()
+    errors, error = create_error_collector(body)
+    if error is not None:
+        return 400, {"error": error}
+
+    meetings = body.get("meetings")
+    if not meetings or not isinstance(meetings, list):
+        return 400, {"error": INVALID_MEETINGS_ERROR}
+
+    time_zone, horizon, time_budget_ms = _parse_options(body, errors)
+    if errors and not errors.collect_all:
+        return 400, errors.response_body()
+
+    # One validator for all meetings, the same slot strings repeat across them
+    validator = ParticipantValidator(time_zone, horizon)
+    parsed = []
+    for index, meeting in enumerate(meetings):
+        try:
+            parsed.append(_meeting_attendance(meeting, validator))
+        except ValidationError as e:
+            if errors.add(SCHEDULE_MEETING_ERROR.format(index, e)):
+                break
+    if errors:
+        return 400, errors.response_body()
+
+    try:
+        candidates = [
+            sorted(((slot, len(names)) for slot, names in names_by_slot.items()), key=lambda item: (-item[1], item[0]))
+            for _, _, names_by_slot in parsed
+        ]
+        solver = ScheduleSolver(candidates, find_conflicts([set(names) for _, names, _ in parsed]))
+        optimal = solver.solve(started + time_budget_ms / 1000)
+
+        format_slot = slot_formatter(validator, time_zone)
+        schedule = []
+        for (meeting_name, _, names_by_slot), slot in zip(parsed, solver.assigned):
+            if slot is None:
+                schedule.append({"meetingName": meeting_name, "slot": None, "participants": [], "message": NO_FREE_SLOT_MESSAGE})
+            else:
+                schedule.append({"meetingName": meeting_name, "slot": format_slot(slot), "participants": names_by_slot[slot]})
+        return 200, {
+            "schedule": schedule,
+            "totalAttendance": solver.total,
+            "upperBound": solver.upper_bound,
+            "optimal": optimal
+        }
+    except Exception as e:
+        return 500, internal_error_body(e)
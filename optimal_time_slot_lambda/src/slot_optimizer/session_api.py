@@ -0,0 +1,86 @@
+import json
+from urllib.parse import unquote
+
+from .json_codec import loads
+from .meeting import INVALID_JSON_ERROR, INVALID_MEETING_NAME_ERROR, build_response_body, is_valid_meeting_name
+from .validation import ValidationError, validate_participant
+
+# Routes, relative to /api/v1:
+#   POST   /meetings/sessions                                  {"meetingName"} -> new session
+#   GET    /meetings/sessions/{sessionId}                      current optimal slots
+#   DELETE /meetings/sessions/{sessionId}
+#   POST   /meetings/sessions/{sessionId}/participants         {"name", "preferredSlots"} add or update
+#   DELETE /meetings/sessions/{sessionId}/participants/{name}
+SESSIONS_PATH = "/meetings/sessions"
+
+SESSION_NOT_FOUND_ERROR = "Session not found"
+NOT_FOUND_ERROR = "Not found"
+METHOD_NOT_ALLOWED_ERROR = "Method not allowed"
+
+
+def is_session_request(path):
+    return SESSIONS_PATH in (path or "")
+
+
+def _session_body(store, session_id, meeting_name):
+    max_participants, optimal_slots = store.result(session_id)
+    response_body = build_response_body(meeting_name, max_participants, optimal_slots)
+    response_body["sessionId"] = session_id
+    return response_body
+
+
+def _parse_body(raw_body):
+    body = loads(raw_body or "{}")
+    return body if isinstance(body, dict) else {}
+
+
+def handle_session_request(store, method, path, raw_body):
+    """Route one session API call. Returns (status_code, response_body)."""
+    route = path[path.index(SESSIONS_PATH) + len(SESSIONS_PATH):]
+    parts = [unquote(part) for part in route.split("/") if part]
+
+    try:
+        if not parts:
+            if method != "POST":
+                return 405, {"error": METHOD_NOT_ALLOWED_ERROR}
+            meeting_name = _parse_body(raw_body).get("meetingName")
+            if not is_valid_meeting_name(meeting_name):
+                return 400, {"error": INVALID_MEETING_NAME_ERROR}
+            session_id = store.create(meeting_name)
+            return 201, _session_body(store, session_id, meeting_name)
+
+        session_id = parts[0]
+        meeting_name = store.meeting_name(session_id)
+        if meeting_name is None:
+            return 404, {"error": SESSION_NOT_FOUND_ERROR}
+
+        if len(parts) == 1:
+            if method == "GET":
+                return 200, _session_body(store, session_id, meeting_name)
+            if method == "DELETE":
+                store.delete(session_id)
+                return 200, {"sessionId": session_id, "deleted": True}
+            return 405, {"error": METHOD_NOT_ALLOWED_ERROR}
+
+        if parts[1] != "participants" or len(parts) > 3:
+            return 404, {"error": NOT_FOUND_ERROR}
+
+        if len(parts) == 2:
+            if method != "POST":
+                return 405, {"error": METHOD_NOT_ALLOWED_ERROR}
+            try:
+                name, encoded_slots = validate_participant(_parse_body(raw_body))
+            except ValidationError as e:
+                return 400, {"error": str(e)}
+            # Only the slots that changed for this participant are updated
+            store.set_participant(session_id, name, encoded_slots)
+            return 200, _session_body(store, session_id, meeting_name)
+
+        if method != "DELETE":
+            return 405, {"error": METHOD_NOT_ALLOWED_ERROR}
+        if not store.remove_participant(session_id, parts[2]):
+            return 404, {"error": f"Participant '{parts[2]}' not found in session"}
+        return 200, _session_body(store, session_id, meeting_name)
+
+    except json.JSONDecodeError:
+        return 400, {"error": INVALID_JSON_ERROR}
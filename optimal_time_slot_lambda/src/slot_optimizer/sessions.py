@@ -0,0 +1,231 @@
+import os
+import uuid
+from abc import ABC, abstractmethod
+
+# Stateful meeting sessions. Participants are added, updated and removed one at a
+# time and only the slots that changed are touched, instead of rebuilding the
+# whole aggregation from the full participant list.
+
+
+class SessionStore(ABC):
+    """Storage interface for meeting sessions.
+
+    Results are (max_participants, [(slot offset, [participant names])]) with the
+    optimal slots in chronological order, like the optimize endpoint.
+    """
+
+    @abstractmethod
+    def create(self, meeting_name):
+        """Return the id of a new, empty session."""
+
+    @abstractmethod
+    def meeting_name(self, session_id):
+        """Return the session's meeting name, None when the session does not exist."""
+
+    @abstractmethod
+    def set_participant(self, session_id, name, encoded_slots):
+        """Add the participant or replace their slots."""
+
+    @abstractmethod
+    def remove_participant(self, session_id, name):
+        """Remove the participant, return False when they are not in the session."""
+
+    @abstractmethod
+    def result(self, session_id):
+        """Return (max_participants, [(slot offset, [participant names])])."""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Delete the session, sessions that do not exist are ignored."""
+
+
+class MeetingSession:
+    # Per-slot attendees plus count buckets {count: {slots}} so the current
+    # maximum can be kept up to date in O(1) per changed slot
+
+    def __init__(self, meeting_name):
+        self.meeting_name = meeting_name
+        self.participants = {}
+        self.slot_names = {}
+        self.buckets = {}
+        self.max_count = 0
+
+    def _move(self, slot, old_count, new_count):
+        if old_count:
+            bucket = self.buckets[old_count]
+            bucket.discard(slot)
+            if not bucket:
+                del self.buckets[old_count]
+        if new_count:
+            self.buckets.setdefault(new_count, set()).add(slot)
+
+    def _add(self, slot, name):
+        names = self.slot_names.setdefault(slot, {})
+        count = len(names)
+        names[name] = None
+        self._move(slot, count, count + 1)
+        if count + 1 > self.max_count:
+            self.max_count = count + 1
+
+    def _remove(self, slot, name):
+        names = self.slot_names[slot]
+        count = len(names)
+        del names[name]
+        if not names:
+            del self.slot_names[slot]
+        self._move(slot, count, count - 1)
+        # The slot dropped to count - 1, so that bucket is the new maximum if needed
+        if count == self.max_count and count not in self.buckets:
+            self.max_count = count - 1
+
+    def set_participant(self, name, encoded_slots):
+        new_slots = set(encoded_slots)
+        old_slots = self.participants.get(name, set())
+        for slot in old_slots - new_slots:
+            self._remove(slot, name)
+        for slot in dict.fromkeys(encoded_slots):
+            if slot not in old_slots:
+                self._add(slot, name)
+        self.participants[name] = new_slots
+
+    def remove_participant(self, name):
+        old_slots = self.participants.pop(name, None)
+        if old_slots is None:
+            return False
+        for slot in old_slots:
+            self._remove(slot, name)
+        return True
+
+    def result(self):
+        optimal_slots = sorted(self.buckets.get(self.max_count, ()))
+        return self.max_count, [(slot, list(self.slot_names[slot])) for slot in optimal_slots]
+
+
+class InMemorySessionStore(SessionStore):
+    # Sessions live in the process, e.g. for a long-running server or tests
+
+    def __init__(self):
+        self.sessions = {}
+
+    def create(self, meeting_name):
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = MeetingSession(meeting_name)
+        return session_id
+
+    def meeting_name(self, session_id):
+        session = self.sessions.get(session_id)
+        return session.meeting_name if session else None
+
+    def set_participant(self, session_id, name, encoded_slots):
+        self.sessions[session_id].set_participant(name, encoded_slots)
+
+    def remove_participant(self, session_id, name):
+        return self.sessions[session_id].remove_participant(name)
+
+    def result(self, session_id):
+        return self.sessions[session_id].result()
+
+    def delete(self, session_id):
+        self.sessions.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    # Local stand-in for a shared database. Counts are kept in their own table with
+    # an index on (session_id, count), so the maximum is an index lookup.
+
+    def __init__(self, path):
+        # sqlite3 is only imported when a SQLite path is configured
+        import sqlite3
+
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, meeting_name TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS session_slots (
+                session_id TEXT NOT NULL, slot INTEGER NOT NULL, name TEXT NOT NULL,
+                PRIMARY KEY (session_id, name, slot)
+            );
+            CREATE INDEX IF NOT EXISTS session_slots_by_slot ON session_slots (session_id, slot);
+            CREATE TABLE IF NOT EXISTS slot_counts (
+                session_id TEXT NOT NULL, slot INTEGER NOT NULL, count INTEGER NOT NULL,
+                PRIMARY KEY (session_id, slot)
+            );
+            CREATE INDEX IF NOT EXISTS slot_counts_by_count ON slot_counts (session_id, count);
+        """)
+
+    def create(self, meeting_name):
+        session_id = uuid.uuid4().hex
+        self.connection.execute("INSERT INTO sessions (id, meeting_name) VALUES (?, ?)", (session_id, meeting_name))
+        return session_id
+
+    def meeting_name(self, session_id):
+        row = self.connection.execute("SELECT meeting_name FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def _participant_slots(self, session_id, name):
+        rows = self.connection.execute(
+            "SELECT slot FROM session_slots WHERE session_id = ? AND name = ?", (session_id, name)
+        )
+        return {slot for slot, in rows}
+
+    def _apply(self, session_id, name, added, removed):
+        execute = self.connection.execute
+        execute("BEGIN")
+        try:
+            for slot in removed:
+                execute("DELETE FROM session_slots WHERE session_id = ? AND name = ? AND slot = ?", (session_id, name, slot))
+                execute("UPDATE slot_counts SET count = count - 1 WHERE session_id = ? AND slot = ?", (session_id, slot))
+                execute("DELETE FROM slot_counts WHERE session_id = ? AND slot = ? AND count = 0", (session_id, slot))
+            for slot in added:
+                execute("INSERT INTO session_slots (session_id, slot, name) VALUES (?, ?, ?)", (session_id, slot, name))
+                execute(
+                    "INSERT INTO slot_counts (session_id, slot, count) VALUES (?, ?, 1) "
+                    "ON CONFLICT (session_id, slot) DO UPDATE SET count = count + 1",
+                    (session_id, slot)
+                )
+            execute("COMMIT")
+        except BaseException:
+            execute("ROLLBACK")
+            raise
+
+    def set_participant(self, session_id, name, encoded_slots):
+        old_slots = self._participant_slots(session_id, name)
+        added = [slot for slot in dict.fromkeys(encoded_slots) if slot not in old_slots]
+        removed = old_slots.difference(encoded_slots)
+        self._apply(session_id, name, added, removed)
+
+    def remove_participant(self, session_id, name):
+        old_slots = self._participant_slots(session_id, name)
+        if not old_slots:
+            return False
+        self._apply(session_id, name, [], old_slots)
+        return True
+
+    def result(self, session_id):
+        execute = self.connection.execute
+        max_count = execute("SELECT MAX(count) FROM slot_counts WHERE session_id = ?", (session_id,)).fetchone()[0]
+        if not max_count:
+            return 0, []
+        names_by_slot = {
+            slot: [] for slot, in execute(
+                "SELECT slot FROM slot_counts WHERE session_id = ? AND count = ? ORDER BY slot", (session_id, max_count)
+            )
+        }
+        rows = execute(
+            "SELECT session_slots.slot, name FROM session_slots JOIN slot_counts USING (session_id, slot) "
+            "WHERE session_id = ? AND count = ? ORDER BY session_slots.rowid",
+            (session_id, max_count)
+        )
+        for slot, name in rows:
+            names_by_slot[slot].append(name)
+        return max_count, list(names_by_slot.items())
+
+    def delete(self, session_id):
+        execute = self.connection.execute
+        for table, column in (("session_slots", "session_id"), ("slot_counts", "session_id"), ("sessions", "id")):
+            execute(f"DELETE FROM {table} WHERE {column} = ?", (session_id,))
+
+
+def create_session_store(environ=os.environ):
+    # SESSION_STORE_SQLITE_PATH selects the SQLite store, otherwise sessions stay in memory
+    path = environ.get("SESSION_STORE_SQLITE_PATH")
+    return SQLiteSessionStore(path) if path else InMemorySessionStore()
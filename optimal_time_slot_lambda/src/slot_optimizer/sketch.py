@@ -0,0 +1,110 @@
+import heapq
+import math
+from array import array
+
+# Approximate counting with fixed memory. Slot counts go into a count-min sketch,
+# a few rows of counters indexed by independent hashes of the slot, and the
+# slots with the highest estimates are kept as heavy-hitter candidates. Only the
+# candidates are recounted exactly afterwards, so memory does not depend on the
+# number of participants or distinct slots.
+#
+# Error bounds, with N slot entries counted:
+# - an estimate is never below the true count, and with probability
+#   1 - e^-SKETCH_DEPTH it is at most e * N / SKETCH_WIDTH above it
+# - estimates only grow and candidates are only replaced by slots with a higher
+#   estimate, so a slot that is not a candidate has at most as many participants
+#   as the lowest candidate estimate (threshold())
+
+SKETCH_WIDTH = 16384
+SKETCH_DEPTH = 4
+# At least MAX_TOP_K, so topK can be answered from the candidates
+HEAVY_HITTERS = 1024
+
+# Parsed slot strings the validator keeps per time zone in approximate mode, so
+# its cache does not grow with the number of distinct slots either
+APPROXIMATE_MAX_CACHED_SLOTS = 65536
+
+
+class SlotSketch:
+    """Count-min sketch of slot offsets with a bounded set of heavy-hitter candidates."""
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, capacity=HEAVY_HITTERS):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+        self.entries = 0
+        # {slot offset: estimate} and a min-heap of (estimate, slot) with one
+        # entry per candidate, estimates in the heap may be stale and only grow
+        self.candidates = {}
+        self.heap = []
+        self.evicted = False
+
+    def update(self, encoded_slots):
+        width = self.width
+        rows = tuple(enumerate(self.rows))
+        candidates = self.candidates
+        for slot in encoded_slots:
+            estimate = None
+            for seed, row in rows:
+                # Tuples of ints hash the same way in every process
+                column = hash((seed, slot)) % width
+                count = row[column] + 1
+                row[column] = count
+                if estimate is None or count < estimate:
+                    estimate = count
+            self.entries += 1
+
+            if slot in candidates:
+                candidates[slot] = estimate
+            elif len(candidates) < self.capacity:
+                candidates[slot] = estimate
+                heapq.heappush(self.heap, (estimate, slot))
+            else:
+                self._admit(slot, estimate)
+
+    def _admit(self, slot, estimate):
+        # Replace the candidate with the lowest estimate if slot has a higher one
+        heap = self.heap
+        while True:
+            stored, lowest = heap[0]
+            current = self.candidates[lowest]
+            if current == stored:
+                break
+            heapq.heapreplace(heap, (current, lowest))
+        if estimate <= stored:
+            return
+        heapq.heapreplace(heap, (estimate, slot))
+        del self.candidates[lowest]
+        self.candidates[slot] = estimate
+        self.evicted = True
+
+    def threshold(self):
+        # Upper bound for the count of any slot that is not a candidate
+        if not self.evicted:
+            return 0
+        return min(self.candidates.values())
+
+    def error_bound(self):
+        # How much an estimate may exceed the true count, with probability confidence()
+        return math.ceil(math.e * self.entries / self.width)
+
+    def confidence(self):
+        return 1 - math.exp(-self.depth)
+
+    def candidate_slots(self):
+        # Earliest first, the request order of the slots is not kept
+        return sorted(self.candidates)
+
+    def summary(self, max_participants):
+        # Response field of approximate requests. exact means no uncounted slot can
+        # reach max_participants, so the optimal slots are the exact answer.
+        threshold = self.threshold()
+        return {
+            "candidates": len(self.candidates),
+            "errorBound": self.error_bound(),
+            "confidence": round(self.confidence(), 4),
+            "uncountedMax": threshold,
+            "exact": max_participants > threshold
+        }
+
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Slots are fixed-width "YYYY-MM-DDTHH:MM" strings. Internally every slot is an
+# integer number of minutes since 1970-01-01T00:00 so aggregation can work on
+# ints and strings only need to be rebuilt for the slots in the response.
+SLOT_FORMAT = "YYYY-MM-DDTHH:MM"
+SLOT_LENGTH = len(SLOT_FORMAT)
+MINUTES_PER_DAY = 24 * 60
+
+_EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+# Slots converted between time zones must stay formattable with any UTC offset,
+# so the first and last year are left out for them
+MIN_SLOT = (date(2, 1, 1).toordinal() - _EPOCH_ORDINAL) * MINUTES_PER_DAY
+MAX_SLOT = (date(9999, 1, 1).toordinal() - _EPOCH_ORDINAL) * MINUTES_PER_DAY - 1
+
+
+@lru_cache(maxsize=4096)
+def _day_offset(day):
+    # Days since the epoch for a "YYYY-MM-DD" string. Cached because a request
+    # usually has far fewer distinct days than slots.
+    if day[4] != "-" or day[7] != "-":
+        raise ValueError(f"Invalid date: {day}")
+    year, month, day_of_month = day[0:4], day[5:7], day[8:10]
+    if not (year.isdigit() and month.isdigit() and day_of_month.isdigit()):
+        raise ValueError(f"Invalid date: {day}")
+    return date(int(year), int(month), int(day_of_month)).toordinal() - _EPOCH_ORDINAL
+
+
+def encode_day(day):
+    """Convert a "YYYY-MM-DD" string into days since the epoch.
+
+    Raises ValueError for anything that is not a valid date string.
+    """
+    if type(day) is not str or len(day) != 10 or not day.isascii():
+        raise ValueError(f"Invalid date: {day!r}")
+    return _day_offset(day)
+
+
+def encode_slot(slot):
+    """Convert a "YYYY-MM-DDTHH:MM" string into minutes since the epoch.
+
+    Raises ValueError for anything that is not a valid slot string.
+    """
+    if type(slot) is not str or len(slot) != SLOT_LENGTH or not slot.isascii():
+        raise ValueError(f"Invalid slot: {slot!r}")
+    if slot[10] != "T" or slot[13] != ":":
+        raise ValueError(f"Invalid slot: {slot!r}")
+    hour, minute = slot[11:13], slot[14:16]
+    if not (hour.isdigit() and minute.isdigit()):
+        raise ValueError(f"Invalid slot: {slot!r}")
+    hour, minute = int(hour), int(minute)
+    if hour > 23 or minute > 59:
+        raise ValueError(f"Invalid slot: {slot!r}")
+    return _day_offset(slot[:10]) * MINUTES_PER_DAY + hour * 60 + minute
+
+
+def decode_slot(offset):
+    """Convert minutes since the epoch back into a "YYYY-MM-DDTHH:MM" string."""
+    days, minutes = divmod(offset, MINUTES_PER_DAY)
+    day = _EPOCH + timedelta(days=days)
+    hour, minute = divmod(minutes, 60)
+    return f"{day.year:04d}-{day.month:02d}-{day.day:02d}T{hour:02d}:{minute:02d}"
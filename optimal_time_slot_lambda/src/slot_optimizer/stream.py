@@ -0,0 +1,210 @@
+import json
+import re
+import time
+from collections import Counter
+from json.decoder import scanstring
+
+from .ranking import select_top_slots
+from .sketch import APPROXIMATE_MAX_CACHED_SLOTS, SlotSketch
+from .validation import MAX_ERRORS_LIMIT, ParticipantValidator, ValidationError
+
+# Bodies at least this large are parsed incrementally instead of with json.loads
+STREAMING_BODY_MIN_BYTES = 1_000_000
+
+# Participant fields that need the whole participants list at once
+FULL_BODY_FIELDS = ("preferredRanges", "weight", "required", "recurringSlots")
+
+# Marker stored in place of a "participants" array that was streamed
+STREAMED = object()
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def _skip_whitespace(text, index):
+    return _whitespace.match(text, index).end()
+
+
+def is_streamable(body):
+    # Only JSON object bodies are streamed, everything else goes through json.loads
+    if not isinstance(body, str) or len(body) < STREAMING_BODY_MIN_BYTES:
+        return False
+    index = _skip_whitespace(body, 0)
+    return body[index:index + 1] == "{"
+
+
+def stream_body(text, aggregator):
+    """Parse a JSON object body without materializing its "participants" array.
+
+    Each participant is decoded on its own and handed to aggregator.add() before
+    the next one is read, after aggregator.reset() got the members read so far.
+    Every other top-level member is decoded normally and returned in a dict
+    where "participants" is set to STREAMED. Raises json.JSONDecodeError for the
+    same inputs json.loads rejects.
+    """
+    index = _skip_whitespace(text, 0)
+    if text[index:index + 1] != "{":
+        raise json.JSONDecodeError("Expecting '{'", text, index)
+
+    members = {}
+    index = _skip_whitespace(text, index + 1)
+    if text[index:index + 1] != "}":
+        while True:
+            if text[index:index + 1] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+            key, index = scanstring(text, index + 1)
+            index = _skip_whitespace(text, index)
+            if text[index:index + 1] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+            index = _skip_whitespace(text, index + 1)
+
+            if key == "participants":
+                # Like json.loads, a repeated key replaces what was read before
+                aggregator.reset(members)
+            if key == "participants" and text[index:index + 1] == "[":
+                index = _stream_array(text, index, aggregator.add)
+                members[key] = STREAMED
+            else:
+                members[key], index = _decoder.raw_decode(text, index)
+
+            index = _skip_whitespace(text, index)
+            char = text[index:index + 1]
+            if char == ",":
+                index = _skip_whitespace(text, index + 1)
+            elif char == "}":
+                break
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+
+    end = _skip_whitespace(text, index + 1)
+    if end != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+    return members
+
+
+def _stream_array(text, index, add):
+    index = _skip_whitespace(text, index + 1)
+    if text[index:index + 1] == "]":
+        return index + 1
+    while True:
+        value, index = _decoder.raw_decode(text, index)
+        add(value)
+        index = _skip_whitespace(text, index)
+        char = text[index:index + 1]
+        if char == ",":
+            index = _skip_whitespace(text, index + 1)
+        elif char == "]":
+            return index + 1
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+
+
+class SlotCounter:
+    # First pass: validates participants and keeps only a count per distinct slot
+
+    def __init__(self, timed=False):
+        self.validator = ParticipantValidator()
+        # With timed, validation_seconds sums the time spent validating participants
+        self.timed = timed
+        self.validation_seconds = 0.0
+        self.reset()
+
+    def reset(self, members=None):
+        # "approximate": true before the participants counts them in a fixed-size
+        # sketch, after them it comes too late and the body is parsed in full
+        self.sketch = None
+        if members is not None and members.get("approximate") is True:
+            self.sketch = SlotSketch()
+            self.validator.max_cached_slots = APPROXIMATE_MAX_CACHED_SLOTS
+        self.counts = Counter()
+        self.participant_count = 0
+        self.entries = 0
+        # [(message, participant index)]. errorMode may come after the participants
+        # in the body, so errors are kept up to the largest maxErrors plus one.
+        self.errors = []
+        # Range and weighted requests are not streamed, they fall back to json.loads
+        self.needs_full_body = False
+
+    def add(self, participant):
+        index = self.participant_count
+        self.participant_count += 1
+        if isinstance(participant, dict) and any(field in participant for field in FULL_BODY_FIELDS):
+            self.needs_full_body = True
+        if self.needs_full_body or len(self.errors) > MAX_ERRORS_LIMIT:
+            return
+        started = time.perf_counter() if self.timed else None
+        try:
+            _, encoded_slots = self.validator.validate(participant)
+        except ValidationError as e:
+            self.errors.append((str(e), index))
+            return
+        finally:
+            if started is not None:
+                self.validation_seconds += time.perf_counter() - started
+        # Counts are useless once there is an error, later participants are only validated
+        if self.errors:
+            return
+        self.entries += len(encoded_slots)
+        if self.sketch is not None:
+            self.sketch.update(encoded_slots)
+        else:
+            self.counts.update(encoded_slots)
+
+
+class NameCollector:
+    # Second pass: collects participant names (or positions) for the given slots only
+
+    def __init__(self, slots, use_indices=False, validator=None):
+        self.slots = slots
+        self.use_indices = use_indices
+        # Sharing the first pass's validator makes every slot a lookup
+        self.validator = validator or ParticipantValidator()
+        self.reset()
+
+    def reset(self, members=None):
+        self.names_by_slot = {slot: [] for slot in self.slots}
+        self.position = 0
+
+    def add(self, participant):
+        name, encoded_slots = self.validator.validate(participant)
+        if self.use_indices:
+            name = self.position
+        self.position += 1
+        names_by_slot = self.names_by_slot
+        for slot in encoded_slots:
+            names = names_by_slot.get(slot)
+            if names is not None:
+                names.append(name)
+
+
+def collect_optimal_slots(text, counter, top_k=None, use_indices=False):
+    """Return (max_participants, optimal slots, ranked slots) for a counted body.
+
+    Both slot lists are [(slot offset, [names])], ranked slots are only filled
+    for top_k. The body is read a second time to gather names for the returned
+    slots only, so names are never kept for every slot.
+    """
+    max_participants = max(counter.counts.values(), default=0)
+    winning_slots = [slot for slot, count in counter.counts.items() if count == max_participants]
+    top_slots = select_top_slots(counter.counts, top_k) if top_k is not None else []
+    if not winning_slots:
+        return max_participants, [], []
+
+    collector = NameCollector(winning_slots + top_slots, use_indices, counter.validator)
+    stream_body(text, collector)
+    names_by_slot = collector.names_by_slot
+    return (
+        max_participants,
+        [(slot, names_by_slot[slot]) for slot in winning_slots],
+        [(slot, names_by_slot[slot]) for slot in top_slots]
+    )
+
+
+def collect_candidate_names(text, counter, use_indices=False):
+    """Return {slot offset: [names]} for the candidates of an approximately counted body.
+
+    The body is read a second time, which recounts the candidates exactly.
+    """
+    collector = NameCollector(counter.sketch.candidate_slots(), use_indices, counter.validator)
+    stream_body(text, collector)
+    return collector.names_by_slot
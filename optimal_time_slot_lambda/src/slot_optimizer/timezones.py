@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from .slots import MAX_SLOT, MIN_SLOT, MINUTES_PER_DAY, SLOT_LENGTH, decode_slot, encode_slot
+
+# Time-zone-aware slots. A slot is either local time in its participant's zone,
+# "YYYY-MM-DDTHH:MM", or carries its own UTC offset, "YYYY-MM-DDTHH:MM+02:00" or
+# "YYYY-MM-DDTHH:MMZ". Both are normalized to minutes since the epoch in UTC.
+#
+# UTC offsets only change at a few transitions a year, so they are looked up once
+# per zone and local day and cached, instead of converting every slot with zoneinfo.
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def load_zone(name):
+    """Return the ZoneInfo for an IANA zone name, or None if there is no such zone."""
+    # Checked before the cache, which would fail on unhashable values such as lists
+    if not isinstance(name, str) or not name:
+        return None
+    return _load_zone(name)
+
+
+@lru_cache(maxsize=256)
+def _load_zone(name):
+    # zoneinfo is only imported by requests that use time zones
+    from zoneinfo import ZoneInfo
+
+    try:
+        return ZoneInfo(name)
+    except (KeyError, ValueError, OSError):
+        return None
+
+
+def is_valid_zone(name):
+    return load_zone(name) is not None
+
+
+def _minutes(delta):
+    return int(delta.total_seconds()) // 60
+
+
+@lru_cache(maxsize=65536)
+def _local_day_offset(zone_name, day):
+    # UTC offset in minutes for a whole local day, None on days with a transition
+    zone = load_zone(zone_name)
+    midnight = _EPOCH + timedelta(days=day)
+    first = midnight.replace(tzinfo=zone).utcoffset()
+    last = (midnight + timedelta(minutes=MINUTES_PER_DAY - 1)).replace(tzinfo=zone).utcoffset()
+    return _minutes(first) if first == last else None
+
+
+def local_day_utc_offset(zone_name, day):
+    # UTC offset in minutes shared by a whole local day, None when it changes during the day
+    return _local_day_offset(zone_name, day)
+
+
+def local_utc_offset(zone_name, local_minutes):
+    """UTC offset in minutes of a local time given as minutes since the epoch.
+
+    Local times skipped by a transition use the offset before it, and repeated
+    ones the first occurrence, like datetime with fold=0.
+    """
+    offset = _local_day_offset(zone_name, local_minutes // MINUTES_PER_DAY)
+    if offset is None:
+        local = (_EPOCH + timedelta(minutes=local_minutes)).replace(tzinfo=load_zone(zone_name))
+        offset = _minutes(local.utcoffset())
+    return offset
+
+
+def parse_utc_offset(suffix):
+    # "Z", "+HH:MM" or "-HH:MM" -> minutes east of UTC
+    if suffix == "Z":
+        return 0
+    if len(suffix) != 6 or suffix[0] not in "+-" or suffix[3] != ":":
+        raise ValueError(f"Invalid UTC offset: {suffix!r}")
+    hours, minutes = suffix[1:3], suffix[4:6]
+    if not (hours.isdigit() and minutes.isdigit()) or int(hours) > 23 or int(minutes) > 59:
+        raise ValueError(f"Invalid UTC offset: {suffix!r}")
+    offset = int(hours) * 60 + int(minutes)
+    return -offset if suffix[0] == "-" else offset
+
+
+def has_utc_offset(slot):
+    return type(slot) is str and len(slot) > SLOT_LENGTH
+
+
+def encode_zoned_slot(slot, zone_name=None):
+    """Convert a slot into UTC minutes since the epoch.
+
+    Slots with a UTC offset ignore zone_name, local slots are converted from
+    zone_name, or taken as UTC when it is None.
+    Raises ValueError for anything that is not a valid slot string, and for
+    converted slots outside MIN_SLOT to MAX_SLOT.
+    """
+    if has_utc_offset(slot):
+        offset = encode_slot(slot[:SLOT_LENGTH]) - parse_utc_offset(slot[SLOT_LENGTH:])
+    else:
+        local_minutes = encode_slot(slot)
+        if zone_name is None:
+            return local_minutes
+        # Checked before the zone lookup, which overflows at the ends of the calendar
+        if not MIN_SLOT <= local_minutes <= MAX_SLOT:
+            raise ValueError(f"Slot out of range: {slot!r}")
+        offset = local_minutes - local_utc_offset(zone_name, local_minutes)
+    if not MIN_SLOT <= offset <= MAX_SLOT:
+        raise ValueError(f"Slot out of range: {slot!r}")
+    return offset
+
+
+def format_utc_offset(minutes):
+    if minutes == 0:
+        return "Z"
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def zoned_slot_formatter(zone_name=None):
+    """Return a function that turns UTC minutes into a slot string with a UTC offset.
+
+    Slots are shown in zone_name, or in UTC ("...Z") when it is None.
+    """
+    if zone_name is None:
+        return lambda offset: decode_slot(offset) + "Z"
+
+    zone = load_zone(zone_name)
+
+    def format_slot(offset):
+        utc_offset = _minutes(datetime.fromtimestamp(offset * 60, timezone.utc).astimezone(zone).utcoffset())
+        return decode_slot(offset + utc_offset) + format_utc_offset(utc_offset)
+
+    return format_slot
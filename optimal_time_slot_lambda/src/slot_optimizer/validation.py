@@ -0,0 +1,214 @@
+from .recurrence import RecurringSlots, compile_exceptions, compile_weekly_patterns
+from .timezones import encode_zoned_slot, has_utc_offset, is_valid_zone
+
+# "first" stops at the first invalid input, "all" reports up to maxErrors errors at once
+ERROR_MODES = ("first", "all")
+DEFAULT_ERROR_MODE = "first"
+DEFAULT_MAX_ERRORS = 100
+MAX_ERRORS_LIMIT = 1000
+
+INVALID_PARTICIPANT_ERROR = "Invalid participant (must be an object)"
+
+
+class ValidationError(ValueError):
+    # Raised for invalid request input, the message is returned to the client as is
+    pass
+
+
+def is_valid_max_errors(max_errors):
+    return isinstance(max_errors, int) and not isinstance(max_errors, bool) and 1 <= max_errors <= MAX_ERRORS_LIMIT
+
+
+class ErrorCollector:
+    """Collects the validation errors of one request.
+
+    In "first" mode the first error ends validation, like the early returns it
+    replaces. In "all" mode errors are collected until max_errors is exceeded.
+    """
+
+    def __init__(self, error_mode=DEFAULT_ERROR_MODE, max_errors=DEFAULT_MAX_ERRORS):
+        self.collect_all = error_mode == "all"
+        self.max_errors = max_errors if self.collect_all else 1
+        self.errors = []
+        self.truncated = False
+
+    def add(self, message, participant=None):
+        # Returns True when validation should stop
+        if len(self.errors) >= self.max_errors:
+            self.truncated = True
+            return True
+        error = {"error": message}
+        if participant is not None:
+            error["participant"] = participant
+        self.errors.append(error)
+        return not self.collect_all
+
+    def __bool__(self):
+        return bool(self.errors)
+
+    def response_body(self):
+        # "error" keeps the first message so clients reading only that field still work
+        body = {"error": self.errors[0]["error"]}
+        if self.collect_all:
+            body["errors"] = self.errors
+            body["truncated"] = self.truncated
+        return body
+
+
+class ParticipantValidator:
+    """Validates the participants of one request.
+
+    Slot strings repeat across participants, so each distinct string is parsed
+    once per time zone and later occurrences are a dict lookup. Slots are
+    deduplicated per participant so a repeated slot does not count twice.
+    Participants without a timeZone use default_zone, None keeps local slots as
+    they are. zoned is set once any time zone or UTC offset is seen.
+    recurringSlots are expanded over horizon, (first day, last day) in days
+    since the epoch, while the slots are counted. max_cached_slots bounds the
+    parsed slot strings kept per time zone, None keeps all of them.
+    """
+
+    def __init__(self, default_zone=None, horizon=None, max_cached_slots=None):
+        self.default_zone = default_zone
+        self.horizon = horizon
+        self.max_cached_slots = max_cached_slots
+        self.slot_offsets = {}
+        self.zone_slot_offsets = {default_zone: self.slot_offsets}
+        self.zoned = default_zone is not None
+
+    def zone_for(self, participant, name):
+        # The participant's timeZone, or the default zone when there is none
+        zone_name = participant.get("timeZone")
+        if zone_name is None:
+            return self.default_zone
+        if not is_valid_zone(zone_name):
+            raise ValidationError(f"Participant '{name}' has an invalid field: timeZone (must be an IANA time zone name such as Europe/Berlin)")
+        self.zoned = True
+        return zone_name
+
+    def encode(self, slot, zone_name):
+        # Raises ValueError for invalid slots
+        slot_offsets = self.zone_slot_offsets.get(zone_name)
+        if slot_offsets is None:
+            slot_offsets = self.zone_slot_offsets[zone_name] = {}
+        offset = slot_offsets.get(slot) if type(slot) is str else None
+        if offset is None:
+            offset = encode_zoned_slot(slot, zone_name)
+            if self.max_cached_slots is None or len(slot_offsets) < self.max_cached_slots:
+                slot_offsets[slot] = offset
+            if has_utc_offset(slot):
+                self.zoned = True
+        return offset
+
+    def validate(self, participant):
+        """Validate one participant and return (name, [distinct slot offsets]).
+
+        Raises ValidationError with the client-facing error message.
+        """
+        if not isinstance(participant, dict):
+            raise ValidationError(INVALID_PARTICIPANT_ERROR)
+
+        # Validate that name exists, is string and is not just whitespace
+        name = participant.get("name")
+        if not name or not isinstance(name, str) or name.strip() == "":
+            raise ValidationError("Missing or invalid required field: name (must be a non-empty string)")
+
+        # Validate that preferredSlots exists and is a list, it is optional next to recurringSlots
+        preferred_slots = participant.get("preferredSlots")
+        recurring_slots = participant.get("recurringSlots")
+        if recurring_slots is not None and preferred_slots is None:
+            preferred_slots = []
+        elif not preferred_slots or not isinstance(preferred_slots, list):
+            raise ValidationError(f"Participant '{name}' has a missing or invalid required field: preferredSlots (must be a non-empty list)")
+
+        zone_name = self.zone_for(participant, name)
+
+        # Validate that each slot in preferredSlots is string and in correct format "YYYY-MM-DDTHH:MM"
+        slot_offsets = self.zone_slot_offsets.get(zone_name)
+        encoded_slots = {}
+        for slot in preferred_slots:
+            offset = slot_offsets.get(slot) if slot_offsets is not None and type(slot) is str else None
+            if offset is None:
+                try:
+                    offset = self.encode(slot, zone_name)
+                except ValueError:
+                    raise ValidationError(f"Preferred slot '{slot}' for participant '{name}' must be a string in format YYYY-MM-DDTHH:MM") from None
+                slot_offsets = self.zone_slot_offsets[zone_name]
+            encoded_slots[offset] = None
+        if recurring_slots is None:
+            return name, list(encoded_slots)
+        return name, self.recurring(participant, name, list(encoded_slots), zone_name)
+
+    def recurring(self, participant, name, explicit_slots, zone_name):
+        # Compiles the weekly patterns now, the slots are only expanded when iterated
+        if self.horizon is None:
+            raise ValidationError(f"Participant '{name}' uses recurringSlots, which require a valid horizon")
+        try:
+            minutes_by_weekday = compile_weekly_patterns(participant["recurringSlots"])
+        except ValueError:
+            raise ValidationError(
+                f"Participant '{name}' has an invalid field: recurringSlots (must be a non-empty list of "
+                "{\"days\": [\"MO\", ...], \"start\": \"HH:MM\", \"end\": \"HH:MM\"} patterns)"
+            ) from None
+        try:
+            excluded_days, excluded_slots = compile_exceptions(participant.get("exceptions"))
+        except ValueError:
+            raise ValidationError(
+                f"Participant '{name}' has an invalid field: exceptions (must be a list of YYYY-MM-DD days or YYYY-MM-DDTHH:MM slots)"
+            ) from None
+        return RecurringSlots(explicit_slots, minutes_by_weekday, excluded_days, excluded_slots, self.horizon, zone_name)
+
+    def validate_ranges(self, participant):
+        """Validate a participant that may use preferredRanges next to preferredSlots.
+
+        Returns (name, [slot offsets], [(start offset, end offset)]).
+        Raises ValidationError with the client-facing error message.
+        """
+        return _validate_range_participant(self, participant)
+
+
+def validate_participant(participant):
+    """Validate one participant and return (name, [distinct slot offsets]).
+
+    Raises ValidationError with the client-facing error message.
+    """
+    return ParticipantValidator().validate(participant)
+
+
+def validate_range_participant(participant):
+    """Validate a participant that may use preferredRanges next to preferredSlots.
+
+    Returns (name, [slot offsets], [(start offset, end offset)]).
+    Raises ValidationError with the client-facing error message.
+    """
+    return _validate_range_participant(ParticipantValidator(), participant)
+
+
+def _validate_range_participant(validator, participant):
+    if not isinstance(participant, dict):
+        raise ValidationError(INVALID_PARTICIPANT_ERROR)
+    name = participant.get("name")
+    if not name or not isinstance(name, str) or name.strip() == "":
+        raise ValidationError("Missing or invalid required field: name (must be a non-empty string)")
+
+    # preferredRanges is optional, but it must be a list of {"start", "end"} when given
+    preferred_ranges = participant.get("preferredRanges")
+    if preferred_ranges is not None and not isinstance(preferred_ranges, list):
+        raise ValidationError(f"Participant '{name}' has an invalid field: preferredRanges (must be a list)")
+    zone_name = validator.zone_for(participant, name)
+    encoded_ranges = []
+    for preferred_range in preferred_ranges or []:
+        try:
+            start = validator.encode(preferred_range.get("start"), zone_name)
+            end = validator.encode(preferred_range.get("end"), zone_name)
+        except (AttributeError, ValueError):
+            start = end = None
+        if start is None or end <= start:
+            raise ValidationError(f"Preferred range '{preferred_range}' for participant '{name}' must have a start before its end, both in format YYYY-MM-DDTHH:MM")
+        encoded_ranges.append((start, end))
+
+    # preferredSlots is only required when there are no ranges or recurring slots
+    if encoded_ranges and not participant.get("preferredSlots") and participant.get("recurringSlots") is None:
+        return name, [], encoded_ranges
+    _, encoded_slots = validator.validate(participant)
+    return name, encoded_slots, encoded_ranges
@@ -0,0 +1,115 @@
+import math
+from array import array
+
+from .engine import load_numpy
+from .validation import ParticipantValidator, ValidationError
+
+# Weighted scoring is used once any participant sets one of these fields
+WEIGHT_FIELDS = ("weight", "required")
+DEFAULT_WEIGHT = 1
+# Keeps every score exact, integer sums stay far below 2**53 even for very large meetings
+MAX_WEIGHT = 1_000_000
+# Float64 integers above this are not exact, larger sums stay floats
+MAX_EXACT_SCORE = 2 ** 53
+INVALID_WEIGHT_ERROR = "Participant '{}' has an invalid field: weight (must be a positive number up to 1000000)"
+
+
+def is_weighted_request(participants):
+    return any(
+        isinstance(participant, dict) and any(field in participant for field in WEIGHT_FIELDS)
+        for participant in participants
+    )
+
+
+def validate_weighted_participant(participant, validator=None):
+    """Validate a participant with optional weight and required fields.
+
+    Returns (name, [slot offsets], weight, required). Slots are deduplicated so a
+    participant adds their weight to a slot only once.
+    Raises ValidationError with the client-facing error message.
+    """
+    name, encoded_slots = (validator or ParticipantValidator()).validate(participant)
+
+    weight = participant.get("weight", DEFAULT_WEIGHT)
+    if (
+        not isinstance(weight, (int, float))
+        or isinstance(weight, bool)
+        or not math.isfinite(weight)
+        or not 0 < weight <= MAX_WEIGHT
+    ):
+        raise ValidationError(INVALID_WEIGHT_ERROR.format(name))
+    if isinstance(weight, float) and weight.is_integer():
+        weight = int(weight)
+
+    required = participant.get("required", False)
+    if not isinstance(required, bool):
+        raise ValidationError(f"Participant '{name}' has an invalid field: required (must be a boolean)")
+
+    return name, encoded_slots, weight, required
+
+
+def score_slots(weighted_participants):
+    """Return {slot offset: total weight} for the slots every required participant can attend.
+
+    Slots are in the order they were first seen in the request.
+    """
+    np = load_numpy()
+    if np is not None:
+        return _score_slots_numpy(np, weighted_participants)
+    return _score_slots_python(weighted_participants)
+
+
+def _score_slots_numpy(np, weighted_participants):
+    # Weight-sum over the sparse participant x slot matrix in one bincount
+    offsets = array("q")
+    rows = array("q")
+    for row, (_, encoded_slots, _, _) in enumerate(weighted_participants):
+        offsets.extend(encoded_slots)
+        rows.extend([row] * len(encoded_slots))
+    if not offsets:
+        return {}
+
+    weights = np.array([weight for _, _, weight, _ in weighted_participants], dtype=np.float64)
+    required = np.array([required for _, _, _, required in weighted_participants], dtype=bool)
+    rows = np.frombuffer(rows, dtype=np.int64)
+
+    unique_slots, first_seen, columns = np.unique(
+        np.frombuffer(offsets, dtype=np.int64), return_index=True, return_inverse=True
+    )
+    columns = columns.ravel()
+    scores = np.bincount(columns, weights=weights[rows], minlength=len(unique_slots))
+
+    # A slot is eligible when all required participants are available
+    required_counts = np.bincount(columns[required[rows]], minlength=len(unique_slots))
+    eligible = np.flatnonzero(required_counts == int(required.sum()))
+    eligible = eligible[np.argsort(first_seen[eligible], kind="stable")]
+
+    return dict(zip(unique_slots[eligible].tolist(), _scores_to_python(np, scores[eligible], weights)))
+
+
+def _scores_to_python(np, scores, weights):
+    # Keep integer scores as ints when every weight is an integer and the sums are exact
+    if np.all(weights == np.round(weights)) and (not len(scores) or scores.max() < MAX_EXACT_SCORE):
+        return scores.astype(np.int64).tolist()
+    return scores.tolist()
+
+
+def _score_slots_python(weighted_participants):
+    scores = {}
+    required_counts = {}
+    required_total = 0
+    for _, encoded_slots, weight, required in weighted_participants:
+        for slot in encoded_slots:
+            scores[slot] = scores.get(slot, 0) + weight
+        if required:
+            required_total += 1
+            for slot in encoded_slots:
+                required_counts[slot] = required_counts.get(slot, 0) + 1
+
+    # Scores are all floats as soon as one weight is fractional, like in the NumPy path
+    fractional = any(isinstance(weight, float) for _, _, weight, _ in weighted_participants)
+    return {
+        slot: float(score) if fractional else score
+        for slot, score in scores.items()
+        if required_counts.get(slot, 0) == required_total
+    }
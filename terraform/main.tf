@@ -52,11 +52,22 @@ resource "aws_lambda_function" "lambda" {
   source_code_hash = filebase64sha256(var.lambda_zip_file)
 
   timeout = 10
+
+  environment {
+    variables = {
+      METRICS_ENABLED     = var.metrics_enabled
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+    }
+  }
 }
 
 # API Gateway REST API
 resource "aws_api_gateway_rest_api" "api" {
   name = var.api_gateway_api_name
+
+  # Passes gzip request bodies to the Lambda base64 encoded and decodes its
+  # base64 encoded (gzip) responses
+  binary_media_types = ["*/*"]
 }
 
 # /api Resource
@@ -115,12 +126,48 @@ resource "aws_lambda_permission" "allow_apigw" {
   source_arn = "${aws_api_gateway_rest_api.api.execution_arn}/*/POST/api/v1/meetings/optimize"
 }
 
+# /api/v1/meetings/optimize/batch Resource
+resource "aws_api_gateway_resource" "batch_resource" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  parent_id   = aws_api_gateway_resource.optimize_resource.id
+  path_part   = "batch"
+}
+
+# POST Method for batches
+resource "aws_api_gateway_method" "post_batch" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.batch_resource.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# Lambda Integration for batches
+resource "aws_api_gateway_integration" "batch_lambda_integration" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.batch_resource.id
+  http_method = aws_api_gateway_method.post_batch.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.lambda.invoke_arn
+}
+
+# Lambda Permission for API Gateway batches
+resource "aws_lambda_permission" "allow_apigw_batch" {
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+
+  source_arn = "${aws_api_gateway_rest_api.api.execution_arn}/*/POST/api/v1/meetings/optimize/batch"
+}
+
 # Deployment
 resource "aws_api_gateway_deployment" "deployment" {
   rest_api_id = aws_api_gateway_rest_api.api.id
 
   depends_on = [
-    aws_api_gateway_integration.lambda_integration
+    aws_api_gateway_integration.lambda_integration,
+    aws_api_gateway_integration.batch_lambda_integration
   ]
 }
 
@@ -6,3 +6,8 @@ output "api_url" {
 output "lambda_name" {
   value = aws_lambda_function.lambda.function_name
 }
+
+output "batch_api_url" {
+  description = "URL for batch API calls"
+  value       = "${aws_api_gateway_stage.stage.invoke_url}/api/v1/meetings/optimize/batch"
+}
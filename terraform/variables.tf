@@ -23,3 +23,13 @@ variable "api_gateway_api_name" {
   description = "Name of the API Gateway REST API"
   default     = "find-optimal-time-slot-api"
 }
+
+variable "metrics_enabled" {
+  description = "Emit per-request metrics in CloudWatch Embedded Metric Format"
+  default     = "true"
+}
+
+variable "metrics_sample_rate" {
+  description = "Share of requests that emit metrics (0 to 1)"
+  default     = "0.1"
+}
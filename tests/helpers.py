@@ -0,0 +1,12 @@
+import json
+
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+
+
+def call_handler(body, path=None):
+    """POST a JSON body through lambda_handler and return (status code, parsed response body)."""
+    event = {"body": json.dumps(body)}
+    if path is not None:
+        event["path"] = path
+    response = lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
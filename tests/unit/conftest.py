@@ -0,0 +1,12 @@
+import pytest
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    # Every test starts with an empty warm-container cache
+    optimal_time_slot_lambda.RESULT_CACHE.clear()
+    optimal_time_slot_lambda.PAGE_CACHE.clear()
+    yield
+    optimal_time_slot_lambda.RESULT_CACHE.clear()
+    optimal_time_slot_lambda.PAGE_CACHE.clear()
@@ -0,0 +1,76 @@
+import json
+import pytest
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import batch
+from optimal_time_slot_lambda.src.slot_optimizer.batch import optimize_meetings
+
+BATCH_PATH = "/api/v1/meetings/optimize/batch"
+
+MEETINGS = [
+    {
+        "meetingName": "Design Sync",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00", "2024-06-10T13:00"]}
+        ]
+    },
+    {"meetingName": "", "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]},
+    "not a meeting",
+    {
+        "meetingName": "Retro",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-11T09:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-11T10:00"]}
+        ]
+    },
+]
+
+
+def single_result(meeting):
+    response = lambda_handler({"body": json.dumps(meeting)}, None)
+    return {"statusCode": response["statusCode"], "body": json.loads(response["body"])}
+
+
+def test_batch_results_match_single_endpoint():
+    """Should return each meeting's result or validation error in input order"""
+
+    response = lambda_handler({"path": BATCH_PATH, "body": json.dumps({"meetings": MEETINGS})}, None)
+    results = json.loads(response["body"])["results"]
+
+    assert response["statusCode"] == 200
+    assert results[0] == single_result(MEETINGS[0])
+    assert results[1] == single_result(MEETINGS[1])
+    assert results[2] == {"statusCode": 400, "body": {"error": "Invalid meeting (must be an object)"}}
+    assert results[3] == single_result(MEETINGS[3])
+
+
+@pytest.mark.parametrize("body", [{}, {"meetings": []}, {"meetings": "nope"}, []])
+def test_batch_invalid_meetings(body):
+    """Should return 400 if meetings is missing, empty or not a list"""
+
+    response = lambda_handler({"resource": BATCH_PATH, "body": json.dumps(body)}, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error"] == "Missing or invalid required field: meetings (must be a non-empty list)"
+
+
+def test_batch_worker_processes_keep_input_order(monkeypatch):
+    """Should give the same results in the same order when run in worker processes"""
+
+    meetings = MEETINGS * 5
+    expected = optimize_meetings(meetings, workers=1)
+    monkeypatch.setattr(batch, "BATCH_PARALLEL_MIN_ENTRIES", 0)
+
+    assert optimize_meetings(meetings, workers=3) == expected
+
+
+def test_batch_reports_malformed_participants_per_meeting():
+    """Should return a validation error for a meeting whose participants are not objects"""
+
+    malformed = {"meetingName": "Broken", "participants": ["x"]}
+    response = lambda_handler({"path": BATCH_PATH, "body": json.dumps({"meetings": [MEETINGS[0], malformed]})}, None)
+    results = json.loads(response["body"])["results"]
+
+    assert response["statusCode"] == 200
+    assert results[0] == single_result(MEETINGS[0])
+    assert results[1] == {"statusCode": 400, "body": {"error": "Invalid participant (must be an object)"}}
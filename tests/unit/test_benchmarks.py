@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from benchmarks import load_test, startup
+from benchmarks.run_benchmarks import compare, run
+from benchmarks.workload import generate_meeting
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+
+
+def test_workload_is_seeded():
+    """Should generate the same body for the same seed and a different one otherwise"""
+
+    assert generate_meeting(seed=1) == generate_meeting(seed=1)
+    assert generate_meeting(seed=1) != generate_meeting(seed=2)
+
+
+def test_workload_shape_and_validity():
+    """Should honour the requested sizes and produce valid or invalid requests"""
+
+    body = generate_meeting(participants=30, slots_per_participant=4, slot_universe=10)
+    response = lambda_handler({"body": json.dumps(body)}, None)
+
+    assert len(body["participants"]) == 30
+    assert all(len(participant["preferredSlots"]) == 4 for participant in body["participants"])
+    assert response["statusCode"] == 200
+
+    invalid = generate_meeting(participants=30, invalid_share=1.0)
+    assert lambda_handler({"body": json.dumps(invalid)}, None)["statusCode"] == 400
+
+
+def test_run_and_compare():
+    """Should time every phase and flag phases that got slower"""
+
+    results = run(["small"], repeat=1)
+    phases = results["scenarios"]["small"]["phases"]
+    slower = json.loads(json.dumps(results))
+    slower["scenarios"]["small"]["phases"]["aggregation"]["seconds"] = phases["aggregation"]["seconds"] * 10 + 1
+
+    assert set(phases) == {"parse", "validation", "aggregation", "serialization", "end_to_end"}
+    assert compare(results, results) == []
+    assert [(name, phase) for name, phase, _, _ in compare(results, slower)] == [("small", "aggregation")]
+
+
+def test_startup_benchmark_keeps_heavy_modules_deferred():
+    """Should time a cold start without importing NumPy, multiprocessing or sqlite3"""
+
+    results = startup.run(runs=1)
+
+    assert set(results["timings"]) == {"importMs", "firstInvocationMs", "warmInvocationMs"}
+    assert results["loadedDeferredModules"] == []
+    assert startup.compare(results, results) == []
+
+
+def test_load_test_statistics():
+    """Should compute nearest-rank percentiles, histogram buckets and weighted mixes"""
+
+    latencies = list(range(1, 101))
+
+    assert [load_test.percentile(latencies, share) for share in (0.5, 0.95, 0.99)] == [50, 95, 99]
+    assert load_test.histogram([0.5, 3, 3, 7000], buckets=(1, 5)) == [(1, 1), (5, 2), (None, 1)]
+    assert load_test.parse_mix("small=3,medium") == [("small", 3.0), ("medium", 1.0)]
+    with pytest.raises(ValueError):
+        load_test.parse_mix("huge=1")
+
+
+def test_load_test_summary_with_connection_errors():
+    """Should summarize runs that mix HTTP statuses and connection errors"""
+
+    results = load_test.summarize([10, 20], 1.0, {200: 5, "connectionError": 2, 400: 1})
+
+    assert results["statuses"] == {"200": 5, "400": 1, "connectionError": 2}
+    assert "connectionError" in results["statuses"]
+
+
+def test_load_test_against_local_server():
+    """Should send every request to a local server and report latencies and throughput"""
+
+    results = load_test.run(mix="small=3,invalid=1", concurrency=4, requests=40, variants=2, scale=0.01)
+
+    assert results["requests"] == 40
+    assert sum(results["statuses"].values()) == 40
+    assert set(results["statuses"]) <= {"200", "400"}
+    assert results["requestsPerSecond"] > 0
+    assert results["latencyMs"]["p50"] <= results["latencyMs"]["p99"]
+    assert sum(bucket["count"] for bucket in results["histogram"]) == 40
+    assert load_test.compare(results, results) == []
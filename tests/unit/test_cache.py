@@ -0,0 +1,100 @@
+import json
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer.cache import ResultCache, SQLiteCacheBackend, fingerprint
+
+BODY = {
+    "meetingName": "Design Sync",
+    "participants": [
+        {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+        {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]}
+    ]
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fingerprint_ignores_key_order_and_whitespace():
+    """Should give the same key for the same request written differently"""
+
+    reordered = json.loads(json.dumps({"participants": BODY["participants"], "meetingName": "Design Sync"}, indent=4))
+
+    assert fingerprint(reordered) == fingerprint(BODY)
+    assert fingerprint(dict(BODY, meetingName="Retro")) != fingerprint(BODY)
+
+
+def test_handler_serves_repeated_requests_from_cache():
+    """Should return the same response for a repeated request without recomputing it"""
+
+    cache = optimal_time_slot_lambda.RESULT_CACHE
+    first = lambda_handler({"body": json.dumps(BODY)}, None)
+    second = lambda_handler({"body": json.dumps(BODY, indent=2)}, None)
+
+    assert second == first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_errors_are_not_cached():
+    """Should not cache validation errors"""
+
+    cache = optimal_time_slot_lambda.RESULT_CACHE
+    lambda_handler({"body": json.dumps({"meetingName": ""})}, None)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction_and_ttl():
+    """Should evict the least recently used entry and expire old ones"""
+
+    clock = FakeClock()
+    cache = ResultCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_byte_limit_eviction_and_oversized_entries():
+    """Should evict by total size and skip entries larger than the entry limit"""
+
+    cache = ResultCache(max_size=10, max_bytes=10, max_entry_bytes=6)
+    cache.set("a", "abc")
+    cache.set("b", "abc")
+    assert cache.stats()["bytes"] == 10
+
+    cache.set("c", "abc")
+    assert cache.get("a") is None
+    assert cache.get("b") == "abc"
+    assert cache.stats()["bytes"] == 10
+    assert cache.stats()["evictions"] == 1
+
+    cache.set("b", "abcdefgh")
+    assert cache.get("b") is None
+    assert cache.get("c") == "abc"
+    assert cache.stats()["bytes"] == 5
+    assert cache.stats()["skipped"] == 1
+
+
+def test_sqlite_backend_survives_new_cache(tmp_path):
+    """Should serve results from the persistent tier to a fresh cache"""
+
+    path = str(tmp_path / "results.sqlite")
+    ResultCache(backend=SQLiteCacheBackend(path)).set("key", {"statusCode": 200})
+    cache = ResultCache(backend=SQLiteCacheBackend(path))
+
+    assert cache.get("key") == {"statusCode": 200}
+    assert cache.stats()["backendHits"] == 1
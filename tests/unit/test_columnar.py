@@ -0,0 +1,120 @@
+import base64
+import json
+import random
+import struct
+
+import pytest
+
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import columnar, engine
+from optimal_time_slot_lambda.src.slot_optimizer.columnar import (
+    COLUMNAR_CONTENT_TYPE, MAX_SLOT, decode_columns, encode_columns, invalid_rows
+)
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import INVALID_COLUMNS_ERROR, INVALID_ROW_ERROR
+from optimal_time_slot_lambda.src.slot_optimizer.slots import decode_slot, encode_slot
+from tests.helpers import call_handler
+
+
+def call_columns(data, content_type=COLUMNAR_CONTENT_TYPE):
+    event = {
+        "body": base64.b64encode(data).decode("ascii"),
+        "isBase64Encoded": True,
+        "headers": {"Content-Type": content_type}
+    }
+    response = lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def random_participants(seed, count=50):
+    rng = random.Random(seed)
+    base = encode_slot("2024-06-10T09:00")
+    return [(f"P{i}", [base + 30 * rng.randrange(40) for _ in range(8)]) for i in range(count)]
+
+
+def raw_columns(header, row_ends, slots):
+    # Columnar body without the sorting encode_columns does
+    encoded_header = json.dumps(header).encode("utf-8")
+    prefix = struct.pack("<4sI", b"OTS1", len(encoded_header)) + encoded_header
+    padding = bytes(-len(prefix) % 8)
+    return prefix + padding + struct.pack(f"<{len(row_ends)}q", *row_ends) + struct.pack(f"<{len(slots)}q", *slots)
+
+
+def test_columns_round_trip():
+    """Should decode the header and both columns of an encoded body"""
+
+    data = encode_columns({"meetingName": "Sync"}, [("Alice", [120, 60, 60]), ("Bob", []), ("Carol", [30])])
+    header, row_ends, slots = decode_columns(data)
+
+    assert header == {"meetingName": "Sync", "names": ["Alice", "Bob", "Carol"]}
+    assert list(row_ends) == [2, 2, 3]
+    assert list(slots) == [60, 120, 30]
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"JSON" + bytes(12),
+    encode_columns({"meetingName": "Sync"}, [("Alice", [60])])[:-1],
+    encode_columns({"meetingName": "Sync"}, [("Alice", [60])]) + bytes(8)
+])
+def test_malformed_bodies(data):
+    """Should reject bodies that do not follow the layout"""
+
+    with pytest.raises(ValueError):
+        decode_columns(data)
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_invalid_rows(monkeypatch, numpy):
+    """Should report rows with unsorted, repeated or out-of-range slots"""
+
+    if not numpy:
+        monkeypatch.setattr(columnar, "load_numpy", lambda: None)
+    _, row_ends, slots = decode_columns(raw_columns({"names": ["A", "B", "C", "D"]}, [2, 4, 5, 7], [1, 2, 3, 3, MAX_SLOT + 1, 9, 8]))
+
+    assert invalid_rows(row_ends, slots) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize("seed", range(3))
+def test_columnar_meeting_matches_json(monkeypatch, numpy, seed):
+    """Should answer like the same meeting sent as JSON"""
+
+    if not numpy:
+        monkeypatch.setattr(engine, "load_numpy", lambda: None)
+        monkeypatch.setattr(columnar, "load_numpy", lambda: None)
+    participants = random_participants(seed)
+    json_body = {
+        "meetingName": "Sync", "topK": 3,
+        "participants": [{"name": name, "preferredSlots": [decode_slot(slot) for slot in slots]} for name, slots in participants]
+    }
+
+    assert call_columns(encode_columns({"meetingName": "Sync", "topK": 3}, participants)) == call_handler(json_body)
+
+
+def test_columnar_options():
+    """Should apply responseFormat and timeZone from the header"""
+
+    participants = [("Alice", [encode_slot("2024-06-10T07:00")]), ("Bob", [encode_slot("2024-06-10T07:00")])]
+    status_code, body = call_columns(encode_columns(
+        {"meetingName": "Sync", "responseFormat": "indices", "timeZone": "Europe/Berlin"}, participants
+    ))
+
+    assert status_code == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T09:00+02:00", "participants": [0, 1]}]
+
+
+def test_columnar_errors():
+    """Should return 400 for malformed bodies and invalid participants"""
+
+    assert call_columns(b"not columns") == (400, {"error": INVALID_COLUMNS_ERROR})
+    assert call_columns(raw_columns({"meetingName": "Sync", "names": ["Alice"]}, [2], [60, 30])) == (
+        400, {"error": INVALID_ROW_ERROR.format("Alice")}
+    )
+
+
+def test_other_content_types_stay_json():
+    """Should only read bodies as columns when the content type says so"""
+
+    data = encode_columns({"meetingName": "Sync"}, [("Alice", [60])])
+
+    assert call_columns(data, "application/json")[0] == 400
@@ -0,0 +1,124 @@
+import base64
+import gzip
+import json
+
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer.compression import (
+    INVALID_BODY_ENCODING_ERROR, MAX_DECOMPRESSED_BYTES, accepts_gzip
+)
+
+BODY = {
+    "meetingName": "All Hands",
+    "participants": [
+        {"name": f"Person {index}", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]}
+        for index in range(100)
+    ]
+}
+
+
+def gzip_event(body, **headers):
+    compressed = gzip.compress(json.dumps(body).encode("utf-8"))
+    return {
+        "body": base64.b64encode(compressed).decode("ascii"),
+        "isBase64Encoded": True,
+        "headers": headers
+    }
+
+
+def decompressed_body(response):
+    return json.loads(gzip.decompress(base64.b64decode(response["body"])))
+
+
+def test_accepts_gzip_request_bodies():
+    """Should decode base64 gzip request bodies"""
+
+    response = lambda_handler(gzip_event(BODY, **{"content-encoding": "gzip"}), None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["maxParticipants"] == 100
+
+
+def test_accepts_base64_bodies_without_compression():
+    """Should decode base64 bodies that are not compressed"""
+
+    event = {"body": base64.b64encode(json.dumps(BODY).encode("utf-8")).decode("ascii"), "isBase64Encoded": True}
+
+    assert lambda_handler(event, None)["statusCode"] == 200
+
+
+def test_compresses_large_responses_when_accepted():
+    """Should gzip responses above the threshold when the client accepts gzip"""
+
+    plain = lambda_handler({"body": json.dumps(BODY)}, None)
+    response = lambda_handler({"body": json.dumps(BODY), "headers": {"Accept-Encoding": "gzip, deflate, br"}}, None)
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+    assert decompressed_body(response) == json.loads(plain["body"])
+    assert len(response["body"]) < len(plain["body"])
+
+
+def test_small_responses_are_not_compressed():
+    """Should skip compression for responses below the threshold"""
+
+    event = {"body": json.dumps({"meetingName": ""}), "headers": {"Accept-Encoding": "gzip"}}
+    response = lambda_handler(event, None)
+
+    assert response["statusCode"] == 400
+    assert "isBase64Encoded" not in response
+    assert "Content-Encoding" not in response["headers"]
+
+
+def test_threshold_is_configurable(monkeypatch):
+    """Should compress every response with a threshold of zero"""
+
+    monkeypatch.setattr(optimal_time_slot_lambda, "COMPRESSION_MIN_BYTES", 0)
+    event = {"body": json.dumps({"meetingName": ""}), "headers": {"Accept-Encoding": "gzip"}}
+
+    assert "error" in decompressed_body(lambda_handler(event, None))
+
+
+def test_cached_responses_are_compressed_per_request():
+    """Should only compress for clients that accept gzip, even for cached results"""
+
+    compressed = lambda_handler({"body": json.dumps(BODY), "headers": {"Accept-Encoding": "gzip"}}, None)
+    plain = lambda_handler({"body": json.dumps(BODY)}, None)
+
+    assert compressed["isBase64Encoded"] is True
+    assert "isBase64Encoded" not in plain
+    assert optimal_time_slot_lambda.RESULT_CACHE.stats()["hits"] == 1
+
+
+def test_accept_encoding_parsing():
+    """Should honour gzip quality values and wildcards"""
+
+    assert accepts_gzip({"headers": {"accept-encoding": "GZIP"}})
+    assert accepts_gzip({"headers": {"Accept-Encoding": "br, *;q=0.1"}})
+    assert not accepts_gzip({"headers": {"Accept-Encoding": "gzip;q=0, br"}})
+    assert not accepts_gzip({"headers": None})
+
+
+def test_invalid_encoded_bodies():
+    """Should reject bodies that are not valid base64, gzip or UTF-8"""
+
+    events = [
+        {"body": "not base64!", "isBase64Encoded": True},
+        {"body": base64.b64encode(b"\x1f\x8bbroken").decode("ascii"), "isBase64Encoded": True},
+        {"body": base64.b64encode(b"\xff\xfe").decode("ascii"), "isBase64Encoded": True}
+    ]
+
+    for event in events:
+        response = lambda_handler(event, None)
+        assert response["statusCode"] == 400
+        assert json.loads(response["body"]) == {"error": INVALID_BODY_ENCODING_ERROR}
+
+
+def test_rejects_bodies_that_expand_too_far():
+    """Should stop decompressing at the size limit"""
+
+    bomb = gzip.compress(b" " * (MAX_DECOMPRESSED_BYTES + 1))
+    response = lambda_handler({"body": base64.b64encode(bomb).decode("ascii"), "isBase64Encoded": True}, None)
+
+    assert json.loads(response["body"]) == {"error": INVALID_BODY_ENCODING_ERROR}
@@ -0,0 +1,61 @@
+import random
+from array import array
+import pytest
+from optimal_time_slot_lambda.src.slot_optimizer import engine
+from optimal_time_slot_lambda.src.slot_optimizer.engine import SlotAggregator, find_optimal_slots_columns
+
+
+def make_participants(seed, participant_count=200, slot_universe=50, slots_per_participant=10):
+    rng = random.Random(seed)
+    return [
+        (f"P{i}", list(dict.fromkeys(rng.randrange(slot_universe) * 30 for _ in range(slots_per_participant))))
+        for i in range(participant_count)
+    ]
+
+
+def aggregate(participants):
+    aggregator = SlotAggregator()
+    for name, encoded_slots in participants:
+        aggregator.add(name, encoded_slots)
+    return aggregator.result()
+
+
+def as_columns(participants):
+    row_ends = array("q")
+    offsets = array("q")
+    for _, encoded_slots in participants:
+        offsets.extend(encoded_slots)
+        row_ends.append(len(offsets))
+    return row_ends, offsets
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_columns_engine_matches_aggregator(monkeypatch, numpy, seed):
+    """Should return the same max and slots (in the same order) as the aggregator of JSON requests"""
+
+    if not numpy:
+        monkeypatch.setattr(engine, "load_numpy", lambda: None)
+    participants = make_participants(seed)
+    row_ends, offsets = as_columns(participants)
+
+    assert find_optimal_slots_columns(participants, row_ends, offsets) == aggregate(participants)
+
+
+def test_ties_keep_first_seen_order():
+    """Should list tied slots in the order they first appear in the request"""
+
+    participants = [("Alice", [300, 60, 120]), ("Bob", [120, 60, 300])]
+    max_participants, slots = aggregate(participants)
+
+    assert max_participants == 2
+    assert [slot for slot, _ in slots] == [300, 60, 120]
+    assert slots[0][1] == ["Alice", "Bob"]
+    assert find_optimal_slots_columns(participants, *as_columns(participants)) == (max_participants, slots)
+
+
+def test_empty_requests():
+    """Should return no slots when nobody has any"""
+
+    assert aggregate([("Alice", [])]) == (0, [])
+    assert find_optimal_slots_columns([("Alice", [])], *as_columns([("Alice", [])])) == (0, [])
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import ENCODED_ERROR_BODIES, lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import json_codec
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import INVALID_PARTICIPANTS_ERROR, INVALID_RESPONSE_FORMAT_ERROR
+from optimal_time_slot_lambda.src.slot_optimizer.stream import STREAMING_BODY_MIN_BYTES
+from tests.helpers import call_handler
+
+BODY = {
+    "meetingName": "Design Sync",
+    "participants": [
+        {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+        {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]},
+        {"name": "Zoë", "preferredSlots": ["2024-06-10T10:00", "2024-06-10T11:00"]}
+    ]
+}
+
+
+def test_codec_round_trip_is_compact_and_keeps_unicode():
+    """Should encode compact UTF-8 JSON that decodes back to the same value"""
+
+    encoded = json_codec.dumps({"name": "Zoë", "slots": [1, 2]})
+
+    assert encoded == '{"name":"Zoë","slots":[1,2]}'
+    assert json_codec.loads(encoded) == {"name": "Zoë", "slots": [1, 2]}
+    assert json_codec.dumps_canonical({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+
+
+@pytest.mark.skipif(json_codec.orjson is None, reason="orjson is not installed")
+def test_orjson_and_stdlib_produce_the_same_response():
+    """Should return the same response text with and without orjson"""
+
+    fast = lambda_handler({"body": json.dumps(BODY)}, None)
+
+    assert json_codec._encoder.encode(json.loads(fast["body"])) == fast["body"]
+
+
+def test_codec_falls_back_for_values_orjson_rejects():
+    """Should still encode integers larger than 64 bits"""
+
+    assert json_codec.loads(json_codec.dumps({"value": 2 ** 70})) == {"value": 2 ** 70}
+
+
+def test_common_errors_use_pre_encoded_bodies():
+    """Should return the pre-encoded body for common validation errors"""
+
+    response = lambda_handler({"body": json.dumps({"meetingName": "Design Sync"})}, None)
+
+    assert response["statusCode"] == 400
+    assert response["body"] == ENCODED_ERROR_BODIES[INVALID_PARTICIPANTS_ERROR]
+
+
+def test_indices_response_format_labels_participants_by_position():
+    """Should list participant positions instead of names"""
+
+    status, body = call_handler(dict(BODY, responseFormat="indices", topK=1))
+
+    assert status == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T10:00", "participants": [0, 1, 2]}]
+    assert body["rankedSlots"] == [{"slot": "2024-06-10T10:00", "participants": [0, 1, 2]}]
+
+
+def test_counts_response_format_only_returns_counts():
+    """Should replace participant lists with their length"""
+
+    status, body = call_handler(dict(BODY, responseFormat="counts"))
+
+    assert status == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T10:00", "count": 3}]
+    assert body["maxParticipants"] == 3
+
+
+def test_response_formats_apply_to_weighted_and_range_requests():
+    """Should apply the response format to weighted and range requests"""
+
+    weighted = dict(BODY, responseFormat="indices")
+    weighted["participants"] = [dict(BODY["participants"][0], weight=2)] + BODY["participants"][1:]
+    ranged = {
+        "meetingName": "Design Sync",
+        "responseFormat": "counts",
+        "participants": [
+            {"name": "Alice", "preferredRanges": [{"start": "2024-06-10T09:00", "end": "2024-06-10T10:00"}]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T09:00"]}
+        ]
+    }
+
+    assert call_handler(weighted)[1]["optimalSlots"] == [{"slot": "2024-06-10T10:00", "participants": [0, 1, 2], "score": 4}]
+    assert call_handler(ranged)[1]["optimalSlots"] == [{"slot": "2024-06-10T09:00", "end": "2024-06-10T09:30", "count": 2}]
+
+
+def test_streamed_requests_support_response_formats():
+    """Should label participants by position for large streamed bodies"""
+
+    participants = [
+        {"name": f"Person {index}", "preferredSlots": ["2024-06-10T09:00" if index < 3 else "2024-06-10T10:00"]}
+        for index in range(STREAMING_BODY_MIN_BYTES // 40)
+    ]
+    status, body = call_handler({"meetingName": "All Hands", "responseFormat": "indices", "participants": participants})
+
+    assert status == 200
+    assert body["optimalSlots"][0]["participants"][:2] == [3, 4]
+
+
+def test_invalid_response_format():
+    """Should reject an unknown responseFormat"""
+
+    assert call_handler(dict(BODY, responseFormat="names")) == (400, {"error": INVALID_RESPONSE_FORMAT_ERROR})
@@ -0,0 +1,95 @@
+import base64
+import json
+import pytest
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer.columnar import COLUMNAR_CONTENT_TYPE, encode_columns
+from optimal_time_slot_lambda.src.slot_optimizer.metrics import NULL_METRICS, InMemorySink, Metrics
+from optimal_time_slot_lambda.src.slot_optimizer.slots import encode_slot
+from optimal_time_slot_lambda.src.slot_optimizer.stream import STREAMING_BODY_MIN_BYTES
+
+EVENT = {
+    "body": json.dumps({
+        "meetingName": "Design Sync",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })
+}
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    sink = InMemorySink()
+    monkeypatch.setattr(optimal_time_slot_lambda, "METRICS", Metrics(enabled=True, sink=sink))
+    return sink
+
+
+def test_emits_phase_timings_and_sizes(sink):
+    """Should emit one EMF record with phase timings, counts and response size"""
+
+    response = lambda_handler(EVENT, None)
+    record = sink.records[0]
+
+    assert len(sink.records) == 1
+    assert record["Route"] == "optimize"
+    assert record["Participants"] == 2
+    assert record["Slots"] == 3
+    assert record["DistinctSlots"] == 2
+    assert record["ResponseBytes"] == len(response["body"])
+    assert record["CacheHit"] == 0
+    for name in ("ParseMs", "ValidationMs", "AggregationMs", "OptimizeMs", "SerializationMs", "TotalMs"):
+        assert record[name] >= 0
+
+    definition = record["_aws"]["CloudWatchMetrics"][0]
+    assert definition["Dimensions"] == [["Route"]]
+    assert {"Name": "ResponseBytes", "Unit": "Bytes"} in definition["Metrics"]
+
+
+def json_event(body, padding=0):
+    return {"body": json.dumps(body) + " " * padding}
+
+
+PARTICIPANTS = json.loads(EVENT["body"])["participants"]
+
+
+@pytest.mark.parametrize("event, distinct_slots", [
+    # Streamed, with trailing whitespace to reach the streaming size
+    (json_event({"meetingName": "Sync", "participants": PARTICIPANTS}, STREAMING_BODY_MIN_BYTES), 2),
+    (json_event({"meetingName": "Sync", "participants": [dict(PARTICIPANTS[0], weight=2), PARTICIPANTS[1]]}), 2),
+    (json_event({"meetingName": "Sync", "granularityMinutes": 60, "participants": PARTICIPANTS}), None),
+    ({
+        "body": base64.b64encode(encode_columns({"meetingName": "Sync"}, [
+            (participant["name"], [encode_slot(slot) for slot in participant["preferredSlots"]]) for participant in PARTICIPANTS
+        ])).decode("ascii"),
+        "isBase64Encoded": True,
+        "headers": {"Content-Type": COLUMNAR_CONTENT_TYPE}
+    }, 2),
+])
+def test_every_optimize_path_records_phases_and_sizes(sink, event, distinct_slots):
+    """Should record counts and phase timings for streamed, weighted, range and columnar requests"""
+
+    assert lambda_handler(event, None)["statusCode"] == 200
+    record = sink.records[0]
+
+    assert record["Participants"] == 2
+    assert record["Slots"] == 3
+    assert record.get("DistinctSlots") == distinct_slots
+    for name in ("ParseMs", "ValidationMs", "AggregationMs", "OptimizeMs"):
+        assert record[name] >= 0
+
+
+def test_disabled_metrics_do_not_emit():
+    """Should hand out the no-op recorder when disabled"""
+
+    assert Metrics(enabled=False).start("optimize") is NULL_METRICS
+
+
+def test_sampling():
+    """Should only record the sampled share of requests"""
+
+    draws = iter([0.05, 0.5, 0.09, 0.95])
+    metrics = Metrics(enabled=True, sample_rate=0.1, sink=InMemorySink(), random_source=lambda: next(draws))
+
+    assert [metrics.start("optimize").enabled for _ in range(4)] == [True, False, True, False]
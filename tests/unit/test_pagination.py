@@ -0,0 +1,140 @@
+import json
+
+import pytest
+
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import meeting
+from optimal_time_slot_lambda.src.slot_optimizer.cache import DEFAULT_CACHE_MAX_ENTRY_BYTES
+from optimal_time_slot_lambda.src.slot_optimizer.json_codec import dumps
+from optimal_time_slot_lambda.src.slot_optimizer.pagination import (
+    INVALID_CURSOR_ERROR, INVALID_LIMIT_ERROR, CompactBody, encode_cursor, iter_json_chunks
+)
+from optimal_time_slot_lambda.src.slot_optimizer.slots import decode_slot, encode_slot
+
+# 40 slots, all attended by both participants
+SLOTS = [decode_slot(encode_slot("2024-06-10T09:00") + 30 * index) for index in range(40)]
+BODY = json.dumps({
+    "meetingName": "Open Office",
+    "participants": [{"name": "Alice", "preferredSlots": SLOTS}, {"name": "Bob", "preferredSlots": SLOTS}]
+})
+
+
+def call_page(parameters, body=BODY):
+    response = lambda_handler({"body": body, "queryStringParameters": parameters}, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_pages_cover_the_full_result_in_order():
+    """Should return every optimal slot once, in the order of the unpaged response"""
+
+    full = call_page(None)[1]
+    slots = []
+    status_code, page = call_page({"limit": "15"})
+    while True:
+        assert status_code == 200
+        assert page["totalSlots"] == 40
+        assert page["maxParticipants"] == 2
+        slots += page["optimalSlots"]
+        if "nextCursor" not in page:
+            break
+        status_code, page = call_page({"cursor": page["nextCursor"]})
+
+    assert slots == full["optimalSlots"]
+
+
+def test_later_pages_skip_the_optimization(monkeypatch):
+    """Should cut later pages from the cached result instead of optimizing again"""
+
+    cursor = call_page({"limit": "10"})[1]["nextCursor"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("optimized again")
+
+    monkeypatch.setattr(optimal_time_slot_lambda, "optimize_meeting", fail)
+    status_code, page = call_page({"cursor": cursor, "limit": "5"})
+
+    assert status_code == 200
+    assert [entry["slot"] for entry in page["optimalSlots"]] == SLOTS[10:15]
+
+
+def test_pages_without_cache_are_recomputed(monkeypatch):
+    """Should still serve a cursor when the cached result is gone"""
+
+    cursor = call_page({"limit": "30"})[1]["nextCursor"]
+    optimal_time_slot_lambda.PAGE_CACHE.clear()
+    status_code, page = call_page({"cursor": cursor})
+
+    assert status_code == 200
+    assert [entry["slot"] for entry in page["optimalSlots"]] == SLOTS[30:]
+    assert "nextCursor" not in page
+
+
+def test_large_results_are_optimized_once(monkeypatch):
+    """Should serve every page of a result too large for the response cache from one optimization"""
+
+    slots = [decode_slot(encode_slot("2024-06-10T09:00") + 30 * index) for index in range(40000)]
+    body = json.dumps({
+        "meetingName": "Open Office",
+        "participants": [{"name": name, "preferredSlots": slots} for name in ("Alice", "Bob", "Carol")]
+    })
+    optimize = optimal_time_slot_lambda.optimize_streamed_meeting
+    calls = []
+    monkeypatch.setattr(
+        optimal_time_slot_lambda, "optimize_streamed_meeting", lambda *args, **kwargs: calls.append(1) or optimize(*args, **kwargs)
+    )
+
+    status_code, page = call_page({"limit": "1000"}, body)
+    for _ in range(3):
+        assert status_code == 200
+        assert page["totalSlots"] == 40000
+        status_code, page = call_page({"cursor": page["nextCursor"]}, body)
+
+    assert [entry["slot"] for entry in page["optimalSlots"]] == slots[3000:4000]
+    assert len(dumps(page)) * 40 > DEFAULT_CACHE_MAX_ENTRY_BYTES
+    assert calls == [1]
+    assert optimal_time_slot_lambda.PAGE_CACHE.stats()["skipped"] == 0
+
+
+def test_compact_body_keeps_the_body():
+    """Should rebuild the same body and share equal participant lists"""
+
+    body = call_page(None)[1]
+    compact = CompactBody(body)
+
+    assert compact.body() == body
+    assert compact.body(5, 7) == dict(body, optimalSlots=body["optimalSlots"][5:7])
+    assert compact.columns[1][0] is compact.columns[1][39]
+    assert compact.size < len(dumps(body))
+
+
+@pytest.mark.parametrize("parameters, error", [
+    ({"limit": "0"}, INVALID_LIMIT_ERROR),
+    ({"limit": "1001"}, INVALID_LIMIT_ERROR),
+    ({"limit": "ten"}, INVALID_LIMIT_ERROR),
+    ({"cursor": "not a cursor"}, INVALID_CURSOR_ERROR),
+    ({"cursor": encode_cursor(10, 10, "0" * 64)}, INVALID_CURSOR_ERROR),
+])
+def test_invalid_pages(parameters, error):
+    """Should return 400 for invalid limits and cursors of other requests"""
+
+    assert call_page(parameters) == (400, {"error": error})
+
+
+def test_errors_are_not_paged():
+    """Should return validation errors as they are"""
+
+    assert call_page({"limit": "10"}, json.dumps({"participants": []})) == (400, {"error": meeting.INVALID_MEETING_NAME_ERROR})
+
+
+@pytest.mark.parametrize("chunk_slots", [1, 3, 500])
+def test_json_chunks_join_to_the_body(chunk_slots):
+    """Should yield pieces that join to the encoded body"""
+
+    body = call_page(None)[1]
+    chunks = list(iter_json_chunks(body, chunk_slots))
+
+    assert "".join(chunks) == dumps(body)
+    assert "".join(iter_json_chunks(CompactBody(body), chunk_slots)) == dumps(body)
+    assert len(chunks) == -(-40 // chunk_slots) + 1
+    assert "".join(iter_json_chunks(dict(body, optimalSlots=[]))) == dumps(dict(body, optimalSlots=[]))
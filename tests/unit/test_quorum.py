@@ -0,0 +1,99 @@
+import pytest
+
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import (
+    INVALID_QUORUM_ERROR, QUORUM_NOT_SUPPORTED_ERROR, UNKNOWN_QUORUM_PARTICIPANT_ERROR
+)
+from optimal_time_slot_lambda.src.slot_optimizer.quorum import find_quorum_slots, parse_quorum
+from tests.helpers import call_handler
+
+PARTICIPANTS = [
+    {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00", "2024-06-10T11:00"]},
+    {"name": "Bob", "preferredSlots": ["2024-06-10T10:00", "2024-06-10T11:00"]},
+    {"name": "Carol", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T11:00"]},
+    {"name": "Dan", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T11:00"]},
+    {"name": "Eve", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]}
+]
+
+
+def test_find_quorum_slots():
+    """Should keep slots of all required participants and count only the others there"""
+
+    encoded_participants = [("A", [1, 2, 3]), ("B", [2, 3]), ("C", [1, 3]), ("D", [3, 4]), ("E", [2])]
+
+    assert find_quorum_slots(encoded_participants, [0, 1]) == [(3, 2), (2, 1)]
+    assert find_quorum_slots(encoded_participants, [0, 1], min_others=2) == [(3, 2)]
+    assert find_quorum_slots(encoded_participants, [1, 2, 4]) == []
+
+
+def test_others_are_only_counted_on_candidates():
+    """Should not look at slots outside the required participants' intersection"""
+
+    class CountingSlots(list):
+        iterated = 0
+
+        def __iter__(self):
+            CountingSlots.iterated += 1
+            return super().__iter__()
+
+    encoded_participants = [("A", [1]), ("B", [2])] + [(str(i), CountingSlots(range(1000))) for i in range(10)]
+
+    assert find_quorum_slots(encoded_participants, [0, 1]) == []
+    assert CountingSlots.iterated == 0
+
+
+@pytest.mark.parametrize("quorum", [
+    None, [], {"required": []}, {"required": "Alice"}, {"required": [" "]},
+    {"required": ["Alice"], "minOthers": -1}, {"required": ["Alice"], "minOthers": True}
+])
+def test_invalid_quorums(quorum):
+    """Should reject malformed quorum options"""
+
+    with pytest.raises(ValueError):
+        parse_quorum(quorum)
+
+
+def test_quorum_meeting():
+    """Should return quorumSlots next to the optimal slots"""
+
+    status_code, body = call_handler({
+        "meetingName": "Review",
+        "participants": PARTICIPANTS,
+        "quorum": {"required": ["Alice", "Bob"], "minOthers": 1}
+    })
+
+    assert status_code == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T09:00", "participants": ["Alice", "Carol", "Dan", "Eve"]},
+                                    {"slot": "2024-06-10T11:00", "participants": ["Alice", "Bob", "Carol", "Dan"]}]
+    assert body["quorumSlots"] == [
+        {"slot": "2024-06-10T11:00", "participants": ["Alice", "Bob", "Carol", "Dan"], "others": 2},
+        {"slot": "2024-06-10T10:00", "participants": ["Alice", "Bob", "Eve"], "others": 1}
+    ]
+
+
+def test_quorum_response_formats():
+    """Should label quorum slots like the rest of the response"""
+
+    status_code, body = call_handler({
+        "meetingName": "Review",
+        "participants": PARTICIPANTS,
+        "quorum": {"required": ["Bob"], "minOthers": 3},
+        "responseFormat": "counts"
+    })
+
+    assert status_code == 200
+    assert body["quorumSlots"] == [{"slot": "2024-06-10T11:00", "count": 4, "others": 3}]
+
+
+def test_quorum_errors():
+    """Should return 400 for unknown names and unsupported request types"""
+
+    assert call_handler({"meetingName": "Review", "participants": PARTICIPANTS, "quorum": {"required": ["Zoe"]}}) == (
+        400, {"error": UNKNOWN_QUORUM_PARTICIPANT_ERROR.format("Zoe")}
+    )
+    assert call_handler({"meetingName": "Review", "participants": PARTICIPANTS, "quorum": {"minOthers": 1}}) == (
+        400, {"error": INVALID_QUORUM_ERROR}
+    )
+    weighted = [dict(PARTICIPANTS[0], weight=2)] + PARTICIPANTS[1:]
+    assert call_handler({"meetingName": "Review", "participants": weighted, "quorum": {"required": ["Alice"]}}) == (
+        400, {"error": QUORUM_NOT_SUPPORTED_ERROR}
+    )
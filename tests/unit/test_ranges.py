@@ -0,0 +1,172 @@
+import json
+import random
+import pytest
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import stream
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import INVALID_DURATION_ERROR, TOP_K_WITH_RANGES_ERROR
+from optimal_time_slot_lambda.src.slot_optimizer.ranges import find_optimal_starts, find_optimal_windows
+from tests.helpers import call_handler
+
+
+def test_preferred_ranges_max_overlap_window():
+    """Should return the window where most participants' ranges overlap"""
+
+    status, body = call_handler({
+        "meetingName": "Planning",
+        "participants": [
+            {"name": "Alice", "preferredRanges": [{"start": "2024-06-10T09:00", "end": "2024-06-10T12:00"}]},
+            {"name": "Bob", "preferredRanges": [{"start": "2024-06-10T10:30", "end": "2024-06-10T17:00"}]},
+            {"name": "Carol", "preferredRanges": [{"start": "2024-06-10T11:00", "end": "2024-06-10T11:30"}]}
+        ]
+    })
+
+    assert status == 200
+    assert body["maxParticipants"] == 3
+    assert body["optimalSlots"] == [
+        {"slot": "2024-06-10T11:00", "end": "2024-06-10T11:30", "participants": ["Alice", "Bob", "Carol"]}
+    ]
+
+
+def test_ranges_snap_to_granularity_and_mix_with_slots():
+    """Should shrink ranges to the granularity grid and treat slots as one grid cell"""
+
+    status, body = call_handler({
+        "meetingName": "Planning",
+        "granularityMinutes": 60,
+        "participants": [
+            {"name": "Alice", "preferredRanges": [{"start": "2024-06-10T08:30", "end": "2024-06-10T11:15"}]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T08:45", "2024-06-10T10:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["maxParticipants"] == 2
+    assert body["optimalSlots"] == [
+        {"slot": "2024-06-10T10:00", "end": "2024-06-10T11:00", "participants": ["Alice", "Bob"]}
+    ]
+
+
+def test_windows_split_when_attendees_change():
+    """Should report separate windows when a different set of people is present"""
+
+    participants = [
+        ("Alice", [], [(0, 120)]),
+        ("Bob", [], [(0, 60)]),
+        ("Carol", [], [(60, 120)]),
+        ("Dave", [], [(0, 30), (30, 60)])
+    ]
+    max_participants, windows = find_optimal_windows(participants, granularity=30)
+
+    assert max_participants == 3
+    assert windows == [(0, 60, ["Alice", "Bob", "Dave"])]
+
+
+@pytest.mark.parametrize("participant, error", [
+    ({"name": "Alice", "preferredRanges": "all week"},
+     "Participant 'Alice' has an invalid field: preferredRanges (must be a list)"),
+    ({"name": "Alice", "preferredRanges": [{"start": "2024-06-10T10:00", "end": "2024-06-10T09:00"}]},
+     "Preferred range '{'start': '2024-06-10T10:00', 'end': '2024-06-10T09:00'}' for participant 'Alice' "
+     "must have a start before its end, both in format YYYY-MM-DDTHH:MM"),
+    ({"name": "Alice", "preferredRanges": []},
+     "Participant 'Alice' has a missing or invalid required field: preferredSlots (must be a non-empty list)"),
+])
+def test_invalid_preferred_ranges(participant, error):
+    """Should return 400 for invalid preferredRanges"""
+
+    status, body = call_handler({"meetingName": "Planning", "participants": [participant]})
+
+    assert status == 400
+    assert body["error"] == error
+
+
+@pytest.mark.parametrize("granularity", [0, -15, 1441, 7.5, "30", True])
+def test_invalid_granularity(granularity):
+    """Should return 400 if granularityMinutes is not an integer between 1 and 1440"""
+
+    status, body = call_handler({
+        "meetingName": "Planning",
+        "granularityMinutes": granularity,
+        "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]
+    })
+
+    assert status == 400
+    assert body["error"] == "Invalid field: granularityMinutes (must be an integer between 1 and 1440)"
+
+
+def test_streamed_range_request_falls_back(monkeypatch):
+    """Should give the same answer for range requests large enough to be streamed"""
+
+    event = {"body": json.dumps({
+        "meetingName": "Planning",
+        "participants": [
+            {"name": "Alice", "preferredRanges": [{"start": "2024-06-10T09:00", "end": "2024-06-10T12:00"}]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })}
+    expected = lambda_handler(event, None)
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+
+    assert lambda_handler(event, None) == expected
+    assert json.loads(expected["body"])["optimalSlots"][0]["slot"] == "2024-06-10T10:00"
+
+
+def test_duration_needs_consecutive_slots():
+    """Should only count participants who are free for every cell of the meeting"""
+
+    status, body = call_handler({
+        "meetingName": "Workshop",
+        "durationMinutes": 90,
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T09:30", "2024-06-10T10:00", "2024-06-10T10:30"]},
+            {"name": "Bob", "preferredRanges": [{"start": "2024-06-10T09:30", "end": "2024-06-10T12:00"}]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T09:30", "2024-06-10T10:30"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["maxParticipants"] == 2
+    assert body["optimalSlots"] == [
+        {"slot": "2024-06-10T09:30", "end": "2024-06-10T11:00", "participants": ["Alice", "Bob"]}
+    ]
+
+
+def test_optimal_starts_match_brute_force():
+    """Should find the same starts as checking every start cell by cell"""
+
+    rng = random.Random(0)
+    participants = [(f"P{i}", sorted(rng.sample(range(0, 1200, 30), 25)), []) for i in range(12)]
+    for duration in (30, 60, 120):
+        def free(slots, start):
+            return all(cell in slots for cell in range(start, start + duration, 30))
+
+        counts = {start: [name for name, slots, _ in participants if free(slots, start)] for start in range(0, 1200, 30)}
+        best = max(len(names) for names in counts.values())
+        expected = [(start, start + duration, names) for start, names in counts.items() if len(names) == best]
+
+        assert find_optimal_starts(participants, 30, duration) == (best, expected)
+
+
+@pytest.mark.parametrize("duration", [0, 45, 1470, "60", True])
+def test_invalid_duration(duration):
+    """Should return 400 if durationMinutes is not a whole number of grid cells up to a day"""
+
+    status, body = call_handler({
+        "meetingName": "Workshop",
+        "durationMinutes": duration,
+        "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]
+    })
+
+    assert (status, body) == (400, {"error": INVALID_DURATION_ERROR})
+
+
+def test_duration_rejects_top_k():
+    """Should return 400 when durationMinutes is combined with topK"""
+
+    status, body = call_handler({
+        "meetingName": "Workshop",
+        "durationMinutes": 60,
+        "topK": 3,
+        "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]
+    })
+
+    assert (status, body) == (400, {"error": TOP_K_WITH_RANGES_ERROR})
@@ -0,0 +1,87 @@
+import json
+import random
+import pytest
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import stream
+from optimal_time_slot_lambda.src.slot_optimizer.ranking import select_top_slots
+from tests.helpers import call_handler
+
+
+def test_top_k_ranked_slots():
+    """Should return the K best slots by attendee count, earlier slots first on ties"""
+
+    status, body = call_handler({
+        "meetingName": "Design Sync",
+        "topK": 3,
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T13:00", "2024-06-10T10:00", "2024-06-10T09:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00", "2024-06-10T13:00"]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T10:00", "2024-06-10T11:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["maxParticipants"] == 3
+    assert body["rankedSlots"] == [
+        {"slot": "2024-06-10T10:00", "participants": ["Alice", "Bob", "Carol"]},
+        {"slot": "2024-06-10T13:00", "participants": ["Alice", "Bob"]},
+        {"slot": "2024-06-10T09:00", "participants": ["Alice"]}
+    ]
+
+
+def test_top_k_without_overlap():
+    """Should still rank single-attendee slots when nothing overlaps"""
+
+    status, body = call_handler({
+        "meetingName": "Design Sync",
+        "topK": 5,
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T08:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["optimalSlots"] == []
+    assert [ranked["slot"] for ranked in body["rankedSlots"]] == ["2024-06-10T08:00", "2024-06-10T09:00"]
+
+
+def test_select_top_slots_matches_full_sort():
+    """Should pick the same slots as sorting everything"""
+
+    rng = random.Random(7)
+    counts = {rng.randrange(100_000) * 15: rng.randrange(20) for _ in range(5000)}
+    expected = [slot for slot, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:10]]
+
+    assert select_top_slots(counts, 10) == expected
+
+
+@pytest.mark.parametrize("top_k", [0, 1001, "3", 2.5, False])
+def test_invalid_top_k(top_k):
+    """Should return 400 if topK is not an integer between 1 and 1000"""
+
+    status, body = call_handler({
+        "meetingName": "Design Sync",
+        "topK": top_k,
+        "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]
+    })
+
+    assert status == 400
+    assert body["error"] == "Invalid field: topK (must be an integer between 1 and 1000)"
+
+
+def test_streamed_top_k_matches(monkeypatch):
+    """Should return the same ranked slots for streamed bodies"""
+
+    event = {"body": json.dumps({
+        "meetingName": "Design Sync",
+        "topK": 2,
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })}
+    expected = lambda_handler(event, None)
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+
+    assert lambda_handler(event, None) == expected
@@ -0,0 +1,159 @@
+import pytest
+
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import INVALID_HORIZON_ERROR
+from optimal_time_slot_lambda.src.slot_optimizer.recurrence import (
+    RecurringSlots, compile_exceptions, compile_weekly_patterns, parse_horizon
+)
+from optimal_time_slot_lambda.src.slot_optimizer.slots import decode_slot, encode_day, encode_slot
+from optimal_time_slot_lambda.src.slot_optimizer.timezones import encode_zoned_slot
+from tests.helpers import call_handler
+
+WEEKDAYS_9_TO_12 = [{"days": ["MO", "TU", "WE", "TH", "FR"], "start": "09:00", "end": "12:00"}]
+
+
+def expand(patterns, horizon, exceptions=None, explicit_slots=(), zone_name=None):
+    excluded_days, excluded_slots = compile_exceptions(exceptions)
+    return RecurringSlots(
+        list(explicit_slots), compile_weekly_patterns(patterns), excluded_days, excluded_slots,
+        parse_horizon(horizon), zone_name
+    )
+
+
+def test_weekly_pattern_expands_over_the_horizon():
+    """Should yield the pattern's slots on matching weekdays only"""
+
+    # 2024-07-05 is a Friday, 2024-07-08 the Monday after the weekend
+    slots = expand(WEEKDAYS_9_TO_12, {"start": "2024-07-05", "end": "2024-07-08"})
+
+    assert [decode_slot(slot) for slot in slots] == [
+        "2024-07-05T09:00", "2024-07-05T09:30", "2024-07-05T10:00", "2024-07-05T10:30", "2024-07-05T11:00", "2024-07-05T11:30",
+        "2024-07-08T09:00", "2024-07-08T09:30", "2024-07-08T10:00", "2024-07-08T10:30", "2024-07-08T11:00", "2024-07-08T11:30",
+    ]
+    assert len(slots) == 12
+
+
+def test_exceptions_and_explicit_slots():
+    """Should skip excluded days and slots, and not repeat explicit slots"""
+
+    explicit = [encode_slot("2024-07-06T15:00"), encode_slot("2024-07-08T09:00")]
+    slots = expand(
+        [{"days": ["FR", "MO"], "start": "09:00", "end": "10:00", "stepMinutes": 60}],
+        {"start": "2024-07-01", "end": "2024-07-12"},
+        exceptions=["2024-07-05", "2024-07-12T09:00"],
+        explicit_slots=explicit
+    )
+
+    assert [decode_slot(slot) for slot in slots] == ["2024-07-06T15:00", "2024-07-08T09:00", "2024-07-01T09:00"]
+
+
+def test_patterns_follow_the_time_zone():
+    """Should convert local pattern times to UTC, including across a DST change"""
+
+    slots = list(expand(
+        [{"days": ["SU"], "start": "01:00", "end": "04:00", "stepMinutes": 60}],
+        {"start": "2024-03-24", "end": "2024-03-31"}, zone_name="Europe/Berlin"
+    ))
+
+    expected = [
+        encode_zoned_slot(slot, "Europe/Berlin")
+        for slot in ("2024-03-24T01:00", "2024-03-24T02:00", "2024-03-24T03:00", "2024-03-31T01:00", "2024-03-31T03:00")
+    ]
+    # 02:00 does not exist on 2024-03-31 and maps to the same instant as 03:00
+    assert slots == expected
+
+
+def test_expansion_is_lazy():
+    """Should not build the slot list when the object is created"""
+
+    slots = expand(WEEKDAYS_9_TO_12, {"start": "2024-01-01", "end": "2024-12-31"})
+    iterator = iter(slots)
+
+    assert decode_slot(next(iterator)) == "2024-01-01T09:00"
+    assert len(slots) == 262 * 6
+    assert sum(1 for _ in slots) == 262 * 6
+
+
+@pytest.mark.parametrize("patterns", [
+    [],
+    [{"days": ["MO"], "start": "09:00"}],
+    [{"days": ["XX"], "start": "09:00", "end": "10:00"}],
+    [{"days": ["MO"], "start": "10:00", "end": "09:00"}],
+    [{"days": ["MO"], "start": "9:00", "end": "10:00"}],
+    [{"days": ["MO"], "start": "09:00", "end": "10:00", "stepMinutes": 0}],
+    [{"days": "MO", "start": "09:00", "end": "10:00"}],
+])
+def test_invalid_patterns(patterns):
+    """Should reject malformed weekly patterns"""
+
+    with pytest.raises(ValueError):
+        compile_weekly_patterns(patterns)
+
+
+def test_horizon_limits():
+    """Should accept up to 366 days and reject reversed or longer horizons"""
+
+    assert parse_horizon({"start": "2024-01-01", "end": "2024-12-31"}) == (encode_day("2024-01-01"), encode_day("2024-12-31"))
+    for horizon in ({"start": "2024-01-02", "end": "2024-01-01"}, {"start": "2024-01-01", "end": "2025-01-01"}, {"start": "2024-01-01"}):
+        with pytest.raises(ValueError):
+            parse_horizon(horizon)
+
+
+def test_recurring_meeting():
+    """Should find common slots between recurring and explicit availability"""
+
+    status_code, body = call_handler({
+        "meetingName": "Quarterly sync",
+        "horizon": {"start": "2024-07-01", "end": "2024-09-30"},
+        "participants": [
+            {"name": "Alice", "recurringSlots": WEEKDAYS_9_TO_12, "exceptions": ["2024-07-02"]},
+            {"name": "Bob", "recurringSlots": [{"days": ["TU"], "start": "11:00", "end": "13:00", "stepMinutes": 60}]},
+            {"name": "Carol", "preferredSlots": ["2024-07-02T11:00", "2024-07-09T11:00"]}
+        ]
+    })
+
+    assert status_code == 200
+    assert body["maxParticipants"] == 3
+    assert body["optimalSlots"] == [{"slot": "2024-07-09T11:00", "participants": ["Alice", "Bob", "Carol"]}]
+
+
+def test_recurring_ranges():
+    """Should expand recurring slots in range requests too"""
+
+    status_code, body = call_handler({
+        "meetingName": "Windows",
+        "horizon": {"start": "2024-07-01", "end": "2024-07-07"},
+        "granularityMinutes": 30,
+        "participants": [
+            {"name": "Alice", "recurringSlots": [{"days": ["WE"], "start": "09:00", "end": "11:00"}]},
+            {"name": "Bob", "preferredRanges": [{"start": "2024-07-03T10:00", "end": "2024-07-03T12:00"}]}
+        ]
+    })
+
+    assert status_code == 200
+    assert body["optimalSlots"] == [{"slot": "2024-07-03T10:00", "end": "2024-07-03T11:00", "participants": ["Alice", "Bob"]}]
+
+
+def test_recurring_slots_need_a_horizon():
+    """Should return 400 for recurring slots without a valid horizon"""
+
+    participants = [{"name": "Alice", "recurringSlots": WEEKDAYS_9_TO_12}]
+
+    assert call_handler({"meetingName": "Sync", "participants": participants}) == (
+        400, {"error": "Participant 'Alice' uses recurringSlots, which require a valid horizon"}
+    )
+    assert call_handler({"meetingName": "Sync", "horizon": {"start": "2024-07-01", "end": "2026-07-01"}, "participants": participants}) == (
+        400, {"error": INVALID_HORIZON_ERROR}
+    )
+
+
+def test_invalid_recurring_participant():
+    """Should name the participant with invalid recurringSlots or exceptions"""
+
+    horizon = {"start": "2024-07-01", "end": "2024-07-07"}
+    status_code, body = call_handler({
+        "meetingName": "Sync", "horizon": horizon,
+        "participants": [{"name": "Alice", "recurringSlots": WEEKDAYS_9_TO_12, "exceptions": ["July 4th"]}]
+    })
+
+    assert status_code == 400
+    assert body["error"].startswith("Participant 'Alice' has an invalid field: exceptions")
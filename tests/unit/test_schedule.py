@@ -0,0 +1,164 @@
+import itertools
+import random
+import time
+
+import pytest
+
+from optimal_time_slot_lambda.src.slot_optimizer.schedule import (
+    INVALID_CONFLICT_FREE_ERROR, INVALID_TIME_BUDGET_ERROR, ScheduleSolver, find_conflicts
+)
+from optimal_time_slot_lambda.src.slot_optimizer.slots import decode_slot, encode_slot
+from tests.helpers import call_handler
+
+BATCH_PATH = "/api/v1/meetings/optimize/batch"
+
+# Greedy puts Design first (fewer candidates) at 09:00, the optimum moves it to 10:00 for Retro
+MEETINGS = [
+    {
+        "meetingName": "Design",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+            {"name": "Dan", "preferredSlots": ["2024-06-10T09:00"]}
+        ]
+    },
+    {
+        "meetingName": "Retro",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T11:00"]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T12:00"]},
+            {"name": "Erin", "preferredSlots": ["2024-06-10T09:00"]}
+        ]
+    }
+]
+
+
+def candidates_of(meetings):
+    candidates = []
+    for meeting in meetings:
+        counts = {}
+        for participant in meeting["participants"]:
+            for slot in participant["preferredSlots"]:
+                offset = encode_slot(slot)
+                counts[offset] = counts.get(offset, 0) + 1
+        candidates.append(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+    return candidates
+
+
+def random_meetings(count, seed=0):
+    rng = random.Random(seed)
+    people = [f"P{i}" for i in range(150)]
+    base = encode_slot("2024-06-10T09:00")
+    return [
+        {
+            "meetingName": f"M{index}",
+            "participants": [
+                {"name": name, "preferredSlots": [decode_slot(base + 30 * offset) for offset in rng.sample(range(80), 12)]}
+                for name in rng.sample(people, rng.randint(2, 8))
+            ]
+        }
+        for index in range(count)
+    ]
+
+
+def test_local_search_improves_on_greedy():
+    """Should move a meeting off its best slot when that lets another one reach more people"""
+
+    status_code, body = call_handler({"conflictFree": True, "meetings": MEETINGS}, BATCH_PATH)
+
+    assert status_code == 200
+    assert body["schedule"] == [
+        {"meetingName": "Design", "slot": "2024-06-10T10:00", "participants": ["Alice", "Bob"]},
+        {"meetingName": "Retro", "slot": "2024-06-10T09:00", "participants": ["Alice", "Carol", "Erin"]}
+    ]
+    assert body["totalAttendance"] == 5
+    assert body["upperBound"] == 6
+    assert body["optimal"] is True
+
+
+def test_expired_budget_returns_greedy_schedule():
+    """Should return the greedy schedule and False when no time is left"""
+
+    solver = ScheduleSolver(candidates_of(MEETINGS), find_conflicts([{"Alice", "Bob", "Dan"}, {"Alice", "Carol", "Erin"}]))
+
+    assert solver.solve(deadline=0) is False
+    assert solver.total == 4
+    assert solver.assigned == [encode_slot("2024-06-10T09:00"), encode_slot("2024-06-10T11:00")]
+
+
+def brute_force_total(candidates, conflicts):
+    best = 0
+    for slots in itertools.product(*[[None] + [slot for slot, _ in options] for options in candidates]):
+        if all(
+            slots[meeting] is None or slots[other] != slots[meeting]
+            for meeting in range(len(slots)) for other in conflicts[meeting]
+        ):
+            best = max(best, sum(dict(options).get(slot, 0) for options, slot in zip(candidates, slots)))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_small_schedules_are_optimal(seed):
+    """Should find the best schedule of small instances, where local search alone can stop short"""
+
+    rng = random.Random(seed)
+    people = ["Alice", "Bob", "Carol", "Dan", "Erin"]
+    names = [set(rng.sample(people, rng.randint(1, 3))) for _ in range(5)]
+    candidates = [
+        sorted(((slot, rng.randint(1, 4)) for slot in rng.sample(range(4), rng.randint(1, 3))), key=lambda item: (-item[1], item[0]))
+        for _ in names
+    ]
+    conflicts = find_conflicts(names)
+    solver = ScheduleSolver(candidates, conflicts)
+
+    assert solver.solve() is True
+    assert solver.total == brute_force_total(candidates, conflicts)
+    for meeting, slot in enumerate(solver.assigned):
+        assert slot is None or all(solver.assigned[other] != slot for other in conflicts[meeting])
+
+
+def test_large_schedule_has_no_conflicts():
+    """Should schedule 200 meetings within the budget without double-booking anyone"""
+
+    meetings = random_meetings(200)
+    started = time.perf_counter()
+    status_code, body = call_handler({"conflictFree": True, "timeBudgetMs": 1000, "meetings": meetings}, BATCH_PATH)
+
+    assert status_code == 200
+    assert time.perf_counter() - started < 5
+    booked = set()
+    for meeting, scheduled in zip(meetings, body["schedule"]):
+        assert scheduled["slot"] is not None
+        for participant in meeting["participants"]:
+            assert (participant["name"], scheduled["slot"]) not in booked
+            booked.add((participant["name"], scheduled["slot"]))
+    assert body["totalAttendance"] == sum(len(scheduled["participants"]) for scheduled in body["schedule"])
+    assert body["totalAttendance"] <= body["upperBound"]
+
+
+def test_unschedulable_meeting_stays_empty():
+    """Should leave a meeting without a slot when every slot is taken by a conflicting one"""
+
+    meetings = [
+        {"meetingName": "A", "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]},
+        {"meetingName": "B", "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]}
+    ]
+    status_code, body = call_handler({"conflictFree": True, "meetings": meetings}, BATCH_PATH)
+
+    assert status_code == 200
+    assert body["schedule"][0]["slot"] == "2024-06-10T09:00"
+    assert body["schedule"][1] == {
+        "meetingName": "B", "slot": None, "participants": [], "message": "No slot without a conflict found for this meeting"
+    }
+
+
+@pytest.mark.parametrize("body, error", [
+    ({"conflictFree": "yes", "meetings": MEETINGS}, INVALID_CONFLICT_FREE_ERROR),
+    ({"conflictFree": True, "timeBudgetMs": 0, "meetings": MEETINGS}, INVALID_TIME_BUDGET_ERROR),
+    ({"conflictFree": True, "meetings": [MEETINGS[0], {"meetingName": "", "participants": []}]},
+     "Meeting 1: Missing or invalid required field: meetingName (must be a non-empty string)"),
+])
+def test_schedule_errors(body, error):
+    """Should return 400 for invalid options and meetings"""
+
+    assert call_handler(body, BATCH_PATH) == (400, {"error": error})
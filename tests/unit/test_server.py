@@ -0,0 +1,143 @@
+import asyncio
+import gzip
+import json
+
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.server import OptimizerServer, build_event
+
+BODY = json.dumps({
+    "meetingName": "Design Sync",
+    "participants": [
+        {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+        {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]}
+    ]
+})
+
+
+def request(method, path, body=b"", headers=()):
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def read_response(reader):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    headers = dict(line.split(": ", 1) for line in head[1:] if line)
+    body = await reader.readexactly(int(headers["Content-Length"]))
+    return status, headers, body
+
+
+def exchange(requests, **options):
+    # Sends every request over one connection and returns the responses
+    async def run():
+        server = OptimizerServer(**options)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for raw_request in requests:
+                writer.write(raw_request)
+                responses.append(await read_response(reader))
+            writer.close()
+            return responses
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_responses_match_the_lambda_handler():
+    """Should return exactly the body and headers of the Lambda path"""
+
+    expected = lambda_handler({"body": BODY}, None)
+    [(status, headers, body)] = exchange([request("POST", "/api/v1/meetings/optimize", BODY.encode())], workers=0)
+
+    assert status == expected["statusCode"]
+    assert headers["Content-Type"] == expected["headers"]["Content-Type"]
+    assert body == expected["body"].encode("utf-8")
+
+
+def test_keep_alive_serves_several_requests_per_connection():
+    """Should answer several requests, including errors, on one connection"""
+
+    responses = exchange([
+        request("POST", "/api/v1/meetings/optimize", BODY.encode()),
+        request("POST", "/api/v1/meetings/optimize", b"{invalid"),
+        request("GET", "/api/v1/meetings/optimize"),
+        request("POST", "/unknown", BODY.encode())
+    ], workers=0)
+
+    assert [status for status, _, _ in responses] == [200, 400, 405, 404]
+    assert all(headers["Connection"] == "keep-alive" for _, headers, _ in responses)
+
+
+def test_requests_run_in_worker_processes():
+    """Should give the same response when the request is handled by a worker process"""
+
+    expected = lambda_handler({"body": BODY}, None)
+    [(status, _, body)] = exchange([request("POST", "/api/v1/meetings/optimize", BODY.encode())], workers=1)
+
+    assert status == 200
+    assert body == expected["body"].encode("utf-8")
+
+
+def test_gzip_bodies_and_responses():
+    """Should accept gzip request bodies and send compressed responses as bytes"""
+
+    large_body = json.dumps({
+        "meetingName": "All Hands",
+        "participants": [{"name": f"Person {index}", "preferredSlots": ["2024-06-10T09:00"]} for index in range(100)]
+    })
+    expected = lambda_handler({"body": large_body}, None)
+    raw_request = request(
+        "POST", "/api/v1/meetings/optimize", gzip.compress(large_body.encode()),
+        ["Content-Encoding: gzip", "Accept-Encoding: gzip"]
+    )
+    [(status, headers, body)] = exchange([raw_request], workers=0)
+
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == expected["body"].encode("utf-8")
+
+
+def test_build_event_query_parameters():
+    """Should pass query parameters like API Gateway"""
+
+    event = build_event("GET", "/api/v1/meetings/sessions/abc?limit=1&limit=2", {}, b"")
+
+    assert event["path"] == "/api/v1/meetings/sessions/abc"
+    assert event["queryStringParameters"] == {"limit": "2"}
+    assert event["multiValueQueryStringParameters"] == {"limit": ["1", "2"]}
+    assert event["body"] is None
+
+
+def test_streamed_responses_are_chunked():
+    """Should send ?stream=true responses chunked, with the body of the Lambda path"""
+
+    async def run():
+        server = OptimizerServer(workers=0)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request("POST", "/api/v1/meetings/optimize?stream=true", BODY.encode()))
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            chunks = []
+            while True:
+                size = int(await reader.readuntil(b"\r\n"), 16)
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+                if size == 0:
+                    break
+            writer.close()
+            return head, b"".join(chunks)
+        finally:
+            await server.close()
+
+    expected = lambda_handler({"body": BODY}, None)
+    head, body = asyncio.run(run())
+
+    assert head[0] == "HTTP/1.1 200 OK"
+    assert "Transfer-Encoding: chunked" in head
+    assert body == expected["body"].encode("utf-8")
@@ -0,0 +1,113 @@
+import json
+import random
+import pytest
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer.sessions import InMemorySessionStore, SessionStore, SQLiteSessionStore
+
+SESSIONS_PATH = "/api/v1/meetings/sessions"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sessions.sqlite"))
+
+
+def recompute(participants):
+    # Reference result built from scratch
+    counts = {}
+    for slots in participants.values():
+        for slot in slots:
+            counts[slot] = counts.get(slot, 0) + 1
+    max_count = max(counts.values(), default=0)
+    return max_count, sorted(slot for slot, count in counts.items() if count == max_count)
+
+
+def test_incremental_updates_match_recompute(store):
+    """Should keep the same max and optimal slots as a full recompute after every change"""
+
+    rng = random.Random(3)
+    session_id = store.create("All Hands")
+    participants = {}
+    for _ in range(300):
+        name = f"P{rng.randrange(20)}"
+        if participants.get(name) and rng.random() < 0.3:
+            assert store.remove_participant(session_id, name)
+            del participants[name]
+        else:
+            participants[name] = {rng.randrange(15) * 30 for _ in range(rng.randrange(1, 6))}
+            store.set_participant(session_id, name, list(participants[name]))
+
+        max_participants, optimal_slots = store.result(session_id)
+        assert (max_participants, [slot for slot, _ in optimal_slots]) == recompute(participants)
+        for slot, names in optimal_slots:
+            assert sorted(names) == sorted(name for name, slots in participants.items() if slot in slots)
+
+
+def test_remove_unknown_participant(store):
+    """Should report that a participant who is not in the session was not removed"""
+
+    session_id = store.create("All Hands")
+
+    assert store.remove_participant(session_id, "Nobody") is False
+
+
+def call_session(method, path, body=None):
+    event = {"httpMethod": method, "path": path, "body": json.dumps(body) if body is not None else None}
+    response = lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_session_api_flow(monkeypatch):
+    """Should create a session, add, update and remove participants and return the optimal slots"""
+
+    monkeypatch.setattr(optimal_time_slot_lambda, "SESSION_STORE", InMemorySessionStore())
+
+    status, body = call_session("POST", SESSIONS_PATH, {"meetingName": "Design Sync"})
+    assert status == 201
+    session_path = f"{SESSIONS_PATH}/{body['sessionId']}"
+
+    call_session("POST", f"{session_path}/participants", {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]})
+    status, body = call_session("POST", f"{session_path}/participants", {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]})
+    assert status == 200
+    assert body["maxParticipants"] == 2
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T10:00", "participants": ["Alice", "Bob"]}]
+
+    status, body = call_session("POST", f"{session_path}/participants", {"name": "Bob", "preferredSlots": ["2024-06-10T09:00"]})
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T09:00", "participants": ["Alice", "Bob"]}]
+
+    status, body = call_session("DELETE", f"{session_path}/participants/Bob")
+    assert status == 200
+    assert body["maxParticipants"] == 1
+    assert body["message"] == "No overlapping time slots found between participants"
+
+    status, body = call_session("GET", session_path)
+    assert status == 200
+    assert body["meetingName"] == "Design Sync"
+
+
+@pytest.mark.parametrize("method, path, body, status, error", [
+    ("GET", f"{SESSIONS_PATH}/missing", None, 404, "Session not found"),
+    ("POST", SESSIONS_PATH, {"meetingName": " "}, 400,
+     "Missing or invalid required field: meetingName (must be a non-empty string)"),
+    ("GET", SESSIONS_PATH, None, 405, "Method not allowed"),
+])
+def test_session_api_errors(monkeypatch, method, path, body, status, error):
+    """Should return errors for unknown sessions, invalid input and wrong methods"""
+
+    monkeypatch.setattr(optimal_time_slot_lambda, "SESSION_STORE", InMemorySessionStore())
+
+    assert call_session(method, path, body) == (status, {"error": error})
+
+
+def test_session_store_is_abstract():
+    """Should not create stores that miss part of the interface"""
+
+    class PartialStore(SessionStore):
+        def create(self, meeting_name):
+            return "id"
+
+    with pytest.raises(TypeError):
+        PartialStore()
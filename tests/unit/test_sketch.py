@@ -0,0 +1,117 @@
+import random
+from collections import Counter
+
+from optimal_time_slot_lambda.src import optimal_time_slot_lambda
+from optimal_time_slot_lambda.src.slot_optimizer import stream
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import APPROXIMATE_NOT_SUPPORTED_ERROR, INVALID_APPROXIMATE_ERROR
+from optimal_time_slot_lambda.src.slot_optimizer.sketch import SlotSketch
+from optimal_time_slot_lambda.src.slot_optimizer.slots import decode_slot
+from tests.helpers import call_handler
+
+
+def random_participants(count=300, seed=0):
+    # Two popular slots on top of random noise
+    rng = random.Random(seed)
+    participants = []
+    for index in range(count):
+        offsets = set(rng.sample(range(5000), 10))
+        if index % 2 == 0:
+            offsets.add(100)
+        if index % 3 == 0:
+            offsets.add(200)
+        participants.append({"name": f"p{index}", "preferredSlots": [decode_slot(28633500 + 30 * offset) for offset in offsets]})
+    return participants
+
+
+def test_estimates_never_undercount():
+    """Should overestimate by at most the error bound and never underestimate"""
+
+    rng = random.Random(1)
+    sketch = SlotSketch(width=256, depth=4, capacity=16)
+    true_counts = Counter()
+    for _ in range(200):
+        slots = rng.sample(range(2000), 20)
+        true_counts.update(slots)
+        sketch.update(slots)
+
+    assert sketch.entries == 4000
+    for slot, estimate in sketch.candidates.items():
+        assert true_counts[slot] <= estimate <= true_counts[slot] + sketch.error_bound()
+
+
+def test_uncounted_slots_stay_below_the_threshold():
+    """Should keep every slot above the threshold as a candidate"""
+
+    rng = random.Random(2)
+    sketch = SlotSketch(width=512, depth=4, capacity=8)
+    true_counts = Counter()
+    for _ in range(300):
+        slots = rng.sample(range(1000), 10) + ([7] if rng.random() < 0.5 else [])
+        true_counts.update(set(slots))
+        sketch.update(set(slots))
+
+    assert len(sketch.candidates) == 8
+    assert 7 in sketch.candidates
+    assert all(count <= sketch.threshold() for slot, count in true_counts.items() if slot not in sketch.candidates)
+
+
+def test_small_requests_keep_every_slot():
+    """Should not evict anything while there is room for every slot"""
+
+    sketch = SlotSketch()
+    sketch.update([3, 1, 2])
+    sketch.update([2])
+
+    assert sketch.candidate_slots() == [1, 2, 3]
+    assert sketch.threshold() == 0
+
+
+def test_approximate_meeting_matches_exact():
+    """Should return the exact optimal slots with recounted participants"""
+
+    participants = random_participants()
+    exact = call_handler({"meetingName": "All hands", "participants": participants, "topK": 2})[1]
+    status_code, body = call_handler({"meetingName": "All hands", "participants": participants, "topK": 2, "approximate": True})
+
+    assert status_code == 200
+    assert body["optimalSlots"] == exact["optimalSlots"]
+    assert body["rankedSlots"] == exact["rankedSlots"]
+    assert body["approximation"]["exact"] is True
+
+
+def test_streamed_approximate_meeting(monkeypatch):
+    """Should count streamed participants in the sketch when approximate comes first"""
+
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+    participants = random_participants()
+    exact = call_handler({"meetingName": "All hands", "participants": participants})[1]
+    status_code, body = call_handler({"approximate": True, "meetingName": "All hands", "participants": participants})
+
+    assert status_code == 200
+    assert body["optimalSlots"] == exact["optimalSlots"]
+    assert "approximation" in body
+
+
+def test_streamed_approximate_after_participants(monkeypatch):
+    """Should return the same response whether approximate comes before or after the participants"""
+
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+    participants = random_participants()
+    before = call_handler({"approximate": True, "meetingName": "All hands", "participants": participants, "topK": 2})
+    # Both orders share a cache key, the second request must not be a cache hit
+    optimal_time_slot_lambda.RESULT_CACHE.clear()
+    after = call_handler({"meetingName": "All hands", "participants": participants, "topK": 2, "approximate": True})
+
+    assert after == before
+    assert "approximation" in after[1]
+
+
+def test_approximate_errors():
+    """Should return 400 for non-boolean flags and unsupported request types"""
+
+    participants = random_participants(count=3)
+
+    assert call_handler({"meetingName": "m", "participants": participants, "approximate": "yes"}) == (400, {"error": INVALID_APPROXIMATE_ERROR})
+    assert call_handler({"meetingName": "m", "participants": participants, "approximate": True, "quorum": {"required": ["p0"]}}) == (
+        400, {"error": APPROXIMATE_NOT_SUPPORTED_ERROR}
+    )
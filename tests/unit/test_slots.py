@@ -0,0 +1,39 @@
+import pytest
+from optimal_time_slot_lambda.src.slot_optimizer.slots import encode_slot, decode_slot
+
+
+def test_encode_slot_minutes_since_epoch():
+    """Should convert a slot string into minutes since 1970-01-01T00:00"""
+
+    assert encode_slot("1970-01-01T00:00") == 0
+    assert encode_slot("1970-01-02T01:30") == 24 * 60 + 90
+    assert encode_slot("2024-06-10T10:00") - encode_slot("2024-06-10T09:00") == 60
+
+
+@pytest.mark.parametrize("slot", ["2024-06-10T09:00", "2024-02-29T23:59", "1969-12-31T00:15", "0001-01-01T00:00"])
+def test_decode_slot_round_trip(slot):
+    """Should rebuild the original slot string from its offset"""
+
+    assert decode_slot(encode_slot(slot)) == slot
+
+
+@pytest.mark.parametrize("slot", [
+    202406100900,
+    None,
+    "06-10-2024 09:00",
+    "2024-06-10 09:00",
+    "2024-6-10T9:00",
+    "2024-06-10T24:00",
+    "2024-06-10T09:60",
+    "2023-02-29T09:00",
+    "2024-13-01T09:00",
+    "0000-01-01T09:00",
+    "2024-06-10T+9:00",
+    "2024-06-10T09:00Z",
+    "２０24-06-10T09:00",
+])
+def test_encode_slot_rejects_invalid(slot):
+    """Should raise ValueError for anything that is not YYYY-MM-DDTHH:MM"""
+
+    with pytest.raises(ValueError):
+        encode_slot(slot)
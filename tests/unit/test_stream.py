@@ -0,0 +1,68 @@
+import json
+import random
+import pytest
+from optimal_time_slot_lambda.src.optimal_time_slot_lambda import lambda_handler
+from optimal_time_slot_lambda.src.slot_optimizer import stream
+from optimal_time_slot_lambda.src.slot_optimizer.stream import SlotCounter, stream_body
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    # Stream every object body regardless of its size
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+
+
+def make_body(seed, participant_count=50):
+    rng = random.Random(seed)
+    return {
+        "meetingName": "All Hands",
+        "participants": [
+            {"name": f"P{i}", "preferredSlots": [f"2024-06-10T{rng.randrange(9, 17):02d}:00" for _ in range(3)]}
+            for i in range(participant_count)
+        ]
+    }
+
+
+@pytest.mark.parametrize("raw_body", [
+    json.dumps(make_body(0)),
+    json.dumps(make_body(1), indent=2),
+    json.dumps({"participants": make_body(2)["participants"], "meetingName": "Late name"}),
+    json.dumps({"meetingName": "Design Sync", "participants": [{"name": "Alice", "preferredSlots": ["2024-06-10T09:00"]}]}),
+    json.dumps({"meetingName": "Design Sync", "participants": []}),
+    json.dumps({"meetingName": "Design Sync", "participants": "not a list"}),
+    json.dumps({"meetingName": " ", "participants": [{"name": ""}]}),
+    json.dumps({"meetingName": "Design Sync", "participants": [{"name": "Alice", "preferredSlots": ["bad"]}, {"name": ""}]}),
+    '{"meetingName": "Design Sync", "participants": [{"name": "Alice", "preferredSlots": ["bad"]}, {invalid}]}',
+    '{"meetingName": "Design Sync", "participants": [] } extra',
+    '{"meetingName": "Design Sync", "participants": [{"name": "A", "preferredSlots": ["2024-06-10T09:00"]}], '
+    '"participants": [{"name": "B", "preferredSlots": ["2024-06-10T10:00"]}, {"name": "C", "preferredSlots": ["2024-06-10T10:00"]}]}',
+    "{}",
+    " { } ",
+])
+def test_streaming_matches_json_loads(monkeypatch, raw_body):
+    """Should return exactly the same response as the json.loads path"""
+
+    expected = lambda_handler({"body": raw_body}, None)
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+    assert lambda_handler({"body": raw_body}, None) == expected
+
+
+def test_non_object_body_is_not_streamed(streaming):
+    """Should leave non-object bodies to json.loads"""
+
+    assert not stream.is_streamable("[]")
+    assert stream.is_streamable(" {}")
+
+
+def test_stream_body_hands_participants_to_aggregator():
+    """Should pass each participant to the aggregator and keep only counts"""
+
+    counter = SlotCounter()
+    body = make_body(3, participant_count=10)
+    members = stream_body(json.dumps(body), counter)
+
+    assert members["meetingName"] == "All Hands"
+    assert members["participants"] is stream.STREAMED
+    assert counter.participant_count == 10
+    # Repeated slots of one participant are counted once
+    assert sum(counter.counts.values()) == sum(len(set(p["preferredSlots"])) for p in body["participants"])
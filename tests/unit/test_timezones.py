@@ -0,0 +1,200 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from optimal_time_slot_lambda.src.slot_optimizer import stream
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import INVALID_TIME_ZONE_ERROR
+from optimal_time_slot_lambda.src.slot_optimizer.slots import encode_slot
+from optimal_time_slot_lambda.src.slot_optimizer.timezones import (
+    _local_day_offset, encode_zoned_slot, load_zone, local_utc_offset, parse_utc_offset, zoned_slot_formatter
+)
+from tests.helpers import call_handler
+
+BATCH_PATH = "/api/v1/meetings/optimize/batch"
+
+
+def test_encode_zoned_slot_matches_zoneinfo():
+    """Should give the same UTC minutes as zoneinfo, including around DST transitions"""
+
+    for zone_name in ("Europe/Berlin", "America/New_York", "Australia/Lord_Howe", "Asia/Kolkata"):
+        zone = load_zone(zone_name)
+        for slot in ("2024-01-15T09:00", "2024-03-10T01:30", "2024-03-31T03:00", "2024-10-27T02:30", "2024-11-03T01:30"):
+            local = datetime.strptime(slot, "%Y-%m-%dT%H:%M").replace(tzinfo=zone)
+            expected = (local - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(minutes=1)
+            assert encode_zoned_slot(slot, zone_name) == expected
+
+
+def test_offset_slots_ignore_the_zone():
+    """Should use the UTC offset written in the slot"""
+
+    utc = encode_slot("2024-06-10T07:00")
+
+    assert encode_zoned_slot("2024-06-10T09:00+02:00", "America/New_York") == utc
+    assert encode_zoned_slot("2024-06-10T07:00Z") == utc
+    assert encode_zoned_slot("2024-06-10T02:30-04:30") == utc
+
+
+@pytest.mark.parametrize("suffix", ["+2:00", "+0200", "02:00", "+24:00", "z"])
+def test_invalid_utc_offsets(suffix):
+    """Should reject malformed UTC offsets"""
+
+    with pytest.raises(ValueError):
+        parse_utc_offset(suffix)
+
+
+def test_day_offsets_are_cached():
+    """Should look offsets up once per zone and local day"""
+
+    local_utc_offset("Europe/Berlin", encode_slot("2024-06-10T09:00"))
+    hits = _local_day_offset.cache_info().hits
+    local_utc_offset("Europe/Berlin", encode_slot("2024-06-10T17:30"))
+
+    assert _local_day_offset.cache_info().hits == hits + 1
+
+
+def test_formatter_shows_the_meeting_zone():
+    """Should format UTC minutes in the given zone with its offset"""
+
+    utc = encode_slot("2024-06-10T07:00")
+
+    assert zoned_slot_formatter()(utc) == "2024-06-10T07:00Z"
+    assert zoned_slot_formatter("Europe/Berlin")(utc) == "2024-06-10T09:00+02:00"
+    assert zoned_slot_formatter("America/St_Johns")(utc) == "2024-06-10T04:30-02:30"
+
+
+def test_same_instant_in_different_zones_matches():
+    """Should match slots that are the same instant in different zones"""
+
+    status, body = call_handler({
+        "meetingName": "Global Sync",
+        "participants": [
+            {"name": "Ana", "timeZone": "Europe/Berlin", "preferredSlots": ["2024-06-10T16:00"]},
+            {"name": "Bo", "timeZone": "America/New_York", "preferredSlots": ["2024-06-10T10:00"]},
+            {"name": "Cy", "preferredSlots": ["2024-06-10T14:00Z"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T14:00Z", "participants": ["Ana", "Bo", "Cy"]}]
+
+
+def test_meeting_time_zone_applies_to_participants_and_response():
+    """Should read local slots in the meeting zone and answer in it"""
+
+    status, body = call_handler({
+        "meetingName": "Global Sync",
+        "timeZone": "Asia/Tokyo",
+        "participants": [
+            {"name": "Ana", "timeZone": "Europe/Berlin", "preferredSlots": ["2024-06-10T09:00"]},
+            {"name": "Bo", "preferredSlots": ["2024-06-10T16:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T16:00+09:00", "participants": ["Ana", "Bo"]}]
+
+
+def test_requests_without_zones_are_unchanged():
+    """Should keep slots without an offset when no time zone is used"""
+
+    status, body = call_handler({
+        "meetingName": "Design Sync",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T10:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })
+
+    assert body["optimalSlots"][0]["slot"] == "2024-06-10T10:00"
+
+
+def test_time_zones_with_ranges_and_weights():
+    """Should normalize ranges and weighted participants too"""
+
+    ranged = {
+        "meetingName": "Global Sync",
+        "participants": [
+            {"name": "Ana", "timeZone": "Europe/Berlin", "preferredRanges": [{"start": "2024-06-10T09:00", "end": "2024-06-10T10:00"}]},
+            {"name": "Bo", "preferredSlots": ["2024-06-10T07:30Z"]}
+        ]
+    }
+    weighted = {
+        "meetingName": "Global Sync",
+        "participants": [
+            {"name": "Ana", "timeZone": "Europe/Berlin", "weight": 2, "preferredSlots": ["2024-06-10T09:00"]},
+            {"name": "Bo", "preferredSlots": ["2024-06-10T07:00Z"]}
+        ]
+    }
+
+    assert call_handler(ranged)[1]["optimalSlots"] == [
+        {"slot": "2024-06-10T07:30Z", "end": "2024-06-10T08:00Z", "participants": ["Ana", "Bo"]}
+    ]
+    assert call_handler(weighted)[1]["optimalSlots"] == [{"slot": "2024-06-10T07:00Z", "participants": ["Ana", "Bo"], "score": 3}]
+
+
+def test_streamed_requests_support_time_zones(monkeypatch):
+    """Should give the same response when the body is streamed"""
+
+    body = {
+        "meetingName": "Global Sync",
+        "participants": [
+            {"name": "Ana", "timeZone": "Europe/Berlin", "preferredSlots": ["2024-06-10T16:00"]},
+            {"name": "Bo", "preferredSlots": ["2024-06-10T14:00Z"]}
+        ]
+    }
+    expected = call_handler(body)
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+
+    assert call_handler(body) == expected
+    assert call_handler(dict(body, timeZone="Europe/Berlin"))[1]["optimalSlots"][0]["slot"] == "2024-06-10T16:00+02:00"
+
+
+def test_invalid_time_zones():
+    """Should reject unknown meeting and participant time zones"""
+
+    participant = {"name": "Ana", "timeZone": "Mars/Base", "preferredSlots": ["2024-06-10T16:00"]}
+
+    assert call_handler({"meetingName": "Sync", "timeZone": "Nowhere", "participants": [participant]}) == (
+        400, {"error": INVALID_TIME_ZONE_ERROR}
+    )
+    assert call_handler({"meetingName": "Sync", "participants": [participant]}) == (
+        400, {"error": "Participant 'Ana' has an invalid field: timeZone (must be an IANA time zone name such as Europe/Berlin)"}
+    )
+
+
+@pytest.mark.parametrize("time_zone", [[], {}, ["Europe/Berlin"], 1, True, ""])
+def test_time_zones_that_are_not_strings(time_zone):
+    """Should reject meeting and participant time zones that are not strings instead of failing"""
+
+    participant = {"name": "Ana", "preferredSlots": ["2024-06-10T16:00"]}
+
+    assert call_handler({"meetingName": "Sync", "timeZone": time_zone, "participants": [participant]}) == (
+        400, {"error": INVALID_TIME_ZONE_ERROR}
+    )
+    assert call_handler({"meetingName": "Sync", "participants": [dict(participant, timeZone=time_zone)]}) == (
+        400, {"error": "Participant 'Ana' has an invalid field: timeZone (must be an IANA time zone name such as Europe/Berlin)"}
+    )
+    meetings = [{"meetingName": "Sync", "participants": [dict(participant, timeZone=time_zone)]}]
+    status_code, body = call_handler({"meetings": meetings}, BATCH_PATH)
+    assert status_code == 200
+    assert body["results"][0]["statusCode"] == 400
+    assert call_handler({"conflictFree": True, "timeZone": time_zone, "meetings": meetings}, BATCH_PATH) == (
+        400, {"error": INVALID_TIME_ZONE_ERROR}
+    )
+
+
+@pytest.mark.parametrize("slot, meeting_zone", [
+    ("0001-01-01T00:00+02:00", None),
+    ("9999-12-31T23:00", "America/New_York"),
+    ("9999-12-31T23:00Z", "Asia/Tokyo"),
+])
+def test_slots_converted_outside_the_calendar(slot, meeting_zone):
+    """Should return the usual slot error for slots whose conversion leaves the supported years"""
+
+    body = {"meetingName": "Sync", "participants": [{"name": "Ana", "preferredSlots": [slot]}]}
+    if meeting_zone is not None:
+        body["timeZone"] = meeting_zone
+
+    assert call_handler(body) == (
+        400, {"error": f"Preferred slot '{slot}' for participant 'Ana' must be a string in format YYYY-MM-DDTHH:MM"}
+    )
@@ -0,0 +1,147 @@
+import pytest
+
+from optimal_time_slot_lambda.src.slot_optimizer import stream
+from optimal_time_slot_lambda.src.slot_optimizer.meeting import (
+    INVALID_ERROR_MODE_ERROR, INVALID_MAX_ERRORS_ERROR, INVALID_MEETING_NAME_ERROR, INVALID_TOP_K_ERROR
+)
+from optimal_time_slot_lambda.src.slot_optimizer.validation import ErrorCollector, ParticipantValidator
+from tests.helpers import call_handler
+
+NAME_ERROR = "Missing or invalid required field: name (must be a non-empty string)"
+
+
+def slot_error(slot, name):
+    return f"Preferred slot '{slot}' for participant '{name}' must be a string in format YYYY-MM-DDTHH:MM"
+
+
+def invalid_body(**options):
+    return {
+        "meetingName": "Design Sync",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "bad"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T09:00"]},
+            {"name": "", "preferredSlots": ["2024-06-10T09:00"]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T25:00"]}
+        ],
+        **options
+    }
+
+
+def test_validator_deduplicates_and_reuses_slots():
+    """Should drop repeated slots and parse each distinct slot string once"""
+
+    validator = ParticipantValidator()
+    name, slots = validator.validate({"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00", "2024-06-10T09:00"]})
+
+    assert (name, slots) == ("Alice", [28633500, 28633560])
+    assert validator.slot_offsets == {"2024-06-10T09:00": 28633500, "2024-06-10T10:00": 28633560}
+
+
+def test_duplicate_slots_count_once():
+    """Should not let a participant's repeated slot outweigh other participants"""
+
+    status, body = call_handler({
+        "meetingName": "Design Sync",
+        "participants": [
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T09:00", "2024-06-10T09:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T10:00", "participants": ["Bob", "Carol"]}]
+
+
+def test_first_error_mode_is_the_default():
+    """Should only report the first error by default"""
+
+    assert call_handler(invalid_body()) == (400, {"error": slot_error("bad", "Alice")})
+
+
+def test_all_error_mode_reports_every_error():
+    """Should list every error with the index of its participant"""
+
+    status, body = call_handler(invalid_body(errorMode="all", meetingName=" ", topK=0))
+
+    assert status == 400
+    assert body == {
+        "error": INVALID_MEETING_NAME_ERROR,
+        "errors": [
+            {"error": INVALID_MEETING_NAME_ERROR},
+            {"error": INVALID_TOP_K_ERROR},
+            {"error": slot_error("bad", "Alice"), "participant": 0},
+            {"error": NAME_ERROR, "participant": 2},
+            {"error": slot_error("2024-06-10T25:00", "Carol"), "participant": 3}
+        ],
+        "truncated": False
+    }
+
+
+def test_all_error_mode_stops_at_max_errors():
+    """Should stop after maxErrors errors and say that more were found"""
+
+    status, body = call_handler(invalid_body(errorMode="all", maxErrors=2))
+
+    assert status == 400
+    assert [error["participant"] for error in body["errors"]] == [0, 2]
+    assert body["truncated"] is True
+
+
+def test_all_error_mode_for_weighted_and_range_requests():
+    """Should collect errors for weighted and range participants too"""
+
+    weighted = invalid_body(errorMode="all")
+    weighted["participants"][1]["weight"] = -1
+    ranged = invalid_body(errorMode="all", granularityMinutes=0)
+
+    weighted_errors = call_handler(weighted)[1]["errors"]
+    range_errors = call_handler(ranged)[1]["errors"]
+
+    assert [error.get("participant") for error in weighted_errors] == [0, 1, 2, 3]
+    assert [error.get("participant") for error in range_errors] == [None, 0, 2, 3]
+
+
+@pytest.mark.parametrize("options", [{}, {"granularityMinutes": 30}, {"topK": 2}])
+def test_participants_that_are_not_objects(monkeypatch, options):
+    """Should report participants that are not objects as errors, also when streamed"""
+
+    body = invalid_body(errorMode="all", **options)
+    body["participants"][1] = "Bob"
+    status, response = call_handler(body)
+
+    assert status == 400
+    assert {"error": "Invalid participant (must be an object)", "participant": 1} in response["errors"]
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+    assert call_handler(body) == (status, response)
+
+
+def test_streamed_requests_report_the_same_errors(monkeypatch):
+    """Should return the same errors when the body is streamed, even with errorMode after participants"""
+
+    body = invalid_body()
+    body.update(errorMode="all", maxErrors=2)
+    expected = call_handler(body)
+    monkeypatch.setattr(stream, "STREAMING_BODY_MIN_BYTES", 0)
+
+    assert call_handler(body) == expected
+
+
+@pytest.mark.parametrize("options, error", [
+    ({"errorMode": "some"}, INVALID_ERROR_MODE_ERROR),
+    ({"errorMode": "all", "maxErrors": 0}, INVALID_MAX_ERRORS_ERROR),
+    ({"maxErrors": True}, INVALID_MAX_ERRORS_ERROR),
+])
+def test_invalid_error_options(options, error):
+    """Should reject invalid errorMode and maxErrors values"""
+
+    assert call_handler(invalid_body(**options)) == (400, {"error": error})
+
+
+def test_error_collector_first_mode_stops_at_first_error():
+    """Should ask to stop after the first error unless collecting all"""
+
+    errors = ErrorCollector()
+
+    assert errors.add("first") is True
+    assert errors.response_body() == {"error": "first"}
@@ -0,0 +1,88 @@
+import random
+import pytest
+from optimal_time_slot_lambda.src.slot_optimizer import weights
+from optimal_time_slot_lambda.src.slot_optimizer.weights import INVALID_WEIGHT_ERROR, score_slots
+from tests.helpers import call_handler
+
+
+def test_weighted_participants_rank_by_total_weight():
+    """Should pick the slot with the highest total weight and report its score"""
+
+    status, body = call_handler({
+        "meetingName": "Exec Review",
+        "participants": [
+            {"name": "CEO", "weight": 5, "preferredSlots": ["2024-06-10T09:00"]},
+            {"name": "Alice", "preferredSlots": ["2024-06-10T09:00", "2024-06-10T10:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00"]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["maxScore"] == 6
+    assert body["maxParticipants"] == 2
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T09:00", "participants": ["CEO", "Alice"], "score": 6}]
+
+
+def test_required_participant_excludes_slots():
+    """Should leave out slots a required participant cannot attend"""
+
+    status, body = call_handler({
+        "meetingName": "Design Sync",
+        "topK": 5,
+        "participants": [
+            {"name": "Alice", "required": True, "preferredSlots": ["2024-06-10T09:00", "2024-06-10T11:00"]},
+            {"name": "Bob", "preferredSlots": ["2024-06-10T10:00", "2024-06-10T11:00"]},
+            {"name": "Carol", "preferredSlots": ["2024-06-10T10:00"]},
+            {"name": "Dave", "preferredSlots": ["2024-06-10T10:00"]}
+        ]
+    })
+
+    assert status == 200
+    assert body["optimalSlots"] == [{"slot": "2024-06-10T11:00", "participants": ["Alice", "Bob"], "score": 2}]
+    assert [ranked["slot"] for ranked in body["rankedSlots"]] == ["2024-06-10T11:00", "2024-06-10T09:00"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_numpy_and_python_scores_match(monkeypatch, seed):
+    """Should compute the same scores with and without NumPy"""
+
+    rng = random.Random(seed)
+    participants = [
+        (f"P{i}", list(dict.fromkeys(rng.randrange(40) * 30 for _ in range(8))), rng.choice([1, 2, 0.5]), rng.random() < 0.05)
+        for i in range(100)
+    ]
+    expected = score_slots(participants)
+    monkeypatch.setattr(weights, "load_numpy", lambda: None)
+
+    assert score_slots(participants) == expected
+
+
+def test_largest_weights_keep_exact_scores(monkeypatch):
+    """Should report exact integer scores at the weight limit, with and without NumPy"""
+
+    participants = [(f"P{index}", [0, 30], 1_000_000, False) for index in range(3)] + [("Q", [30], 1, False)]
+    expected = {0: 3_000_000, 30: 3_000_001}
+
+    assert score_slots(participants) == expected
+    assert all(isinstance(score, int) for score in score_slots(participants).values())
+    monkeypatch.setattr(weights, "load_numpy", lambda: None)
+    assert score_slots(participants) == expected
+
+
+@pytest.mark.parametrize("participant, error", [
+    ({"name": "Alice", "weight": 0, "preferredSlots": ["2024-06-10T09:00"]}, INVALID_WEIGHT_ERROR.format("Alice")),
+    ({"name": "Alice", "weight": "heavy", "preferredSlots": ["2024-06-10T09:00"]}, INVALID_WEIGHT_ERROR.format("Alice")),
+    ({"name": "Alice", "weight": 1e19, "preferredSlots": ["2024-06-10T09:00"]}, INVALID_WEIGHT_ERROR.format("Alice")),
+    ({"name": "Alice", "weight": 1e308, "preferredSlots": ["2024-06-10T09:00"]}, INVALID_WEIGHT_ERROR.format("Alice")),
+    ({"name": "Alice", "weight": 2 ** 70, "preferredSlots": ["2024-06-10T09:00"]}, INVALID_WEIGHT_ERROR.format("Alice")),
+    ({"name": "Alice", "required": "yes", "preferredSlots": ["2024-06-10T09:00"]},
+     "Participant 'Alice' has an invalid field: required (must be a boolean)"),
+])
+def test_invalid_weight_fields(participant, error):
+    """Should return 400 for invalid weight or required"""
+
+    status, body = call_handler({"meetingName": "Design Sync", "participants": [participant]})
+
+    assert status == 400
+    assert body["error"] == error